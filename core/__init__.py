@@ -9,6 +9,7 @@ This module provides the foundational components including:
 - Exception handling
 - Rate limiting
 - Security utilities
+- Shared service instances
 """
 
 from .config import Config, load_config, save_config
@@ -25,6 +26,7 @@ from .exceptions import (
 from .logging import setup_logging, get_logger
 from .rate_limiter import RateLimiter
 from .security import SecurityManager
+from .services import get_database, get_sms_handler, get_ai_responder
 
 __all__ = [
     "Config",
@@ -43,4 +45,7 @@ __all__ = [
     "get_logger",
     "RateLimiter",
     "SecurityManager",
+    "get_database",
+    "get_sms_handler",
+    "get_ai_responder",
 ]
@@ -11,6 +11,7 @@ This module handles all configuration aspects including:
 """
 
 import os
+import sys
 import yaml
 from pathlib import Path
 from typing import Any, Dict, Optional, List
@@ -218,6 +219,23 @@ class Config:
     data_dir: str = ""
     log_dir: str = ""
     
+    # Plain properties rather than cached ones: the directories are
+    # assigned after construction and may change when config is reloaded
+    @property
+    def db_path(self) -> str:
+        """Path to the SQLite database file."""
+        return os.path.join(self.data_dir, "sms_agent.db")
+    
+    @property
+    def personality_path(self) -> str:
+        """Path to the personality.md instructions file."""
+        return os.path.join(self.config_dir, "personality.md")
+    
+    @property
+    def agent_path(self) -> str:
+        """Path to the agent.md rules file."""
+        return os.path.join(self.config_dir, "agent.md")
+    
     def validate(self) -> None:
         """
         Validate all configuration sections.
@@ -356,6 +374,10 @@ def load_config(config_path: Optional[str] = None, load_env: bool = True) -> Con
     if load_env:
         _apply_env_overrides(config)
     
+    # Intern the provider name so later comparisons hit the identity fast path
+    if isinstance(config.llm.provider, str):
+        config.llm.provider = sys.intern(config.llm.provider)
+    
     # Validate configuration
     config.validate()
     
@@ -12,6 +12,7 @@ This module provides database operations including:
 
 import sqlite3
 import json
+import queue
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict, Any
@@ -36,6 +37,9 @@ class Database:
         lock (threading.Lock): Thread lock for concurrent access
     """
     
+    # Most queued messages written in one transaction
+    WRITE_BATCH_SIZE = 32
+    
     def __init__(self, db_path: str):
         """
         Initialize database connection.
@@ -50,6 +54,10 @@ class Database:
         self.lock = threading.Lock()
         self._local = threading.local()
         
+        # Messages queued by enqueue_message, written by a background thread
+        self._write_queue: "queue.Queue[tuple]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        
         # Ensure database directory exists
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         
@@ -74,6 +82,8 @@ class Database:
             self._local.connection.execute("PRAGMA foreign_keys = ON")
             # Enable WAL mode for better concurrent access
             self._local.connection.execute("PRAGMA journal_mode = WAL")
+            # WAL stays consistent with fewer fsyncs at NORMAL
+            self._local.connection.execute("PRAGMA synchronous = NORMAL")
         return self._local.connection
     
     @contextmanager
@@ -293,6 +303,88 @@ class Database:
         except sqlite3.Error as e:
             raise DatabaseError(f"Failed to add message: {e}")
     
+    def enqueue_message(
+        self,
+        direction: str,
+        phone_number: str,
+        message: str,
+        status: str = "pending",
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Queue a message to be stored by a background writer.
+        
+        Unlike add_message this returns without waiting for the disk.
+        Queued messages are written in batches, one transaction per
+        batch. Reads on this instance wait for queued messages first,
+        so they always see them.
+        
+        Args:
+            direction: 'incoming' or 'outgoing'
+            phone_number: Sender/recipient phone number
+            message: Message content
+            status: Message status
+            metadata: Optional metadata dictionary
+        """
+        if self._writer is None:
+            with self.lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(
+                        target=self._write_queued_messages,
+                        name="database-writer",
+                        daemon=True
+                    )
+                    self._writer.start()
+        
+        self._write_queue.put((
+            direction,
+            phone_number,
+            message,
+            status,
+            json.dumps(metadata) if metadata else None
+        ))
+    
+    def flush_messages(self) -> None:
+        """Wait until all queued messages have been written."""
+        self._write_queue.join()
+    
+    def _write_queued_messages(self) -> None:
+        """Writer thread: store queued messages in batches."""
+        while True:
+            # Block for the first message, then take whatever else queued
+            # up meanwhile
+            batch = [self._write_queue.get()]
+            while len(batch) < self.WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                with self.transaction() as conn:
+                    conn.executemany(
+                        """
+                        INSERT INTO messages (direction, phone_number, message, status, metadata)
+                        VALUES (?, ?, ?, ?, ?)
+                        """,
+                        batch
+                    )
+                    conn.executemany(
+                        """
+                        INSERT INTO conversations (phone_number, last_message_at, message_count)
+                        VALUES (?, CURRENT_TIMESTAMP, 1)
+                        ON CONFLICT(phone_number) DO UPDATE SET
+                            last_message_at = CURRENT_TIMESTAMP,
+                            message_count = message_count + 1
+                        """,
+                        [(item[1],) for item in batch]
+                    )
+            except (sqlite3.Error, DatabaseError) as e:
+                logger.error(f"Failed to write {len(batch)} queued messages: {e}")
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+    
     def get_messages(
         self,
         phone_number: Optional[str] = None,
@@ -314,6 +406,8 @@ class Database:
         Returns:
             List of message dictionaries
         """
+        self.flush_messages()
+        
         query = "SELECT * FROM messages WHERE 1=1"
         params = []
         
@@ -355,6 +449,8 @@ class Database:
         Returns:
             List of message dictionaries ordered chronologically
         """
+        self.flush_messages()
+        
         try:
             with self.transaction() as conn:
                 cursor = conn.execute(
@@ -398,6 +494,8 @@ class Database:
         Check if a specific message from a number has already been responded to.
         Used for idempotency during polling.
         """
+        self.flush_messages()
+        
         try:
             with self.transaction() as conn:
                 cursor = conn.execute(
@@ -438,6 +536,8 @@ class Database:
         Returns:
             List of conversation dictionaries
         """
+        self.flush_messages()
+        
         try:
             with self.transaction() as conn:
                 cursor = conn.execute(
@@ -780,6 +880,8 @@ class Database:
         Returns:
             Dictionary with various statistics
         """
+        self.flush_messages()
+        
         try:
             with self.transaction() as conn:
                 stats = {}
@@ -814,6 +916,8 @@ class Database:
     
     def close(self) -> None:
         """Close database connection for current thread."""
+        self.flush_messages()
+        
         if hasattr(self._local, "connection") and self._local.connection:
             self._local.connection.close()
             self._local.connection = None
@@ -12,8 +12,12 @@ This module provides security-related functionality including:
 
 import os
 import re
+import random
 import hashlib
 import secrets
+import sys
+import tempfile
+from functools import lru_cache
 from typing import Optional, List, Tuple, Dict, Any
 from pathlib import Path
 import json
@@ -21,8 +25,122 @@ import json
 from .exceptions import GuardrailError
 from .logging import get_logger
 
+# google-re2 matches in linear time, so attacker-controlled SMS content
+# cannot trigger catastrophic backtracking in the PII scanners. It is
+# optional; the standard library engine is used when it is missing.
+try:
+    import re2
+except ImportError:
+    re2 = None
+
 logger = get_logger("security")
 
+# Provider names, interned so comparisons against names read from config
+# or requests (interned on ingress) short-circuit on identity.
+PROVIDER_OPENROUTER = sys.intern("openrouter")
+PROVIDER_OLLAMA = sys.intern("ollama")
+PROVIDER_GROQ = sys.intern("groq")
+
+# Environment variables checked for each provider's API key, in order
+_API_KEY_ENV_VARS = {
+    PROVIDER_OPENROUTER: ("OPENROUTER_API_KEY", "SMS_AGENT_LLM_API_KEY"),
+    PROVIDER_OLLAMA: ("OLLAMA_API_KEY",),
+    PROVIDER_GROQ: ("GROQ_API_KEY", "SMS_AGENT_LLM_API_KEY"),
+}
+
+# Environment variable each provider's API key is stored under
+_API_KEY_STORE_VARS = {
+    PROVIDER_OPENROUTER: "OPENROUTER_API_KEY",
+    PROVIDER_OLLAMA: "OLLAMA_API_KEY",
+    PROVIDER_GROQ: "GROQ_API_KEY",
+}
+
+# Fallback selection is not security-sensitive, so a private PRNG instance
+# is used instead of the shared module-level one.
+_FALLBACK_RNG = random.Random()
+
+
+# Expected API key format per provider, matched against the whole key.
+# OpenRouter keys start with "sk-or-" (older ones with "sk-") and Groq
+# keys with "gsk_"; both are at least 20 characters long. Ollama doesn't
+# require API keys by default, so any key is accepted.
+API_KEY_PATTERNS: Dict[str, Optional["re.Pattern"]] = {
+    PROVIDER_OPENROUTER: re.compile(r"sk-.{17,}", re.DOTALL),
+    PROVIDER_GROQ: re.compile(r"gsk_.{16,}", re.DOTALL),
+    PROVIDER_OLLAMA: None,
+}
+
+
+@lru_cache(maxsize=8)
+def validate_api_key_format(provider: str, api_key: str) -> bool:
+    """
+    Check an API key against the provider's expected format.
+    
+    Needs no SecurityManager, so callers can reject a malformed key
+    before creating directories or reading the .env file. Memoized
+    on (provider, api_key) because the same few keys are re-validated
+    on every provider re-initialization.
+    
+    Args:
+        provider: Provider name
+        api_key: API key to validate
+        
+    Returns:
+        True if key appears valid
+    """
+    if not api_key or not api_key.strip():
+        return False
+    
+    if provider in API_KEY_PATTERNS:
+        pattern = API_KEY_PATTERNS[provider]
+        return pattern is None or pattern.fullmatch(api_key) is not None
+    
+    # Generic validation
+    return len(api_key) >= 10
+
+
+def _compile_linear(pattern: str, flags: int = 0):
+    """
+    Compile a pattern with google-re2 when available.
+    
+    Falls back to the standard library for patterns re2 rejects or
+    when re2 is not installed. Both engines expose the same
+    search/finditer/sub interface used in this module. re2 takes
+    options rather than flags, so IGNORECASE is passed inline and any
+    other flag selects the standard library.
+    """
+    if re2 is not None and not flags & ~re.IGNORECASE:
+        inline = "(?i)" if flags & re.IGNORECASE else ""
+        try:
+            return re2.compile(inline + pattern)
+        except Exception:
+            logger.debug(f"re2 rejected pattern, using re: {pattern}")
+    return re.compile(pattern, flags)
+
+
+def _compile_pii_patterns(
+    patterns_by_type: Dict[str, List[str]],
+    order: Tuple[str, ...]
+) -> Dict[str, List["re.Pattern"]]:
+    """Compile PII patterns into a dict iterated in the given type order."""
+    return {
+        pii_type: [_compile_linear(p) for p in patterns_by_type[pii_type]]
+        for pii_type in order
+    }
+
+
+def _mask_phone(match: "re.Match") -> str:
+    """Mask a phone number match, keeping the last 4 characters."""
+    value = match.group()
+    return "***-***-" + value[-4:] if len(value) >= 4 else "***"
+
+
+def _mask_email(match: "re.Match") -> str:
+    """Mask an email match, keeping the first character and the domain."""
+    value = match.group()
+    local, sep, domain = value.partition("@")
+    return value[0] + "***@" + domain if sep else "***"
+
 
 class SecurityManager:
     """
@@ -71,6 +189,29 @@ class SecurityManager:
         ],
     }
     
+    # Order in which PII types are applied, most selective first: email
+    # is anchored on "@", IP addresses on dots, and long digit runs are
+    # claimed by credit card and SSN before the looser phone patterns
+    # can partially mask them.
+    PII_SCAN_ORDER = (
+        "email",
+        "ip_address",
+        "credit_card",
+        "ssn",
+        "phone_number",
+        "address",
+    )
+    
+    # Precompiled PII patterns, iterated in PII_SCAN_ORDER
+    _COMPILED_PII = _compile_pii_patterns(PII_PATTERNS, PII_SCAN_ORDER)
+    
+    # All PII patterns as one alternation for single-pass redaction
+    _COMBINED_PII = _compile_linear("|".join(
+        f"(?:{pattern.pattern})"
+        for patterns in _COMPILED_PII.values()
+        for pattern in patterns
+    ))
+    
     # Patterns for unsafe content
     UNSAFE_PATTERNS = [
         r'password\s*[=:]\s*\S+',
@@ -83,14 +224,30 @@ class SecurityManager:
         r'bank[_-]?account',
     ]
     
+    # Precompiled (pattern, compiled) pairs for check_unsafe_content
+    _COMPILED_UNSAFE = [
+        (p, _compile_linear(p, re.IGNORECASE)) for p in UNSAFE_PATTERNS
+    ]
+    
+    # Scanners for validate_response. Email and phone checks run as a
+    # single alternation instead of one search per pattern; email is tried
+    # before phone so digit-prefixed addresses are not misreported as
+    # phone numbers. URLs are searched separately so a link never hides a
+    # phone number or email address inside it.
+    _URL_PATTERN = re.compile(r'https?://\S+|www\.\S+', re.IGNORECASE)
+    _CONTACT_PATTERN = re.compile(
+        r'(?P<email>' + "|".join(PII_PATTERNS["email"]) + r')'
+        r'|(?P<phone>' + "|".join(PII_PATTERNS["phone_number"]) + r')'
+    )
+    
     # Safe fallback responses for various scenarios
-    FALLBACK_RESPONSES = [
+    FALLBACK_RESPONSES = (
         "I received your message but cannot respond right now. Please try again later.",
         "Thanks for reaching out! I'll get back to you as soon as possible.",
         "I'm currently unavailable. Your message has been noted.",
         "Thanks for your message! I'll respond when I'm able to.",
         "Message received. I'll reply when available.",
-    ]
+    )
     
     def __init__(self, config_dir: str, data_dir: str):
         """
@@ -164,13 +321,7 @@ class SecurityManager:
             API key if found, None otherwise
         """
         # Map provider to environment variable name
-        env_mappings = {
-            "openrouter": ["OPENROUTER_API_KEY", "SMS_AGENT_LLM_API_KEY"],
-            "ollama": ["OLLAMA_API_KEY"],
-            "groq": ["GROQ_API_KEY", "SMS_AGENT_LLM_API_KEY"],
-        }
-        
-        keys_to_check = env_mappings.get(provider, [f"{provider.upper()}_API_KEY"])
+        keys_to_check = _API_KEY_ENV_VARS.get(provider) or (f"{provider.upper()}_API_KEY",)
         
         for key in keys_to_check:
             value = os.environ.get(key)
@@ -188,13 +339,7 @@ class SecurityManager:
             api_key: API key to store
         """
         # Determine environment variable name
-        env_mappings = {
-            "openrouter": "OPENROUTER_API_KEY",
-            "ollama": "OLLAMA_API_KEY",
-            "groq": "GROQ_API_KEY",
-        }
-        
-        var_name = env_mappings.get(provider, f"{provider.upper()}_API_KEY")
+        var_name = _API_KEY_STORE_VARS.get(provider) or f"{provider.upper()}_API_KEY"
         
         # Read existing .env content
         existing = {}
@@ -211,23 +356,31 @@ class SecurityManager:
         # Also update the generic SMS_AGENT_LLM_API_KEY if this is the active provider
         # (This is a bit complex since SecurityManager doesn't know the active provider easily)
         
-        # Write back to .env file
-        with open(self.env_file, "w") as f:
-            f.write("# SMS AI Agent Environment Variables\n")
-            f.write("# This file contains sensitive information - DO NOT SHARE\n\n")
-            
-            for key, value in sorted(existing.items()):
-                f.write(f"{key}={value}\n")
+        # Write back to .env file. The new content goes to a temporary
+        # file that mkstemp creates with 0o600 permissions, which is then
+        # renamed over the old file, so the keys are never world-readable
+        # and a crash cannot leave a half-written file behind.
+        lines = [
+            "# SMS AI Agent Environment Variables\n",
+            "# This file contains sensitive information - DO NOT SHARE\n\n",
+        ]
+        lines.extend(f"{key}={value}\n" for key, value in sorted(existing.items()))
+        
+        fd, tmp_path = tempfile.mkstemp(dir=self.config_dir, prefix=".env.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.writelines(lines)
+            os.replace(tmp_path, self.env_file)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
         
         # Set in current environment
         os.environ[var_name] = api_key
         
-        # Set restrictive permissions
-        try:
-            os.chmod(self.env_file, 0o600)
-        except Exception:
-            pass
-        
         logger.info(f"Stored API key for {provider}")
     
     def validate_api_key(self, provider: str, api_key: str) -> bool:
@@ -241,24 +394,7 @@ class SecurityManager:
         Returns:
             True if key appears valid
         """
-        if not api_key or not api_key.strip():
-            return False
-        
-        # Provider-specific validation
-        if provider == "openrouter":
-            # OpenRouter keys typically start with "sk-or-"
-            return len(api_key) >= 20 and (api_key.startswith("sk-or-") or api_key.startswith("sk-"))
-        
-        elif provider == "groq":
-            # Groq keys typically start with "gsk_"
-            return len(api_key) >= 20 and api_key.startswith("gsk_")
-        
-        elif provider == "ollama":
-            # Ollama doesn't require API keys by default
-            return True
-        
-        # Generic validation
-        return len(api_key) >= 10
+        return validate_api_key_format(provider, api_key)
     
     def has_api_key(self, provider: str) -> bool:
         """
@@ -286,29 +422,21 @@ class SecurityManager:
         """
         sanitized = content
         
-        # Mask phone numbers (keep last 4 digits)
-        for pattern in self.PII_PATTERNS.get("phone_number", []):
-            sanitized = re.sub(
-                pattern,
-                lambda m: "***-***-" + m.group()[-4:] if len(m.group()) >= 4 else "***",
-                sanitized
-            )
-        
         # Mask email addresses
-        for pattern in self.PII_PATTERNS.get("email", []):
-            sanitized = re.sub(
-                pattern,
-                lambda m: m.group()[0] + "***@" + m.group().split("@")[1] if "@" in m.group() else "***",
-                sanitized
-            )
+        for pattern in self._COMPILED_PII["email"]:
+            sanitized = pattern.sub(_mask_email, sanitized)
         
         # Mask credit card numbers
-        for pattern in self.PII_PATTERNS.get("credit_card", []):
-            sanitized = re.sub(pattern, "****-****-****-****", sanitized)
+        for pattern in self._COMPILED_PII["credit_card"]:
+            sanitized = pattern.sub("****-****-****-****", sanitized)
         
         # Mask SSN
-        for pattern in self.PII_PATTERNS.get("ssn", []):
-            sanitized = re.sub(pattern, "***-**-****", sanitized)
+        for pattern in self._COMPILED_PII["ssn"]:
+            sanitized = pattern.sub("***-**-****", sanitized)
+        
+        # Mask phone numbers (keep last 4 digits)
+        for pattern in self._COMPILED_PII["phone_number"]:
+            sanitized = pattern.sub(_mask_phone, sanitized)
         
         return sanitized
     
@@ -324,9 +452,9 @@ class SecurityManager:
         """
         detected = []
         
-        for pii_type, patterns in self.PII_PATTERNS.items():
+        for pii_type, patterns in self._COMPILED_PII.items():
             for pattern in patterns:
-                for match in re.finditer(pattern, content):
+                for match in pattern.finditer(content):
                     detected.append({
                         "type": pii_type,
                         "value": match.group(),
@@ -348,8 +476,8 @@ class SecurityManager:
         """
         detected = []
         
-        for pattern in self.UNSAFE_PATTERNS:
-            for match in re.finditer(pattern, content, re.IGNORECASE):
+        for pattern, compiled in self._COMPILED_UNSAFE:
+            for match in compiled.finditer(content):
                 detected.append({
                     "pattern": pattern,
                     "match": match.group(),
@@ -370,13 +498,7 @@ class SecurityManager:
         Returns:
             Content with PII redacted
         """
-        redacted = content
-        
-        for pii_type, patterns in self.PII_PATTERNS.items():
-            for pattern in patterns:
-                redacted = re.sub(pattern, redactor, redacted)
-        
-        return redacted
+        return self._COMBINED_PII.sub(redactor, content)
     
     def validate_response(
         self,
@@ -408,24 +530,30 @@ class SecurityManager:
             violations.append(f"Response too long: {len(response)} > {max_length}")
         
         # Check for links
-        if block_links:
-            url_pattern = r'https?://[^\s]+|www\.[^\s]+'
-            if re.search(url_pattern, response):
-                violations.append("Response contains URL")
+        found = set()
+        if block_links and self._URL_PATTERN.search(response):
+            found.add("url")
         
-        # Check for phone numbers
+        # Check for phone numbers and emails in a single pass
+        wanted = set()
         if block_phone_numbers:
-            for pattern in self.PII_PATTERNS.get("phone_number", []):
-                if re.search(pattern, response):
-                    violations.append("Response contains phone number")
-                    break
-        
-        # Check for emails
+            wanted.add("phone")
         if block_emails:
-            for pattern in self.PII_PATTERNS.get("email", []):
-                if re.search(pattern, response):
-                    violations.append("Response contains email address")
-                    break
+            wanted.add("email")
+        
+        if wanted:
+            for match in self._CONTACT_PATTERN.finditer(response):
+                if match.lastgroup in wanted:
+                    found.add(match.lastgroup)
+                    if wanted <= found:
+                        break
+        
+        if "url" in found:
+            violations.append("Response contains URL")
+        if "phone" in found:
+            violations.append("Response contains phone number")
+        if "email" in found:
+            violations.append("Response contains email address")
         
         # Check for unsafe patterns
         unsafe = self.check_unsafe_content(response)
@@ -447,8 +575,7 @@ class SecurityManager:
         Returns:
             Safe fallback response string
         """
-        import random
-        return random.choice(self.FALLBACK_RESPONSES)
+        return _FALLBACK_RNG.choice(self.FALLBACK_RESPONSES)
     
     def generate_secure_token(self, length: int = 32) -> str:
         """
@@ -534,14 +661,20 @@ echo "All SMS AI Agent data has been deleted."
         Returns:
             Dictionary with security status information
         """
+        # One stat per path; a missing .env file is reported, not raised
+        try:
+            env_stat = os.stat(self.env_file)
+        except FileNotFoundError:
+            env_stat = None
+        
         return {
             "api_keys_configured": {
-                "openrouter": self.has_api_key("openrouter"),
-                "ollama": self.has_api_key("ollama"),
-                "groq": self.has_api_key("groq"),
+                PROVIDER_OPENROUTER: self.has_api_key(PROVIDER_OPENROUTER),
+                PROVIDER_OLLAMA: self.has_api_key(PROVIDER_OLLAMA),
+                PROVIDER_GROQ: self.has_api_key(PROVIDER_GROQ),
             },
-            "env_file_exists": self.env_file.exists(),
-            "env_file_permissions": oct(self.env_file.stat().st_mode)[-3:] if self.env_file.exists() else None,
-            "config_dir_permissions": oct(self.config_dir.stat().st_mode)[-3:],
-            "data_dir_permissions": oct(self.data_dir.stat().st_mode)[-3:],
+            "env_file_exists": env_stat is not None,
+            "env_file_permissions": oct(env_stat.st_mode)[-3:] if env_stat else None,
+            "config_dir_permissions": oct(os.stat(self.config_dir).st_mode)[-3:],
+            "data_dir_permissions": oct(os.stat(self.data_dir).st_mode)[-3:],
         }
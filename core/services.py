@@ -0,0 +1,124 @@
+"""
+Service Registry - Shared service instances for SMS AI Agent
+============================================================
+
+This module provides factories that build the agent's services once
+per process and hand out the same instance on later calls:
+- Database: one instance (and SQLite schema check) per database file
+- SMS Handler: one instance per SMS/webhook configuration
+- AI Responder: one instance, with its guardrails and rules engine,
+  per configuration object
+
+Embedding code (web UI, terminal UI, tests) that runs several CLI
+modes in one process reuses warm instances instead of rebuilding them.
+Service modules are imported inside the factories so importing this
+module stays cheap.
+"""
+
+import json
+from typing import Any, Dict, Tuple, TYPE_CHECKING
+
+from .database import Database, init_database
+
+if TYPE_CHECKING:
+    from .config import Config
+    from services.sms_handler import SMSHandler
+    from services.ai_responder import AIResponder
+
+
+# Shared instances keyed on the settings they were built from. Entries
+# are added with setdefault, so concurrent callers agree on one instance
+# without a lock.
+_databases: Dict[str, Database] = {}
+_sms_handlers: Dict[Tuple[Any, ...], "SMSHandler"] = {}
+_ai_responders: Dict[int, Tuple["Config", "AIResponder"]] = {}
+
+
+def get_database(db_path: str) -> Database:
+    """
+    Get the shared database instance for a database file.
+    
+    Args:
+        db_path: Path to SQLite database file
+    
+    Returns:
+        Database instance
+    """
+    database = _databases.get(db_path)
+    if database is None:
+        database = _databases.setdefault(db_path, init_database(db_path))
+    return database
+
+
+def get_sms_handler(config: "Config") -> "SMSHandler":
+    """
+    Get the shared SMS handler for the configured SMS settings.
+    
+    Args:
+        config: Application configuration
+    
+    Returns:
+        SMSHandler instance
+    """
+    sms = config.sms
+    key = (
+        sms.sms_timeout,
+        sms.webhook_enabled,
+        sms.webhook_url,
+        json.dumps(sms.webhook_headers, sort_keys=True, default=repr),
+    )
+    
+    handler = _sms_handlers.get(key)
+    if handler is None:
+        from services.sms_handler import SMSHandler
+        
+        handler = _sms_handlers.setdefault(key, SMSHandler(
+            timeout=sms.sms_timeout,
+            webhook_config={
+                "enabled": sms.webhook_enabled,
+                "url": sms.webhook_url,
+                "headers": sms.webhook_headers
+            }
+        ))
+    return handler
+
+
+def get_ai_responder(config: "Config") -> "AIResponder":
+    """
+    Get the shared AI responder for a configuration.
+    
+    The responder is built with the shared database, a guardrail system
+    and a rules engine for the configuration's directories.
+    
+    Args:
+        config: Application configuration
+    
+    Returns:
+        AIResponder instance
+    """
+    # Keyed on the config object itself; the object is kept alive with
+    # the entry so its id can't be reused while cached
+    entry = _ai_responders.get(id(config))
+    if entry is not None:
+        return entry[1]
+    
+    from services.guardrails import GuardrailSystem
+    from services.ai_responder import AIResponder
+    from rules.engine import RulesEngine
+    
+    responder = AIResponder(
+        config=config,
+        database=get_database(config.db_path),
+        guardrails=GuardrailSystem(max_length=config.guardrail.max_response_length),
+        rules_engine=RulesEngine(config_dir=config.config_dir),
+        personality_path=config.personality_path,
+        agent_path=config.agent_path
+    )
+    return _ai_responders.setdefault(id(config), (config, responder))[1]
+
+
+def clear_services() -> None:
+    """Drop all shared service instances."""
+    _databases.clear()
+    _sms_handlers.clear()
+    _ai_responders.clear()
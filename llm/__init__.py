@@ -6,22 +6,55 @@ This module provides a unified interface for interacting with
 multiple LLM providers including:
 - OpenRouter (multi-provider gateway)
 - Ollama (local LLM runtime)
+- Groq (high-performance inference)
 
 The module implements a provider abstraction pattern allowing
 easy switching between different LLM backends.
+
+Provider classes and the factory are imported lazily on first
+attribute access, so importing this package only loads the
+providers that are actually used.
 """
 
-from .base import BaseLLMProvider, LLMResponse, LLMConfig
-from .openrouter import OpenRouterProvider
-from .ollama import OllamaProvider
-from .factory import LLMFactory, create_llm_provider
+import importlib
+
+from .base import BaseLLMProvider, LLMResponse, LLMConfig, Message, Role
+
+# Lazily resolved exports: attribute name -> submodule
+_LAZY_EXPORTS = {
+    "OpenRouterProvider": "openrouter",
+    "OllamaProvider": "ollama",
+    "GroqProvider": "groq",
+    "LLMFactory": "factory",
+    "create_llm_provider": "factory",
+}
 
 __all__ = [
     "BaseLLMProvider",
     "LLMResponse",
     "LLMConfig",
+    "Message",
+    "Role",
     "OpenRouterProvider",
     "OllamaProvider",
+    "GroqProvider",
     "LLMFactory",
     "create_llm_provider",
 ]
+
+
+def __getattr__(name: str):
+    """Resolve provider and factory exports on first access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Include lazy exports in dir() output."""
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
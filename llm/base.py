@@ -8,18 +8,49 @@ must implement, ensuring consistent behavior across different backends.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from enum import IntEnum
 from typing import Optional, List, Dict, Any, AsyncIterator
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+import sys
 import time
 
 
-@dataclass
+# Optional: orjson for faster request/response (de)serialization
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+
+# dataclass(slots=True) is only available from Python 3.10
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+if orjson is not None:
+    def json_dumps(data: Any) -> bytes:
+        """Serialize data to UTF-8 JSON bytes."""
+        return orjson.dumps(data)
+    
+    json_loads = orjson.loads
+else:
+    def json_dumps(data: Any) -> bytes:
+        """Serialize data to UTF-8 JSON bytes."""
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+    
+    json_loads = json.loads
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class LLMConfig:
     """
     Configuration for an LLM provider instance.
     
     Contains all parameters needed to configure and use an LLM provider,
     including model selection, generation parameters, and API settings.
+    Instances are immutable; providers read them on every request.
     
     Attributes:
         model (str): Model identifier to use
@@ -103,29 +134,132 @@ class LLMResponse:
         return self.finish_reason == "length"
 
 
-@dataclass
+class Role(IntEnum):
+    """
+    Chat message role.
+    
+    Stored as an integer so role checks during prompt assembly are
+    plain int compares; serialized to the API string by Message.
+    """
+    SYSTEM = 0
+    USER = 1
+    ASSISTANT = 2
+    
+    @property
+    def api_name(self) -> str:
+        """Role name as used by chat completion APIs."""
+        return _ROLE_NAMES[self]
+    
+    @classmethod
+    def coerce(cls, value: Any) -> "Role":
+        """
+        Convert a role name or Role into a Role.
+        
+        Args:
+            value: Role instance or name ("system", "user", "assistant")
+            
+        Returns:
+            Matching Role
+            
+        Raises:
+            ValueError: If the role is unknown
+        """
+        if isinstance(value, cls):
+            return value
+        try:
+            return _ROLES_BY_NAME[value]
+        except (KeyError, TypeError):
+            raise ValueError(f"Unknown message role: {value!r}") from None
+
+
+# Indexed by Role value
+_ROLE_NAMES = ("system", "user", "assistant")
+_ROLES_BY_NAME = {name: Role(i) for i, name in enumerate(_ROLE_NAMES)}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class Message:
     """
     Chat message structure.
     
     Represents a single message in a conversation, following the
-    OpenAI chat message format.
+    OpenAI chat message format. Messages are immutable, which lets
+    the request dictionary be built once and reused across retries.
     
     Attributes:
-        role (str): Message role (system, user, or assistant)
+        role (Role): Message role; role names such as "user" are
+            accepted and converted on construction
         content (str): Message content
         name (str): Optional name for the message sender
     """
-    role: str  # system, user, assistant
+    role: Role
     content: str
     name: Optional[str] = None
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary format for API requests."""
-        result = {"role": self.role, "content": self.content}
+    # Lazily built request dictionary and JSON (see to_dict/to_json)
+    _dict: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _json: Optional[bytes] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self):
+        """Normalize role names to Role members."""
+        if type(self.role) is not Role:
+            object.__setattr__(self, "role", Role.coerce(self.role))
+    
+    def __iter__(self):
+        """Yield (key, value) pairs so that dict(message) works."""
+        yield "role", _ROLE_NAMES[self.role]
+        yield "content", self.content
         if self.name:
-            result["name"] = self.name
+            yield "name", self.name
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to dictionary format for API requests.
+        
+        The dictionary is built on first use and cached on the
+        instance; callers must treat it as read-only.
+        """
+        result = self._dict
+        if result is None:
+            result = dict(self)
+            object.__setattr__(self, "_dict", result)
         return result
+    
+    def to_json(self) -> bytes:
+        """
+        Convert to JSON bytes for API requests.
+        
+        Cached like to_dict, so a conversation history is only
+        encoded once no matter how many turns resend it.
+        """
+        result = self._json
+        if result is None:
+            result = json_dumps(self.to_dict())
+            object.__setattr__(self, "_json", result)
+        return result
+
+
+def encode_chat_body(messages: List[Message], fields: Dict[str, Any]) -> bytes:
+    """
+    Encode a chat request body from cached message JSON.
+    
+    Args:
+        messages: Conversation messages
+        fields: Remaining request fields (model, sampling parameters, ...)
+        
+    Returns:
+        JSON body equivalent to json_dumps({"messages": [...], **fields})
+    """
+    body = b'{"messages":[' + b",".join([m.to_json() for m in messages]) + b"]"
+    if fields:
+        body += b"," + json_dumps(fields)[1:]
+    else:
+        body += b"}"
+    return body
 
 
 class BaseLLMProvider(ABC):
@@ -149,6 +283,15 @@ class BaseLLMProvider(ABC):
                 pass
     """
     
+    # Retry policy for rate limits and transient errors; providers may
+    # override these. max_retries can be set per instance through
+    # extra_params["max_retries"].
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    MAX_RETRIES = 4
+    RETRY_BACKOFF_INITIAL = 0.5
+    RETRY_BACKOFF_MAX = 8.0
+    RETRY_AFTER_MAX = 60.0
+    
     def __init__(self, config: LLMConfig):
         """
         Initialize the provider.
@@ -158,6 +301,7 @@ class BaseLLMProvider(ABC):
         """
         self.config = config
         self.config.validate()
+        self.max_retries = int(config.extra_params.get("max_retries", self.MAX_RETRIES))
     
     @abstractmethod
     def generate(
@@ -247,6 +391,89 @@ class BaseLLMProvider(ABC):
         """
         pass
     
+    async def chat_many(
+        self,
+        conversations: List[List[Message]],
+        concurrency: int = 8,
+        **kwargs
+    ) -> List[Any]:
+        """
+        Generate responses for several conversations concurrently.
+        
+        At most `concurrency` requests are in flight at once. Results are
+        returned in input order; a failed conversation yields its
+        exception instead of an LLMResponse.
+        
+        Args:
+            conversations: Message lists, one per request
+            concurrency: Maximum number of concurrent requests
+            **kwargs: Arguments passed to chat_async
+            
+        Returns:
+            List of LLMResponse or Exception, one per conversation
+        """
+        return await self._gather_bounded(self.chat_async, conversations, concurrency, kwargs)
+    
+    async def generate_many(
+        self,
+        prompts: List[str],
+        concurrency: int = 8,
+        **kwargs
+    ) -> List[Any]:
+        """
+        Generate responses for several prompts concurrently.
+        
+        Same semantics as chat_many, using generate_async.
+        
+        Args:
+            prompts: Prompt texts, one per request
+            concurrency: Maximum number of concurrent requests
+            **kwargs: Arguments passed to generate_async
+            
+        Returns:
+            List of LLMResponse or Exception, one per prompt
+        """
+        return await self._gather_bounded(self.generate_async, prompts, concurrency, kwargs)
+    
+    @staticmethod
+    async def _gather_bounded(call, inputs: List[Any], concurrency: int, kwargs: Dict[str, Any]) -> List[Any]:
+        """Run call(input, **kwargs) for each input with bounded concurrency."""
+        import asyncio
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def run_one(item: Any) -> LLMResponse:
+            async with semaphore:
+                return await call(item, **kwargs)
+        
+        return await asyncio.gather(
+            *(run_one(item) for item in inputs),
+            return_exceptions=True
+        )
+    
+    def chat_many_sync(
+        self,
+        conversations: List[List[Message]],
+        concurrency: int = 8,
+        **kwargs
+    ) -> List[Any]:
+        """
+        Blocking wrapper around chat_many.
+        
+        Must not be called from a running event loop.
+        
+        Args:
+            conversations: Message lists, one per request
+            concurrency: Maximum number of concurrent requests
+            **kwargs: Arguments passed to chat_async
+            
+        Returns:
+            List of LLMResponse or Exception, one per conversation
+        """
+        import asyncio
+        
+        return asyncio.run(self.chat_many(conversations, concurrency, **kwargs))
+    
     @abstractmethod
     def is_available(self) -> bool:
         """
@@ -267,6 +494,15 @@ class BaseLLMProvider(ABC):
         """
         pass
     
+    def close(self) -> None:
+        """
+        Release resources held by the provider.
+        
+        Providers that keep connection pools override this. The base
+        implementation does nothing.
+        """
+        pass
+    
     def count_tokens(self, text: str) -> int:
         """
         Estimate token count for text.
@@ -310,6 +546,78 @@ class BaseLLMProvider(ABC):
         params.update(kwargs)
         return params
     
+    def _response_metadata(
+        self,
+        response_data: Dict[str, Any],
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Build LLMResponse metadata.
+        
+        The raw API response is only kept when requested with an
+        include_raw=True call argument or extra_params setting, so
+        retained responses don't pin the full decoded body. Otherwise
+        only the response id (when the API returns one) is kept.
+        
+        Args:
+            response_data: Decoded API response
+            kwargs: Call keyword arguments
+            
+        Returns:
+            Metadata dictionary
+        """
+        include_raw = kwargs.get("include_raw")
+        if include_raw is None:
+            include_raw = self.config.extra_params.get("include_raw", False)
+        if include_raw:
+            return {"raw_response": response_data}
+        response_id = response_data.get("id")
+        return {"id": response_id} if response_id else {}
+    
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given in seconds or as an HTTP date."""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    
+    def _retry_delay(self, attempt: int, response: Any = None) -> Optional[float]:
+        """
+        Get the delay before retrying a failed request.
+        
+        Args:
+            attempt: Zero-based attempt number that just failed
+            response: Failed HTTP response (with status_code and headers),
+                or None if the request failed to connect
+            
+        Returns:
+            Seconds to wait, or None if the request should not be retried
+        """
+        if attempt >= self.max_retries:
+            return None
+        
+        if response is not None:
+            if response.status_code not in self.RETRY_STATUSES:
+                return None
+            retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.RETRY_AFTER_MAX)
+        
+        # Exponential backoff with jitter
+        delay = self.RETRY_BACKOFF_INITIAL * (2 ** attempt)
+        delay += random.uniform(0, self.RETRY_BACKOFF_INITIAL)
+        return min(delay, self.RETRY_BACKOFF_MAX)
+    
     @staticmethod
     def _measure_latency(start_time: float) -> int:
         """
@@ -322,3 +630,16 @@ class BaseLLMProvider(ABC):
             Latency in milliseconds
         """
         return int((time.time() - start_time) * 1000)
+    
+    @staticmethod
+    def _elapsed_ms(start_ns: int) -> int:
+        """
+        Calculate latency in milliseconds from a monotonic start.
+        
+        Args:
+            start_ns: Start time from time.perf_counter_ns()
+            
+        Returns:
+            Latency in milliseconds
+        """
+        return (time.perf_counter_ns() - start_ns) // 1_000_000
@@ -6,26 +6,69 @@ This module provides a factory pattern for creating and managing
 LLM provider instances, making it easy to switch between providers.
 """
 
-from typing import Optional, Type, Dict, Any
+import importlib
+import json
+import sys
+from typing import Optional, Type, Dict, Any, Tuple, Union
 
 from .base import BaseLLMProvider, LLMConfig
-from .openrouter import OpenRouterProvider
-from .ollama import OllamaProvider
-from .groq import GroqProvider
 from core.exceptions import LLMError, ConfigError
 from core.logging import get_logger
 
 logger = get_logger("llm.factory")
 
 
-# Registry of available providers
-PROVIDERS: Dict[str, Type[BaseLLMProvider]] = {
-    "openrouter": OpenRouterProvider,
-    "ollama": OllamaProvider,
-    "groq": GroqProvider,
+# Registry of available providers. Built-in providers are registered as
+# (module, class name) and imported on first use, so only the provider
+# actually selected pays its import cost; resolved classes replace the
+# entry. Providers added through LLMFactory.register are stored directly.
+PROVIDERS: Dict[str, Union[Type[BaseLLMProvider], Tuple[str, str]]] = {
+    "openrouter": (".openrouter", "OpenRouterProvider"),
+    "ollama": (".ollama", "OllamaProvider"),
+    "groq": (".groq", "GroqProvider"),
 }
 
 
+# Provider instances keyed on (provider name, configuration), so repeated
+# create() calls with the same settings share one instance and its warm
+# HTTP connection pool.
+_instance_cache: Dict[Tuple[Any, ...], BaseLLMProvider] = {}
+
+
+def _cache_key(provider_name: str, config: LLMConfig) -> Tuple[Any, ...]:
+    """Build the instance cache key for a provider configuration."""
+    return (
+        provider_name,
+        config.model,
+        config.api_key,
+        config.api_base,
+        config.temperature,
+        config.max_tokens,
+        config.top_p,
+        config.timeout,
+        json.dumps(config.extra_params, sort_keys=True, default=repr),
+    )
+
+
+def _resolve_provider(name: str) -> Type[BaseLLMProvider]:
+    """
+    Get the provider class registered under a name, importing it if needed.
+    
+    Args:
+        name: Lower-cased provider name (must be registered)
+        
+    Returns:
+        Provider class
+    """
+    entry = PROVIDERS[name]
+    if isinstance(entry, tuple):
+        module_name, class_name = entry
+        module = importlib.import_module(module_name, __package__)
+        entry = getattr(module, class_name)
+        PROVIDERS[name] = entry
+    return entry
+
+
 class LLMFactory:
     """
     Factory for creating LLM provider instances.
@@ -54,6 +97,10 @@ class LLMFactory:
         """
         Create an LLM provider instance.
         
+        Instances are cached per provider and configuration; calls
+        with the same settings return the same instance. Calls with
+        provider-specific kwargs always build a new instance.
+        
         Args:
             provider_name: Name of the provider (e.g., "openrouter", "ollama")
             config: Provider configuration
@@ -66,25 +113,59 @@ class LLMFactory:
             ConfigError: If provider is not registered
             LLMError: If provider initialization fails
         """
-        provider_name = provider_name.lower()
+        provider_name = sys.intern(provider_name.lower())
         
         if provider_name not in PROVIDERS:
-            available = ", ".join(PROVIDERS.keys())
             raise ConfigError(
                 f"Unknown LLM provider: {provider_name}",
-                details={"available_providers": available}
+                details={"available_providers": ", ".join(PROVIDERS)}
             )
         
-        provider_class = PROVIDERS[provider_name]
+        key = None if kwargs else _cache_key(provider_name, config)
+        if key is not None:
+            cached = _instance_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        try:
+            provider_class = _resolve_provider(provider_name)
+        except (ImportError, AttributeError) as e:
+            raise LLMError(
+                f"Failed to load {provider_name} provider: {e}",
+                details={"provider": provider_name}
+            )
         
         try:
             logger.info(f"Creating {provider_name} provider")
-            return provider_class(config, **kwargs)
+            provider = provider_class(config, **kwargs)
         except Exception as e:
             raise LLMError(
                 f"Failed to create {provider_name} provider: {e}",
                 details={"provider": provider_name}
             )
+        
+        if key is not None:
+            # setdefault is atomic, so concurrent creates agree on one
+            # instance without a lock; a losing instance is closed.
+            cached = _instance_cache.setdefault(key, provider)
+            if cached is not provider:
+                provider.close()
+                provider = cached
+        return provider
+    
+    @staticmethod
+    def clear_cache() -> None:
+        """
+        Drop all cached provider instances.
+        
+        Each instance is closed so its connection pool is released.
+        """
+        while _instance_cache:
+            _, provider = _instance_cache.popitem()
+            try:
+                provider.close()
+            except Exception as e:
+                logger.debug(f"Error closing cached provider: {e}")
     
     @staticmethod
     def create_from_config(config) -> BaseLLMProvider:
@@ -120,7 +201,9 @@ class LLMFactory:
         """
         Register a new provider class.
         
-        Allows adding custom providers at runtime.
+        Allows adding custom providers at runtime. Registration is
+        first-wins: a name that is already registered keeps its
+        existing provider and a warning is logged.
         
         Args:
             name: Provider name
@@ -135,7 +218,12 @@ class LLMFactory:
                 details={"class": str(provider_class)}
             )
         
-        PROVIDERS[name.lower()] = provider_class
+        # setdefault is atomic, so concurrent registration needs no lock
+        existing = PROVIDERS.setdefault(name.lower(), provider_class)
+        if existing is not provider_class:
+            logger.warning(f"LLM provider already registered, keeping existing: {name}")
+            return
+        
         logger.info(f"Registered LLM provider: {name}")
     
     @staticmethod
@@ -14,11 +14,16 @@ Reference: https://console.groq.com/docs
 """
 
 import time
-import asyncio
-from typing import Optional, List, Dict, Any
-import json
+import itertools
+import threading
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterator, Union
 
-from .base import BaseLLMProvider, LLMConfig, LLMResponse, Message
+import httpx
+
+from .base import (
+    BaseLLMProvider, LLMConfig, LLMResponse, Message,
+    encode_chat_body, json_dumps, json_loads
+)
 from core.exceptions import LLMError
 from core.logging import get_logger
 
@@ -34,6 +39,16 @@ class GroqProvider(BaseLLMProvider):
     
     PROVIDER_NAME = "groq"
     API_BASE = "https://api.groq.com/openai/v1"
+    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    
+    # Connection pool limits for the keep-alive HTTP client
+    POOL_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+    
+    # Seconds an is_available() result is reused
+    AVAILABILITY_TTL = 30.0
+    
+    # Seconds a get_models() result is reused
+    MODELS_TTL = 300.0
     
     def __init__(self, config: LLMConfig):
         """
@@ -50,84 +65,366 @@ class GroqProvider(BaseLLMProvider):
         # Set API base URL
         self.api_base = config.api_base or self.API_BASE
         
+        # Optional pool of keys rotated per request to spread rate limits
+        api_keys = tuple(k for k in config.extra_params.get("api_keys") or () if k)
+        
         # Validate API key
-        if not config.api_key:
+        if not config.api_key and not api_keys:
             raise LLMError(
                 "Groq API key is required",
                 details={"hint": "Set GROQ_API_KEY environment variable or configure in settings"}
             )
         
-        self.api_key = config.api_key
+        self.api_key = config.api_key or api_keys[0]
+        
+        # Per-key Authorization headers; only used when more than one key is set
+        self._key_headers = tuple({"Authorization": f"Bearer {k}"} for k in api_keys)
+        self._key_counter = itertools.count()
+        
+        # Absolute endpoint URLs, built once so httpx skips per-request
+        # merging with base_url
+        self._chat_url = httpx.URL(f"{self.api_base}/chat/completions")
+        self._models_url = httpx.URL(f"{self.api_base}/models")
+        
+        # Default request fields; copied and overridden per call
+        self._request_template = {
+            "model": config.model,
+            "temperature": config.temperature,
+            "max_tokens": config.max_tokens,
+            "top_p": config.top_p,
+        }
+        
+        # Request headers are fixed for the provider's lifetime
+        self._headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}",
+            "User-Agent": self.USER_AGENT
+        }
+        
+        # Pooled HTTP client; keep-alive sockets are reused across requests
+        # so only the first call pays the TCP/TLS handshake.
+        self._client = httpx.Client(
+            base_url=self.api_base,
+            headers=self._headers,
+            timeout=config.timeout,
+            limits=self.POOL_LIMITS,
+        )
+        
+        # Async client is created on first async call
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop = None
+        
+        # Optionally open a keep-alive connection in the background so the
+        # first real request doesn't pay the TCP/TLS handshake
+        self._prewarm = bool(config.extra_params.get("prewarm", False))
+        self._prewarm_task = None
+        if self._prewarm:
+            threading.Thread(
+                target=self._prewarm_connection, name="groq-prewarm", daemon=True
+            ).start()
+        
+        # Last availability probe as (monotonic time, result)
+        self._availability = (None, False)
         
-        # Initialize HTTP client lazily
-        self._client = None
+        # Last model listing as (monotonic time, model ids)
+        self._models_cache = None
+        self._models_lock = threading.Lock()
         
         logger.info(
             f"Initialized Groq provider",
             extra={"model": config.model, "api_base": self.api_base}
         )
     
-    def _get_client(self):
-        """Get or create HTTP client."""
-        if self._client is None:
-            try:
-                import urllib.request
-                import urllib.error
-                self._client = {
-                    "request": urllib.request,
-                    "error": urllib.error
-                }
-            except ImportError as e:
-                raise LLMError(f"Failed to import urllib: {e}")
-        return self._client
-    
     def _build_headers(self) -> Dict[str, str]:
-        """Build request headers."""
-        return {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
+        """Return the request headers built at initialization."""
+        return self._headers
+    
+    def _next_key_headers(self) -> Optional[Dict[str, str]]:
+        """
+        Get the Authorization header for the next key in the rotation.
+        
+        Returns None when a single key is configured, so the client's
+        default headers are used. next() on itertools.count is atomic,
+        which keeps the rotation safe across threads and tasks.
+        """
+        key_headers = self._key_headers
+        if len(key_headers) < 2:
+            return None
+        return key_headers[next(self._key_counter) % len(key_headers)]
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled async HTTP client, creating it on first use.
+        
+        Pooled connections belong to the event loop that opened them,
+        so a new client is created when called from a different loop
+        (e.g. successive asyncio.run calls).
+        """
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client_loop = loop
+            self._async_client = httpx.AsyncClient(
+                base_url=self.api_base,
+                headers=self._headers,
+                timeout=self.config.timeout,
+                limits=self.POOL_LIMITS,
+            )
+            if self._prewarm:
+                self._prewarm_task = loop.create_task(
+                    self._prewarm_connection_async(self._async_client)
+                )
+        return self._async_client
+    
+    def _prewarm_connection(self) -> None:
+        """Open a pooled connection with a lightweight HEAD request."""
+        try:
+            self._client.head(self._models_url, timeout=5)
+        except Exception as e:
+            logger.debug(f"Groq connection prewarm failed: {e}")
+    
+    async def _prewarm_connection_async(self, client: httpx.AsyncClient) -> None:
+        """Open a pooled async connection with a lightweight HEAD request."""
+        try:
+            await client.head(self._models_url, timeout=5)
+        except Exception as e:
+            logger.debug(f"Groq async connection prewarm failed: {e}")
+    
+    def close(self) -> None:
+        """Close the pooled HTTP client."""
+        self._client.close()
+    
+    async def aclose(self) -> None:
+        """Close both pooled HTTP clients."""
+        self._client.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_client_loop = None
+    
+    def _api_error(self, response: httpx.Response) -> LLMError:
+        """Build an LLMError from a non-2xx Groq response."""
+        try:
+            error_data = json_loads(response.content)
+            error_msg = error_data.get("error", {}).get("message", response.reason_phrase)
+        except (ValueError, AttributeError):
+            error_msg = response.text or response.reason_phrase
+        
+        details = {"status": response.status_code, "url": str(response.url)}
+        retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            details["retry_after"] = retry_after
+        
+        return LLMError(f"Groq API error: {error_msg}", details=details)
+    
+    @staticmethod
+    def _encode(data: Union[Dict[str, Any], bytes]) -> bytes:
+        """Encode a request body unless it is already JSON bytes."""
+        return data if isinstance(data, bytes) else json_dumps(data)
     
     def _make_request(
         self,
-        endpoint: str,
-        data: Dict[str, Any],
+        url: httpx.URL,
+        data: Union[Dict[str, Any], bytes],
         timeout: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Make synchronous HTTP request."""
-        client = self._get_client()
-        url = f"{self.api_base}{endpoint}"
-        headers = self._build_headers()
+        """
+        Make synchronous HTTP request over the pooled client.
+        
+        Rate-limited (429) and transient 5xx responses are retried with
+        exponential backoff, honoring Retry-After when present.
+        """
         timeout = timeout or self.config.timeout
+        body = self._encode(data)
+        attempt = 0
         
-        body = json.dumps(data).encode("utf-8")
-        req = client["request"].Request(
-            url,
-            data=body,
-            headers=headers,
-            method="POST"
-        )
+        while True:
+            try:
+                response = self._client.post(
+                    url, content=body, headers=self._next_key_headers(), timeout=timeout
+                )
+            except httpx.HTTPError as e:
+                raise LLMError(
+                    f"Failed to connect to Groq: {e}",
+                    details={"url": str(url)}
+                )
+            except Exception as e:
+                raise LLMError(f"Unexpected error calling Groq: {e}")
+            
+            delay = self._retry_delay(attempt, response) if response.is_error else None
+            if delay is None:
+                return self._handle_response(response)
+            
+            logger.warning(
+                f"Groq request failed with status {response.status_code}, retrying",
+                extra={"attempt": attempt + 1, "delay": delay}
+            )
+            time.sleep(delay)
+            attempt += 1
+    
+    async def _make_request_async(
+        self,
+        url: httpx.URL,
+        data: Union[Dict[str, Any], bytes],
+        timeout: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Make asynchronous HTTP request over the pooled async client, with retries."""
+        import asyncio
         
-        try:
-            with client["request"].urlopen(req, timeout=timeout) as response:
-                response_data = response.read().decode("utf-8")
-                return json.loads(response_data)
+        timeout = timeout or self.config.timeout
+        body = self._encode(data)
+        attempt = 0
         
-        except client["error"].HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else ""
+        while True:
             try:
-                error_data = json.loads(error_body)
-                error_msg = error_data.get("error", {}).get("message", str(e))
-            except json.JSONDecodeError:
-                error_msg = error_body or str(e)
+                response = await self._get_async_client().post(
+                    url, content=body, headers=self._next_key_headers(), timeout=timeout
+                )
+            except httpx.HTTPError as e:
+                raise LLMError(
+                    f"Failed to connect to Groq: {e}",
+                    details={"url": str(url)}
+                )
+            except Exception as e:
+                raise LLMError(f"Unexpected error calling Groq: {e}")
             
-            raise LLMError(
-                f"Groq API error: {error_msg}",
-                details={"status": e.code, "url": url}
+            delay = self._retry_delay(attempt, response) if response.is_error else None
+            if delay is None:
+                return self._handle_response(response)
+            
+            logger.warning(
+                f"Groq request failed with status {response.status_code}, retrying",
+                extra={"attempt": attempt + 1, "delay": delay}
             )
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    def _handle_response(self, response: httpx.Response) -> Dict[str, Any]:
+        """Raise on API errors, otherwise decode the JSON body."""
+        if response.is_error:
+            raise self._api_error(response)
+        
+        try:
+            return json_loads(response.content)
+        except ValueError as e:
+            raise LLMError(f"Failed to parse Groq response: {e}")
+
+    def _build_request_data(
+        self,
+        messages: List[Message],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+        stream: bool = False
+    ) -> bytes:
+        """Build the encoded chat completion request body."""
+        fields = self._request_fields(temperature, max_tokens, kwargs, stream)
+        return encode_chat_body(messages, fields)
+    
+    def _request_fields(
+        self,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Build the chat completion request fields other than messages.
+        
+        Starts from the per-instance template and only overrides the
+        fields given for this call.
+        """
+        request_data = self._request_template.copy()
+        
+        if temperature is not None:
+            request_data["temperature"] = temperature
+        if max_tokens is not None:
+            request_data["max_tokens"] = max_tokens
+        if "top_p" in kwargs:
+            request_data["top_p"] = kwargs["top_p"]
+        if "stop" in kwargs:
+            request_data["stop"] = kwargs["stop"]
+        if stream:
+            request_data["stream"] = True
+        
+        return request_data
+    
+    def _parse_chat_response(
+        self,
+        response_data: Dict[str, Any],
+        start_ns: int,
+        kwargs: Dict[str, Any]
+    ) -> LLMResponse:
+        """Convert a chat completion response body into an LLMResponse."""
+        choices = response_data.get("choices", [])
+        if not choices:
+            raise LLMError("No choices in Groq response")
+        
+        choice = choices[0]
+        content = choice.get("message", {}).get("content", "")
+        finish_reason = choice.get("finish_reason", "stop")
+        
+        usage = response_data.get("usage", {})
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        total_tokens = usage.get("total_tokens", prompt_tokens + completion_tokens)
+        
+        latency = self._elapsed_ms(start_ns)
+        
+        return LLMResponse(
+            content=content,
+            model=response_data.get("model", self.config.model),
+            provider=self.PROVIDER_NAME,
+            tokens_used=total_tokens,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_ms=latency,
+            finish_reason=finish_reason,
+            metadata=self._response_metadata(response_data, kwargs)
+        )
+
+    def _chat_from_request(
+        self,
+        body: bytes,
+        start_ns: int,
+        kwargs: Dict[str, Any]
+    ) -> LLMResponse:
+        """Send an encoded chat request and parse the response."""
+        try:
+            response_data = self._make_request(self._chat_url, body)
+            return self._parse_chat_response(response_data, start_ns, kwargs)
         except Exception as e:
-            raise LLMError(f"Unexpected error calling Groq: {e}")
+            if isinstance(e, LLMError):
+                raise
+            raise LLMError(f"Failed to generate: {e}")
+
+    async def _chat_from_request_async(
+        self,
+        body: bytes,
+        start_ns: int,
+        kwargs: Dict[str, Any]
+    ) -> LLMResponse:
+        """Send an encoded chat request asynchronously and parse the response."""
+        try:
+            response_data = await self._make_request_async(self._chat_url, body)
+            return self._parse_chat_response(response_data, start_ns, kwargs)
+        except Exception as e:
+            if isinstance(e, LLMError):
+                raise
+            raise LLMError(f"Failed to generate async: {e}")
+
+    def _single_prompt_body(
+        self,
+        prompt: str,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any]
+    ) -> bytes:
+        """Encode a one-message user request without building Message objects."""
+        fields = self._request_fields(temperature, max_tokens, kwargs)
+        fields["messages"] = [{"role": "user", "content": prompt}]
+        return json_dumps(fields)
 
     def chat(
         self,
@@ -137,84 +434,206 @@ class GroqProvider(BaseLLMProvider):
         **kwargs
     ) -> LLMResponse:
         """Generate response from conversation."""
-        start_time = time.time()
-        params = self._get_generation_params(temperature, max_tokens, **kwargs)
-        
-        request_data = {
-            "model": self.config.model,
-            "messages": [m.to_dict() for m in messages],
-            "temperature": params["temperature"],
-            "max_tokens": params["max_tokens"],
-            "top_p": params.get("top_p", self.config.top_p),
-        }
+        start_ns = time.perf_counter_ns()
+        body = self._build_request_data(messages, temperature, max_tokens, kwargs)
+        return self._chat_from_request(body, start_ns, kwargs)
+
+    def _chat_single(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Generate a response to a single user prompt."""
+        start_ns = time.perf_counter_ns()
+        body = self._single_prompt_body(prompt, temperature, max_tokens, kwargs)
+        return self._chat_from_request(body, start_ns, kwargs)
+
+    def generate(self, prompt: str, **kwargs) -> LLMResponse:
+        return self._chat_single(prompt, **kwargs)
+
+    async def chat_async(
+        self,
+        messages: List[Message],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Generate response from conversation without blocking the event loop."""
+        start_ns = time.perf_counter_ns()
+        body = self._build_request_data(messages, temperature, max_tokens, kwargs)
+        return await self._chat_from_request_async(body, start_ns, kwargs)
+
+    async def _chat_single_async(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Asynchronously generate a response to a single user prompt."""
+        start_ns = time.perf_counter_ns()
+        body = self._single_prompt_body(prompt, temperature, max_tokens, kwargs)
+        return await self._chat_from_request_async(body, start_ns, kwargs)
+
+    async def generate_async(self, prompt: str, **kwargs) -> LLMResponse:
+        return await self._chat_single_async(prompt, **kwargs)
+
+    @staticmethod
+    def _parse_stream_line(line: str) -> Optional[str]:
+        """
+        Extract the content delta from one server-sent event line.
+        
+        Returns:
+            Content text ("" for events without content), or None at
+            the end-of-stream marker
+        """
+        if not line.startswith("data:"):
+            return ""
+        payload = line[5:].strip()
+        if payload == "[DONE]":
+            return None
         
-        if "stop" in kwargs:
-            request_data["stop"] = kwargs["stop"]
-            
         try:
-            response_data = self._make_request("/chat/completions", request_data)
-            
-            choices = response_data.get("choices", [])
-            if not choices:
-                raise LLMError("No choices in Groq response")
+            choices = json_loads(payload).get("choices") or ({},)
+        except ValueError as e:
+            raise LLMError(f"Failed to parse Groq stream event: {e}")
+        return choices[0].get("delta", {}).get("content") or ""
+
+    def stream_chat(
+        self,
+        messages: List[Message],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Stream a response from conversation as it is generated.
+        
+        Args:
+            messages: List of conversation messages
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens
+            **kwargs: Additional parameters
             
-            choice = choices[0]
-            content = choice.get("message", {}).get("content", "")
-            finish_reason = choice.get("finish_reason", "stop")
+        Yields:
+            Content deltas in order
             
-            usage = response_data.get("usage", {})
-            prompt_tokens = usage.get("prompt_tokens", 0)
-            completion_tokens = usage.get("completion_tokens", 0)
-            total_tokens = usage.get("total_tokens", prompt_tokens + completion_tokens)
+        Raises:
+            LLMError: If the request fails
+        """
+        body = self._build_request_data(messages, temperature, max_tokens, kwargs, stream=True)
+        
+        try:
+            with self._client.stream(
+                "POST", self._chat_url, content=body, headers=self._next_key_headers()
+            ) as response:
+                if response.is_error:
+                    response.read()
+                    raise self._api_error(response)
+                
+                for line in response.iter_lines():
+                    delta = self._parse_stream_line(line)
+                    if delta is None:
+                        break
+                    if delta:
+                        yield delta
+        except httpx.HTTPError as e:
+            raise LLMError(
+                f"Failed to connect to Groq: {e}",
+                details={"url": str(self._chat_url)}
+            )
+
+    async def stream_chat_async(
+        self,
+        messages: List[Message],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Asynchronously stream a response from conversation.
+        
+        Args:
+            messages: List of conversation messages
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens
+            **kwargs: Additional parameters
             
-            latency = int((time.time() - start_time) * 1000)
+        Yields:
+            Content deltas in order
             
-            return LLMResponse(
-                content=content,
-                model=response_data.get("model", self.config.model),
-                provider=self.PROVIDER_NAME,
-                tokens_used=total_tokens,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                latency_ms=latency,
-                finish_reason=finish_reason,
-                metadata={"raw_response": response_data}
+        Raises:
+            LLMError: If the request fails
+        """
+        body = self._build_request_data(messages, temperature, max_tokens, kwargs, stream=True)
+        
+        try:
+            async with self._get_async_client().stream(
+                "POST", self._chat_url, content=body, headers=self._next_key_headers()
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                    raise self._api_error(response)
+                
+                async for line in response.aiter_lines():
+                    delta = self._parse_stream_line(line)
+                    if delta is None:
+                        break
+                    if delta:
+                        yield delta
+        except httpx.HTTPError as e:
+            raise LLMError(
+                f"Failed to connect to Groq: {e}",
+                details={"url": str(self._chat_url)}
             )
-        except Exception as e:
-            if isinstance(e, LLMError):
-                raise
-            raise LLMError(f"Failed to generate: {e}")
-
-    def generate(self, prompt: str, **kwargs) -> LLMResponse:
-        return self.chat([Message(role="user", content=prompt)], **kwargs)
-
-    async def chat_async(self, messages: List[Message], **kwargs) -> LLMResponse:
-        # Simple async fallback
-        return await asyncio.get_event_loop().run_in_executor(
-            None, lambda: self.chat(messages, **kwargs)
-        )
-
-    async def generate_async(self, prompt: str, **kwargs) -> LLMResponse:
-        return await self.chat_async([Message(role="user", content=prompt)], **kwargs)
 
     def is_available(self) -> bool:
+        """
+        Check if the Groq API is reachable with the configured key.
+        
+        Probes GET /models over the pooled client; the result is cached
+        for AVAILABILITY_TTL seconds so repeated health checks are free.
+        """
+        now = time.monotonic()
+        checked_at, available = self._availability
+        if checked_at is not None and now - checked_at < self.AVAILABILITY_TTL:
+            return available
+        
         try:
-            # Groq doesn't have a simple /models GET endpoint that's public without auth
-            # but we can try to list models using the OpenAI compatible endpoint
-            self._make_request("/models", {}, timeout=5)
-            return True
+            available = self._client.get(self._models_url, timeout=5).is_success
         except Exception:
-            return False
+            available = False
+        
+        self._availability = (now, available)
+        return available
 
     def get_models(self) -> List[str]:
-        try:
-            # Groq supports GET /v1/models
-            client = self._get_client()
-            url = f"{self.api_base}/models"
-            headers = self._build_headers()
-            req = client["request"].Request(url, headers=headers, method="GET")
-            with client["request"].urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode("utf-8"))
-                return [m["id"] for m in data.get("data", [])]
-        except Exception:
-            return ["openai/gpt-oss-120b", "llama-3.3-70b-versatile", "llama3-8b-8192", "mixtral-8x7b-32768", "gemma-7b-it"]
+        """
+        List models available to the configured key.
+        
+        Successful lookups are cached for MODELS_TTL seconds; on failure
+        a built-in list of common models is returned and not cached.
+        """
+        cached = self._models_cache
+        if cached is not None and time.monotonic() - cached[0] < self.MODELS_TTL:
+            return list(cached[1])
+        
+        with self._models_lock:
+            # Another thread may have refreshed the cache while we waited
+            cached = self._models_cache
+            if cached is not None and time.monotonic() - cached[0] < self.MODELS_TTL:
+                return list(cached[1])
+            
+            try:
+                # Groq supports GET /v1/models
+                response = self._client.get(self._models_url, timeout=10)
+                response.raise_for_status()
+                data = json_loads(response.content)
+                models = [m["id"] for m in data.get("data", [])]
+            except Exception:
+                return ["openai/gpt-oss-120b", "llama-3.3-70b-versatile", "llama3-8b-8192", "mixtral-8x7b-32768", "gemma-7b-it"]
+            
+            self._models_cache = (time.monotonic(), tuple(models))
+            return models
@@ -18,10 +18,18 @@ Reference: https://ollama.ai
 
 import time
 import asyncio
-import json
-from typing import Optional, List, Dict, Any
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Optional, List, Dict, Any, AsyncIterator, Callable, Union
 
-from .base import BaseLLMProvider, LLMConfig, LLMResponse, Message
+import httpx
+
+from .base import (
+    BaseLLMProvider, LLMConfig, LLMResponse, Message,
+    encode_chat_body, json_dumps, json_loads
+)
 from core.exceptions import LLMError
 from core.logging import get_logger
 
@@ -43,6 +51,11 @@ class OllamaProvider(BaseLLMProvider):
     - Multiple model support
     - Custom model support
     
+    Batches sent with chat_many/generate_many overlap network and
+    tokenization, but Ollama itself runs inference for a model one
+    request at a time (unless OLLAMA_NUM_PARALLEL is raised), so
+    throughput gains plateau at low concurrency.
+    
     Requirements:
     - Ollama installed: https://ollama.ai
     - Ollama service running: `ollama serve`
@@ -66,6 +79,30 @@ class OllamaProvider(BaseLLMProvider):
     PROVIDER_NAME = "ollama"
     DEFAULT_HOST = "http://localhost:11434"
     
+    # Call keyword arguments passed through as Ollama options
+    OPTION_KWARGS = ("top_p", "num_ctx", "seed")
+    
+    # Seconds an is_available() result is reused
+    AVAILABILITY_TTL = 5.0
+    
+    # Retry policy: a busy local server recovers quickly, so back off
+    # briefly; plain 500s usually mean a bad request or model
+    RETRY_STATUSES = frozenset({429, 502, 503, 504})
+    MAX_RETRIES = 3
+    RETRY_BACKOFF_INITIAL = 0.2
+    RETRY_BACKOFF_MAX = 4.0
+    
+    # Circuit breaker: fail fast for BREAKER_COOLDOWN seconds after
+    # BREAKER_THRESHOLD consecutive connection/server failures
+    BREAKER_THRESHOLD = 5
+    BREAKER_COOLDOWN = 10.0
+    
+    # Default number of deterministic responses kept in memory
+    RESPONSE_CACHE_SIZE = 1024
+    
+    # Connection pool limits for the keep-alive HTTP client
+    POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+    
     def __init__(self, config: LLMConfig):
         """
         Initialize Ollama provider.
@@ -81,42 +118,176 @@ class OllamaProvider(BaseLLMProvider):
         # Remove trailing slash
         self.host = self.host.rstrip("/")
         
-        # Initialize HTTP client lazily
-        self._client = None
+        self._model = config.model
+        
+        # Default generation options, shared by requests without overrides
+        self._base_options = {
+            "temperature": config.temperature,
+            "num_predict": config.max_tokens,
+            "top_p": config.top_p,
+        }
+        
+        # LRU cache of deterministic responses (temperature 0 or fixed seed)
+        self._response_cache_size = int(
+            config.extra_params.get("response_cache_size", self.RESPONSE_CACHE_SIZE)
+        )
+        self._response_cache: "OrderedDict[bytes, LLMResponse]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        
+        # Pooled HTTP client; keep-alive sockets are reused across requests
+        self._client = httpx.Client(
+            base_url=self.host,
+            headers={"Content-Type": "application/json"},
+            timeout=config.timeout,
+            limits=self.POOL_LIMITS,
+        )
+        
+        # httpx.Timeout objects memoized by seconds (see _timeout)
+        self._timeouts: Dict[float, httpx.Timeout] = {}
+        
+        # Last availability probe as (monotonic time, result)
+        self._availability = (None, False)
+        
+        # Circuit breaker: consecutive failures and when the circuit opened
+        self._breaker_failures = 0
+        self._breaker_opened_at = 0.0
+        
+        # Shared async client is created on first async call
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop = None
         
         logger.info(
             f"Initialized Ollama provider",
             extra={"model": config.model, "host": self.host}
         )
     
-    def _get_client(self):
+    def _options(
+        self,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
         """
-        Get or create HTTP client.
+        Build the Ollama "options" object for a request.
+        
+        Returns the shared defaults built at initialization when the
+        call has no overrides; callers must not modify the result.
         
+        Args:
+            temperature: Temperature override
+            max_tokens: Max tokens override (num_predict)
+            kwargs: Call keyword arguments (top_p, num_ctx, seed)
+            
         Returns:
-            HTTP client modules
+            Options dictionary
         """
-        if self._client is None:
-            try:
-                import urllib.request
-                import urllib.error
-                self._client = {
-                    "request": urllib.request,
-                    "error": urllib.error
-                }
-            except ImportError as e:
-                raise LLMError(f"Failed to import urllib: {e}")
-        return self._client
+        if temperature is None and max_tokens is None and kwargs.keys().isdisjoint(self.OPTION_KWARGS):
+            return self._base_options
+        
+        options = self._base_options.copy()
+        if temperature is not None:
+            options["temperature"] = temperature
+        if max_tokens is not None:
+            options["num_predict"] = max_tokens
+        for key in self.OPTION_KWARGS:
+            if key in kwargs:
+                options[key] = kwargs[key]
+        return options
+    
+    def _response_cache_key(
+        self,
+        options: Dict[str, Any],
+        request_data: Union[Dict[str, Any], bytes]
+    ) -> Optional[bytes]:
+        """
+        Get the response cache key for a request, if it is cacheable.
+        
+        Only deterministic requests (temperature 0 or a pinned seed)
+        are cached, keyed on a digest of the full request body.
+        
+        Args:
+            options: Generation options of the request
+            request_data: Request body
+            
+        Returns:
+            Cache key, or None if the response must not be cached
+        """
+        if not self._response_cache_size:
+            return None
+        if options.get("temperature") != 0 and options.get("seed") is None:
+            return None
+        return hashlib.blake2b(self._encode(request_data), digest_size=16).digest()
+    
+    @staticmethod
+    def _encode(data: Union[Dict[str, Any], bytes]) -> bytes:
+        """Encode a request body unless it is already JSON bytes."""
+        return data if isinstance(data, bytes) else json_dumps(data)
+    
+    def _cached_response(self, key: Optional[bytes]) -> Optional[LLMResponse]:
+        """Return a cached response for a key, marked as a cache hit."""
+        if key is None:
+            return None
+        with self._response_cache_lock:
+            response = self._response_cache.get(key)
+            if response is None:
+                return None
+            self._response_cache.move_to_end(key)
+        return replace(
+            response,
+            latency_ms=0,
+            metadata={**response.metadata, "cached": True}
+        )
+    
+    def _store_response(self, key: Optional[bytes], response: LLMResponse) -> None:
+        """Store a response in the LRU cache, evicting the oldest entry."""
+        if key is None:
+            return
+        with self._response_cache_lock:
+            self._response_cache[key] = response
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > self._response_cache_size:
+                self._response_cache.popitem(last=False)
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared async HTTP client, creating it on first use.
+        
+        A new client is created when called from a different event
+        loop, since pooled connections belong to the loop that opened
+        them.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client_loop = loop
+            self._async_client = httpx.AsyncClient(
+                base_url=self.host,
+                headers={"Content-Type": "application/json"},
+                timeout=self.config.timeout,
+                limits=self.POOL_LIMITS,
+            )
+        return self._async_client
+    
+    def close(self) -> None:
+        """Close the pooled HTTP client."""
+        self._client.close()
+    
+    async def aclose(self) -> None:
+        """Close both pooled HTTP clients."""
+        self._client.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_client_loop = None
     
     def _make_request(
         self,
         endpoint: str,
-        data: Dict[str, Any],
+        data: Union[Dict[str, Any], bytes],
         timeout: Optional[int] = None,
         stream: bool = False
     ) -> Dict[str, Any]:
         """
-        Make synchronous HTTP request to Ollama API.
+        Make synchronous HTTP request to Ollama API through the circuit breaker.
         
         Args:
             endpoint: API endpoint (e.g., "/api/generate")
@@ -126,61 +297,116 @@ class OllamaProvider(BaseLLMProvider):
             
         Returns:
             Response data
+            
+        Raises:
+            LLMError: If the request fails or the circuit is open
         """
-        client = self._get_client()
-        url = f"{self.host}{endpoint}"
-        timeout = timeout or self.config.timeout
-        
-        headers = {"Content-Type": "application/json"}
-        body = json.dumps(data).encode("utf-8")
+        self._check_breaker(endpoint)
+        try:
+            result = self._send_request(endpoint, data, timeout, stream)
+        except LLMError as e:
+            self._record_failure(e)
+            raise
+        self._breaker_failures = 0
+        return result
+    
+    def _send_request(
+        self,
+        endpoint: str,
+        data: Union[Dict[str, Any], bytes],
+        timeout: Optional[int] = None,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Make synchronous HTTP request to Ollama API, with retries.
         
-        req = client["request"].Request(
-            url,
-            data=body,
-            headers=headers,
-            method="POST"
-        )
+        Args:
+            endpoint: API endpoint (e.g., "/api/generate")
+            data: Request body
+            timeout: Request timeout
+            stream: Whether to stream response
+            
+        Returns:
+            Response data
+        """
+        url = f"{self.host}{endpoint}"
+        timeout = self._timeout(timeout)
+        body = self._encode(data)
+        attempt = 0
         
-        try:
-            with client["request"].urlopen(req, timeout=timeout) as response:
-                response_data = response.read().decode("utf-8")
+        while True:
+            try:
+                if stream:
+                    return self._read_last_frame(endpoint, body, timeout, url)
                 
-                # Ollama may return NDJSON (newline-delimited JSON)
-                if stream and "\n" in response_data:
-                    # Get last complete JSON object
-                    lines = [l for l in response_data.strip().split("\n") if l.strip()]
-                    if lines:
-                        return json.loads(lines[-1])
+                response = self._client.post(endpoint, content=body, timeout=timeout)
                 
-                return json.loads(response_data)
-        
-        except client["error"].HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else ""
-            raise LLMError(
-                f"Ollama API error: {error_body}",
-                details={"status": e.code, "url": url}
-            )
-        
-        except client["error"].URLError as e:
-            raise LLMError(
-                f"Failed to connect to Ollama: {e.reason}. Is Ollama running?",
-                details={"url": url, "hint": "Run 'ollama serve' to start Ollama"}
+                if not response.is_error:
+                    return json_loads(response.content)
+                
+                delay = self._retry_delay(attempt, response)
+                if delay is None:
+                    raise self._api_error(response, url)
+            
+            except LLMError:
+                raise
+            
+            except httpx.TransportError as e:
+                delay = self._retry_delay(attempt)
+                if delay is None:
+                    raise self._connection_error(e, url)
+            
+            except ValueError as e:
+                raise LLMError(f"Failed to parse Ollama response: {e}")
+            
+            except Exception as e:
+                raise LLMError(f"Unexpected error calling Ollama: {e}")
+            
+            logger.warning(
+                f"Ollama request failed, retrying",
+                extra={"attempt": attempt + 1, "delay": delay}
             )
+            time.sleep(delay)
+            attempt += 1
+    
+    def _read_last_frame(
+        self,
+        endpoint: str,
+        data: Union[Dict[str, Any], bytes],
+        timeout: httpx.Timeout,
+        url: str
+    ) -> Dict[str, Any]:
+        """
+        Read a streamed NDJSON response and return its final frame.
         
-        except json.JSONDecodeError as e:
-            raise LLMError(f"Failed to parse Ollama response: {e}")
+        Lines are consumed as they arrive and only the last non-empty
+        one is kept, so memory stays proportional to a single frame.
+        """
+        with self._client.stream(
+            "POST", endpoint, content=self._encode(data), timeout=timeout
+        ) as response:
+            if response.is_error:
+                response.read()
+                raise self._api_error(response, url)
+            
+            last = None
+            for line in response.iter_lines():
+                line = line.strip()
+                if line:
+                    last = line
         
-        except Exception as e:
-            raise LLMError(f"Unexpected error calling Ollama: {e}")
+        if last is None:
+            raise LLMError("Empty response from Ollama", details={"url": url})
+        return json_loads(last)
     
     async def _make_request_async(
         self,
         endpoint: str,
-        data: Dict[str, Any],
+        data: Union[Dict[str, Any], bytes],
         timeout: Optional[int] = None
     ) -> Dict[str, Any]:
         """
-        Make asynchronous HTTP request to Ollama.
+        Make asynchronous HTTP request to Ollama through the circuit breaker.
         
         Args:
             endpoint: API endpoint
@@ -189,35 +415,106 @@ class OllamaProvider(BaseLLMProvider):
             
         Returns:
             Response data
+            
+        Raises:
+            LLMError: If the request fails or the circuit is open
         """
+        self._check_breaker(endpoint)
         try:
-            import aiohttp
+            result = await self._send_request_async(endpoint, data, timeout)
+        except LLMError as e:
+            self._record_failure(e)
+            raise
+        self._breaker_failures = 0
+        return result
+    
+    async def _send_request_async(
+        self,
+        endpoint: str,
+        data: Union[Dict[str, Any], bytes],
+        timeout: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Make asynchronous HTTP request to Ollama, with retries.
+        
+        Args:
+            endpoint: API endpoint
+            data: Request body
+            timeout: Request timeout
             
-            url = f"{self.host}{endpoint}"
-            timeout_val = timeout or self.config.timeout
+        Returns:
+            Response data
+        """
+        url = f"{self.host}{endpoint}"
+        timeout_val = self._timeout(timeout)
+        body = self._encode(data)
+        attempt = 0
+        
+        while True:
+            try:
+                response = await self._get_async_client().post(
+                    endpoint, content=body, timeout=timeout_val
+                )
+            except httpx.TransportError as e:
+                delay = self._retry_delay(attempt)
+                if delay is None:
+                    raise self._connection_error(e, url)
+            else:
+                if response.status_code == 200:
+                    break
+                delay = self._retry_delay(attempt, response)
+                if delay is None:
+                    break
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url,
-                    json=data,
-                    timeout=aiohttp.ClientTimeout(total=timeout_val)
-                ) as response:
-                    response_data = await response.json()
-                    
-                    if response.status != 200:
-                        raise LLMError(
-                            f"Ollama API error: {response_data.get('error', 'Unknown error')}",
-                            details={"status": response.status}
-                        )
-                    
-                    return response_data
-        
-        except ImportError:
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                None,
-                lambda: self._make_request(endpoint, data, timeout)
+            logger.warning(
+                f"Ollama request failed, retrying",
+                extra={"attempt": attempt + 1, "delay": delay}
             )
+            await asyncio.sleep(delay)
+            attempt += 1
+        
+        if response.status_code != 200:
+            raise self._api_error(response, url)
+        
+        try:
+            return json_loads(response.content)
+        except ValueError as e:
+            raise LLMError(f"Failed to parse Ollama response: {e}")
+    
+    def _build_response(
+        self,
+        response_data: Dict[str, Any],
+        content: str,
+        start_ns: int,
+        kwargs: Dict[str, Any]
+    ) -> LLMResponse:
+        """
+        Convert an Ollama response body into an LLMResponse.
+        
+        Args:
+            response_data: Decoded response body
+            content: Generated text extracted from the body
+            start_ns: Request start from time.perf_counter_ns()
+            kwargs: Call keyword arguments
+            
+        Returns:
+            LLMResponse
+        """
+        get = response_data.get
+        prompt_tokens = get("prompt_eval_count", 0)
+        completion_tokens = get("eval_count", 0)
+        
+        return LLMResponse(
+            content=content,
+            model=self._model,
+            provider=self.PROVIDER_NAME,
+            tokens_used=prompt_tokens + completion_tokens,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_ms=self._elapsed_ms(start_ns),
+            finish_reason="stop" if get("done", True) else "length",
+            metadata=self._response_metadata(response_data, kwargs)
+        )
     
     def generate(
         self,
@@ -238,65 +535,43 @@ class OllamaProvider(BaseLLMProvider):
         Returns:
             LLMResponse with generated text
         """
-        start_time = time.time()
-        
-        params = self._get_generation_params(temperature, max_tokens, **kwargs)
+        start_ns = time.perf_counter_ns()
         
-        request_data = {
-            "model": self.config.model,
+        options = self._options(temperature, max_tokens, kwargs)
+        request_data = json_dumps({
+            "model": self._model,
             "prompt": prompt,
             "stream": False,
-            "options": {
-                "temperature": params["temperature"],
-                "num_predict": params["max_tokens"],
-                "top_p": params.get("top_p", self.config.top_p),
-            }
-        }
+            "options": options
+        })
         
-        # Add additional Ollama-specific options
-        if "num_ctx" in kwargs:
-            request_data["options"]["num_ctx"] = kwargs["num_ctx"]
-        if "seed" in kwargs:
-            request_data["options"]["seed"] = kwargs["seed"]
+        cache_key = self._response_cache_key(options, request_data)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
         
         logger.debug(
             f"Sending generate request to Ollama",
-            extra={"model": self.config.model, "prompt_length": len(prompt)}
+            extra={"model": self._model, "prompt_length": len(prompt)}
         )
         
         try:
             response_data = self._make_request("/api/generate", request_data)
-            
-            content = response_data.get("response", "")
-            done = response_data.get("done", True)
-            
-            # Ollama provides token counts
-            prompt_tokens = response_data.get("prompt_eval_count", 0)
-            completion_tokens = response_data.get("eval_count", 0)
-            total_tokens = prompt_tokens + completion_tokens
-            
-            latency = self._measure_latency(start_time)
+            response = self._build_response(
+                response_data, response_data.get("response", ""), start_ns, kwargs
+            )
             
             logger.info(
                 f"Ollama generation complete",
                 extra={
-                    "model": self.config.model,
-                    "tokens": total_tokens,
-                    "latency_ms": latency
+                    "model": response.model,
+                    "tokens": response.tokens_used,
+                    "latency_ms": response.latency_ms
                 }
             )
             
-            return LLMResponse(
-                content=content,
-                model=self.config.model,
-                provider=self.PROVIDER_NAME,
-                tokens_used=total_tokens,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                latency_ms=latency,
-                finish_reason="stop" if done else "length",
-                metadata=response_data
-            )
+            self._store_response(cache_key, response)
+            return response
         
         except LLMError:
             raise
@@ -322,53 +597,28 @@ class OllamaProvider(BaseLLMProvider):
         Returns:
             LLMResponse with generated text
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
-        params = self._get_generation_params(temperature, max_tokens, **kwargs)
+        # Messages are spliced in from their cached JSON encoding
+        options = self._options(temperature, max_tokens, kwargs)
+        request_data = encode_chat_body(
+            messages,
+            {"model": self._model, "stream": False, "options": options}
+        )
         
-        # Convert messages to Ollama format
-        ollama_messages = []
-        for m in messages:
-            ollama_messages.append({
-                "role": m.role,
-                "content": m.content
-            })
-        
-        request_data = {
-            "model": self.config.model,
-            "messages": ollama_messages,
-            "stream": False,
-            "options": {
-                "temperature": params["temperature"],
-                "num_predict": params["max_tokens"],
-                "top_p": params.get("top_p", self.config.top_p),
-            }
-        }
+        cache_key = self._response_cache_key(options, request_data)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
         
         try:
             response_data = self._make_request("/api/chat", request_data)
-            
-            message = response_data.get("message", {})
-            content = message.get("content", "")
-            done = response_data.get("done", True)
-            
-            prompt_tokens = response_data.get("prompt_eval_count", 0)
-            completion_tokens = response_data.get("eval_count", 0)
-            total_tokens = prompt_tokens + completion_tokens
-            
-            latency = self._measure_latency(start_time)
-            
-            return LLMResponse(
-                content=content,
-                model=self.config.model,
-                provider=self.PROVIDER_NAME,
-                tokens_used=total_tokens,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                latency_ms=latency,
-                finish_reason="stop" if done else "length",
-                metadata=response_data
+            message = response_data.get("message") or {}
+            response = self._build_response(
+                response_data, message.get("content", ""), start_ns, kwargs
             )
+            self._store_response(cache_key, response)
+            return response
         
         except LLMError:
             raise
@@ -394,39 +644,28 @@ class OllamaProvider(BaseLLMProvider):
         Returns:
             LLMResponse
         """
-        start_time = time.time()
-        
-        params = self._get_generation_params(temperature, max_tokens, **kwargs)
+        start_ns = time.perf_counter_ns()
         
-        request_data = {
-            "model": self.config.model,
+        options = self._options(temperature, max_tokens, kwargs)
+        request_data = json_dumps({
+            "model": self._model,
             "prompt": prompt,
             "stream": False,
-            "options": {
-                "temperature": params["temperature"],
-                "num_predict": params["max_tokens"],
-            }
-        }
+            "options": options
+        })
+        
+        cache_key = self._response_cache_key(options, request_data)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
         
         try:
             response_data = await self._make_request_async("/api/generate", request_data)
-            
-            content = response_data.get("response", "")
-            prompt_tokens = response_data.get("prompt_eval_count", 0)
-            completion_tokens = response_data.get("eval_count", 0)
-            
-            latency = self._measure_latency(start_time)
-            
-            return LLMResponse(
-                content=content,
-                model=self.config.model,
-                provider=self.PROVIDER_NAME,
-                tokens_used=prompt_tokens + completion_tokens,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                latency_ms=latency,
-                metadata=response_data
+            response = self._build_response(
+                response_data, response_data.get("response", ""), start_ns, kwargs
             )
+            self._store_response(cache_key, response)
+            return response
         
         except LLMError:
             raise
@@ -452,64 +691,266 @@ class OllamaProvider(BaseLLMProvider):
         Returns:
             LLMResponse
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
-        params = self._get_generation_params(temperature, max_tokens, **kwargs)
+        options = self._options(temperature, max_tokens, kwargs)
+        request_data = encode_chat_body(
+            messages,
+            {"model": self._model, "stream": False, "options": options}
+        )
         
-        request_data = {
-            "model": self.config.model,
-            "messages": [m.to_dict() for m in messages],
-            "stream": False,
-            "options": {
-                "temperature": params["temperature"],
-                "num_predict": params["max_tokens"],
-            }
-        }
+        cache_key = self._response_cache_key(options, request_data)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
         
         try:
             response_data = await self._make_request_async("/api/chat", request_data)
-            
-            content = response_data.get("message", {}).get("content", "")
-            prompt_tokens = response_data.get("prompt_eval_count", 0)
-            completion_tokens = response_data.get("eval_count", 0)
-            
-            latency = self._measure_latency(start_time)
-            
-            return LLMResponse(
-                content=content,
-                model=self.config.model,
-                provider=self.PROVIDER_NAME,
-                tokens_used=prompt_tokens + completion_tokens,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                latency_ms=latency,
-                metadata=response_data
+            message = response_data.get("message") or {}
+            response = self._build_response(
+                response_data, message.get("content", ""), start_ns, kwargs
             )
+            self._store_response(cache_key, response)
+            return response
         
         except LLMError:
             raise
         except Exception as e:
             raise LLMError(f"Failed to chat async with Ollama: {e}")
     
+    async def _stream_frames(
+        self,
+        endpoint: str,
+        request_data: Union[Dict[str, Any], bytes]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream NDJSON frames from Ollama as they arrive.
+        
+        Args:
+            endpoint: API endpoint
+            request_data: Request body (with "stream": True)
+            
+        Yields:
+            Decoded frames, up to and including the one marked done
+        """
+        url = f"{self.host}{endpoint}"
+        
+        try:
+            async with self._get_async_client().stream(
+                "POST", endpoint, content=self._encode(request_data)
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                    raise self._api_error(response, url)
+                
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    frame = json_loads(line)
+                    if frame.get("error"):
+                        raise LLMError(f"Ollama API error: {frame['error']}", details={"url": url})
+                    yield frame
+                    if frame.get("done"):
+                        break
+        except httpx.TransportError as e:
+            raise self._connection_error(e, url)
+        except ValueError as e:
+            raise LLMError(f"Failed to parse Ollama response: {e}")
+    
+    async def generate_stream(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated text as Ollama produces it.
+        
+        Args:
+            prompt: Input prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens
+            **kwargs: Additional parameters
+            
+        Yields:
+            Text fragments in order
+        """
+        request_data = {
+            "model": self._model,
+            "prompt": prompt,
+            "stream": True,
+            "options": self._options(temperature, max_tokens, kwargs)
+        }
+        
+        async for frame in self._stream_frames("/api/generate", request_data):
+            text = frame.get("response")
+            if text:
+                yield text
+    
+    async def chat_stream(
+        self,
+        messages: List[Message],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat response as Ollama produces it.
+        
+        Args:
+            messages: Conversation messages
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens
+            **kwargs: Additional parameters
+            
+        Yields:
+            Text fragments in order
+        """
+        request_data = encode_chat_body(
+            messages,
+            {
+                "model": self._model,
+                "stream": True,
+                "options": self._options(temperature, max_tokens, kwargs),
+            }
+        )
+        
+        async for frame in self._stream_frames("/api/chat", request_data):
+            text = (frame.get("message") or {}).get("content")
+            if text:
+                yield text
+    
+    def _timeout(self, seconds: Optional[float] = None) -> httpx.Timeout:
+        """
+        Get a shared httpx.Timeout for the given number of seconds.
+        
+        httpx builds a new Timeout from a bare number on every request;
+        only a handful of distinct values are used, so they are built once.
+        
+        Args:
+            seconds: Timeout in seconds (defaults to config.timeout)
+            
+        Returns:
+            Memoized timeout object
+        """
+        seconds = seconds or self.config.timeout
+        timeout = self._timeouts.get(seconds)
+        if timeout is None:
+            timeout = self._timeouts.setdefault(seconds, httpx.Timeout(seconds))
+        return timeout
+    
+    def _check_breaker(self, endpoint: str) -> None:
+        """
+        Fail fast while the circuit breaker is open.
+        
+        After BREAKER_THRESHOLD consecutive failures, calls are rejected
+        for BREAKER_COOLDOWN seconds. Once the cooldown has passed one
+        call is let through as a probe (half-open) and the cooldown
+        restarts, so concurrent callers keep failing fast until the
+        probe succeeds.
+        
+        Raises:
+            LLMError: If the circuit is open
+        """
+        if self._breaker_failures < self.BREAKER_THRESHOLD:
+            return
+        
+        now = time.monotonic()
+        remaining = self.BREAKER_COOLDOWN - (now - self._breaker_opened_at)
+        if remaining > 0:
+            raise LLMError(
+                "Ollama circuit open after repeated failures",
+                details={"url": f"{self.host}{endpoint}", "retry_in": round(remaining, 1)}
+            )
+        self._breaker_opened_at = now
+    
+    def _record_failure(self, error: LLMError) -> None:
+        """Count a failed request towards opening the circuit breaker."""
+        status = error.details.get("status")
+        if status is not None and status < 500:
+            # Client errors say nothing about server health
+            return
+        self._breaker_failures += 1
+        if self._breaker_failures >= self.BREAKER_THRESHOLD:
+            self._breaker_opened_at = time.monotonic()
+    
+    def breaker_state(self) -> Dict[str, Any]:
+        """
+        Get the circuit breaker state for metrics.
+        
+        Returns:
+            Dictionary with the state ("closed", "open" or "half_open")
+            and the consecutive failure count
+        """
+        if self._breaker_failures < self.BREAKER_THRESHOLD:
+            state = "closed"
+        elif time.monotonic() - self._breaker_opened_at < self.BREAKER_COOLDOWN:
+            state = "open"
+        else:
+            state = "half_open"
+        return {"state": state, "failures": self._breaker_failures}
+    
+    def _api_error(self, response: httpx.Response, url: str) -> LLMError:
+        """
+        Build an LLMError from a non-2xx Ollama response.
+        
+        The body is decoded once: the "error" field when it is JSON,
+        otherwise the raw text. Rate limit headers are copied into the
+        details so callers can throttle adaptively.
+        """
+        try:
+            error_msg = json_loads(response.content).get("error") or response.text
+        except (ValueError, AttributeError):
+            error_msg = response.text
+        
+        details = {"status": response.status_code, "url": url}
+        retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            details["retry_after"] = retry_after
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None:
+            details["rate_limit_remaining"] = remaining
+        
+        return LLMError(f"Ollama API error: {error_msg}", details=details)
+    
+    def _connection_error(self, error: Exception, url: str) -> LLMError:
+        """
+        Build the LLMError for a failed connection.
+        
+        Also drops the cached availability result so the next
+        is_available() call probes the server again.
+        """
+        self._availability = (None, False)
+        return LLMError(
+            f"Failed to connect to Ollama: {error}. Is Ollama running?",
+            details={"url": url, "hint": "Run 'ollama serve' to start Ollama"}
+        )
+    
     def is_available(self) -> bool:
         """
         Check if Ollama is running and accessible.
         
+        The result is cached for AVAILABILITY_TTL seconds, or until a
+        request fails to connect.
+        
         Returns:
             True if Ollama is running
         """
-        try:
-            client = self._get_client()
-            url = f"{self.host}/api/version"
-            
-            req = client["request"].Request(url, method="GET")
-            
-            with client["request"].urlopen(req, timeout=5) as response:
-                return response.status == 200
+        now = time.monotonic()
+        checked_at, available = self._availability
+        if checked_at is not None and now - checked_at < self.AVAILABILITY_TTL:
+            return available
         
+        try:
+            response = self._client.get("/api/version", timeout=self._timeout(5))
+            available = response.status_code == 200
         except Exception as e:
             logger.debug(f"Ollama availability check failed: {e}")
-            return False
+            available = False
+        
+        self._availability = (now, available)
+        return available
     
     def get_models(self) -> List[str]:
         """
@@ -519,37 +960,57 @@ class OllamaProvider(BaseLLMProvider):
             List of model names
         """
         try:
-            client = self._get_client()
-            url = f"{self.host}/api/tags"
-            
-            req = client["request"].Request(url, method="GET")
-            
-            with client["request"].urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode("utf-8"))
-                models = data.get("models", [])
-                return [m.get("name") for m in models if m.get("name")]
+            response = self._client.get("/api/tags", timeout=self._timeout(10))
+            response.raise_for_status()
+            data = json_loads(response.content)
+            models = data.get("models", [])
+            return [m.get("name") for m in models if m.get("name")]
         
         except Exception as e:
             logger.warning(f"Failed to get Ollama models: {e}")
             return []
     
-    def pull_model(self, model_name: str) -> bool:
+    def pull_model(
+        self,
+        model_name: str,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> bool:
         """
         Pull (download) a model from Ollama registry.
         
+        Progress is streamed as NDJSON frames, so the read timeout applies
+        between frames rather than to the whole download: a stalled pull
+        fails after config.timeout instead of holding the thread for minutes.
+        
         Args:
             model_name: Name of model to pull
+            on_progress: Optional callback invoked with each progress frame
             
         Returns:
             True if successful
         """
+        url = f"{self.host}/api/pull"
+        body = json_dumps({"name": model_name, "stream": True})
+        
         try:
-            response = self._make_request(
-                "/api/pull",
-                {"name": model_name, "stream": False},
-                timeout=300  # 5 minutes for large models
-            )
-            return response.get("status") == "success"
+            with self._client.stream(
+                "POST", "/api/pull", content=body, timeout=self._timeout()
+            ) as response:
+                if response.is_error:
+                    response.read()
+                    raise self._api_error(response, url)
+                
+                for line in response.iter_lines():
+                    if not line.strip():
+                        continue
+                    frame = json_loads(line)
+                    if frame.get("error"):
+                        raise LLMError(f"Ollama API error: {frame['error']}", details={"url": url})
+                    if on_progress is not None:
+                        on_progress(frame)
+                    if frame.get("status") == "success":
+                        return True
+            return False
         except Exception as e:
             logger.error(f"Failed to pull model {model_name}: {e}")
             return False
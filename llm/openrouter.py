@@ -19,23 +19,37 @@ Reference: https://openrouter.ai/docs
 
 import time
 import asyncio
-from typing import Optional, List, Dict, Any
-import json
+import logging
+import threading
+from dataclasses import replace
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterator, Tuple, Union
 
-from .base import BaseLLMProvider, LLMConfig, LLMResponse, Message
+import httpx
+
+from .base import (
+    BaseLLMProvider, LLMConfig, LLMResponse, Message,
+    encode_chat_body, json_dumps, json_loads
+)
 from core.exceptions import LLMError
 from core.logging import get_logger
 
 logger = get_logger("llm.openrouter")
 
+# Optional: h2 lets httpx multiplex concurrent requests over one HTTP/2 connection
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 
 class OpenRouterProvider(BaseLLMProvider):
     """
     LLM provider implementation for OpenRouter API.
     
     OpenRouter provides a unified API to access multiple LLM providers.
-    This implementation uses HTTP requests (via urllib or requests) to
-    communicate with the OpenRouter API.
+    This implementation uses a pooled httpx client to communicate
+    with the OpenRouter API.
     
     Features:
     - Access to 100+ models through single API
@@ -64,10 +78,28 @@ class OpenRouterProvider(BaseLLMProvider):
     # Default headers for OpenRouter API
     DEFAULT_HEADERS = {
         "Content-Type": "application/json",
+        "Accept-Encoding": "gzip, deflate",  # JSON compresses 5-10x; httpx decodes
         "HTTP-Referer": "https://github.com/sms-ai-agent",  # For rankings
         "X-Title": "SMS AI Agent",  # For rankings
     }
     
+    # Connection pool limits for the keep-alive HTTP client
+    POOL_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+    
+    # Bytes of a non-JSON error body kept in error messages
+    ERROR_BODY_LIMIT = 500
+    
+    # Seconds a get_models() result is reused
+    MODELS_TTL = 300.0
+    
+    # Common models returned when the model listing is unavailable
+    FALLBACK_MODELS = (
+        "meta-llama/llama-3.3-70b-instruct:free",
+        "openai/gpt-4o-mini",
+        "anthropic/claude-3.5-sonnet",
+        "google/gemini-pro",
+    )
+    
     def __init__(self, config: LLMConfig):
         """
         Initialize OpenRouter provider.
@@ -92,59 +124,119 @@ class OpenRouterProvider(BaseLLMProvider):
         
         self.api_key = config.api_key
         
-        # Initialize HTTP client lazily
-        self._client = None
+        # Absolute endpoint URLs, parsed once so httpx skips per-request
+        # merging with base_url (and a bad api_base fails at startup)
+        self._chat_url = httpx.URL(f"{self.api_base}/chat/completions")
+        self._models_url = httpx.URL(f"{self.api_base}/models")
+        
+        # Default request fields; copied and overridden per call
+        self._request_template = {
+            "model": config.model,
+            "temperature": config.temperature,
+            "max_tokens": config.max_tokens,
+            "top_p": config.top_p,
+        }
+        
+        # Request headers are fixed for the provider's lifetime; they are
+        # set as client defaults, which httpx encodes once per client
+        self._headers = {
+            **self.DEFAULT_HEADERS,
+            "Authorization": f"Bearer {self.api_key}",
+        }
+        
+        # Negotiate HTTP/2 when h2 is installed (opt out with extra_params["http2"])
+        self._http2 = _HTTP2_AVAILABLE and bool(config.extra_params.get("http2", True))
+        
+        # Pooled HTTP client; keep-alive sockets are reused across requests
+        # so only the first call pays the DNS lookup and TCP/TLS handshake.
+        self._client = httpx.Client(
+            base_url=self.api_base,
+            headers=self._headers,
+            timeout=config.timeout,
+            limits=self.POOL_LIMITS,
+            http2=self._http2,
+        )
+        
+        # Async client is created on first async call
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop = None
+        
+        # Last model listing as (monotonic time, model ids)
+        self._models_cache = None
+        self._models_lock = threading.Lock()
+        
+        # In-flight async chat requests keyed by (event loop, encoded body,
+        # include_raw), so identical concurrent deterministic requests on
+        # the same loop can share one network call when opted in
+        self._inflight: Dict[Tuple[Any, bytes, Any], "asyncio.Task[LLMResponse]"] = {}
+        self._coalesce = bool(config.extra_params.get("deduplicate_inflight", False))
         
         logger.info(
             f"Initialized OpenRouter provider",
             extra={"model": config.model, "api_base": self.api_base}
         )
     
-    def _get_client(self):
+    @staticmethod
+    def _encode(data: Union[Dict[str, Any], bytes]) -> bytes:
+        """Encode a request body unless it is already JSON bytes."""
+        return data if isinstance(data, bytes) else json_dumps(data)
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
         """
-        Get or create HTTP client.
-        
-        Uses urllib for Termux compatibility (no dependency on requests).
+        Get the pooled async HTTP client, creating it on first use.
         
-        Returns:
-            HTTP client module
+        Pooled connections belong to the event loop that opened them,
+        so a new client is created when called from a different loop
+        (e.g. successive asyncio.run calls). With HTTP/2, concurrent
+        requests share streams on one connection instead of each
+        holding its own socket.
         """
-        if self._client is None:
-            try:
-                import urllib.request
-                import urllib.error
-                self._client = {
-                    "request": urllib.request,
-                    "error": urllib.error
-                }
-            except ImportError as e:
-                raise LLMError(f"Failed to import urllib: {e}")
-        return self._client
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client_loop = loop
+            self._async_client = httpx.AsyncClient(
+                base_url=self.api_base,
+                headers=self._headers,
+                timeout=self.config.timeout,
+                limits=self.POOL_LIMITS,
+                http2=self._http2,
+            )
+        return self._async_client
     
-    def _build_headers(self) -> Dict[str, str]:
+    def _api_error(self, response: httpx.Response) -> LLMError:
         """
-        Build request headers with authorization.
+        Build an LLMError from a non-2xx OpenRouter response.
         
-        Returns:
-            Dictionary of headers
+        The body bytes are parsed directly; non-JSON bodies (e.g. proxy
+        error pages) are truncated to ERROR_BODY_LIMIT bytes.
         """
-        headers = self.DEFAULT_HEADERS.copy()
-        headers["Authorization"] = f"Bearer {self.api_key}"
-        return headers
+        body = response.content
+        try:
+            error_msg = json_loads(body)["error"]["message"]
+        except (ValueError, LookupError, TypeError):
+            error_msg = body[:self.ERROR_BODY_LIMIT].decode("utf-8", "replace") or response.reason_phrase
+        
+        return LLMError(
+            f"OpenRouter API error: {error_msg}",
+            details={"status": response.status_code, "url": str(response.url)}
+        )
     
     def _make_request(
         self,
-        endpoint: str,
-        data: Dict[str, Any],
-        timeout: Optional[int] = None
+        url: httpx.URL,
+        data: Union[Dict[str, Any], bytes, None],
+        timeout: Optional[int] = None,
+        method: str = "POST"
     ) -> Dict[str, Any]:
         """
         Make synchronous HTTP request to OpenRouter API.
         
         Args:
-            endpoint: API endpoint (e.g., "/chat/completions")
-            data: Request body as dictionary
+            url: Endpoint URL (e.g., self._chat_url)
+            data: Request body as dictionary or encoded JSON bytes;
+                None sends no body
             timeout: Request timeout in seconds
+            method: HTTP method
             
         Returns:
             Response data as dictionary
@@ -152,108 +244,231 @@ class OpenRouterProvider(BaseLLMProvider):
         Raises:
             LLMError: If request fails
         """
-        client = self._get_client()
-        url = f"{self.api_base}{endpoint}"
-        headers = self._build_headers()
         timeout = timeout or self.config.timeout
         
-        # Prepare request
-        body = json.dumps(data).encode("utf-8")
-        req = client["request"].Request(
-            url,
-            data=body,
-            headers=headers,
-            method="POST"
-        )
-        
         try:
-            with client["request"].urlopen(req, timeout=timeout) as response:
-                response_data = response.read().decode("utf-8")
-                return json.loads(response_data)
-        
-        except client["error"].HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else ""
-            try:
-                error_data = json.loads(error_body)
-                error_msg = error_data.get("error", {}).get("message", str(e))
-            except json.JSONDecodeError:
-                error_msg = error_body or str(e)
-            
-            raise LLMError(
-                f"OpenRouter API error: {error_msg}",
-                details={"status": e.code, "url": url}
+            content = None if data is None else self._encode(data)
+            response = self._client.request(
+                method, url, content=content, timeout=timeout
             )
-        
-        except client["error"].URLError as e:
+        except httpx.HTTPError as e:
             raise LLMError(
-                f"Failed to connect to OpenRouter: {e.reason}",
-                details={"url": url}
+                f"Failed to connect to OpenRouter: {e}",
+                details={"url": str(url)}
             )
-        
-        except json.JSONDecodeError as e:
+        except Exception as e:
             raise LLMError(
-                f"Failed to parse OpenRouter response: {e}",
-                details={"url": url}
+                f"Unexpected error calling OpenRouter: {e}",
+                details={"url": str(url)}
             )
         
-        except Exception as e:
+        if response.is_error:
+            raise self._api_error(response)
+        
+        try:
+            return json_loads(response.content)
+        except ValueError as e:
             raise LLMError(
-                f"Unexpected error calling OpenRouter: {e}",
-                details={"url": url}
+                f"Failed to parse OpenRouter response: {e}",
+                details={"url": str(url)}
             )
     
     async def _make_request_async(
         self,
-        endpoint: str,
-        data: Dict[str, Any],
+        url: httpx.URL,
+        data: Union[Dict[str, Any], bytes],
         timeout: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Make asynchronous HTTP request to OpenRouter API.
         
-        Uses aiohttp if available, falls back to asyncio with urllib.
+        Reuses keep-alive connections from the shared async client.
         
         Args:
-            endpoint: API endpoint
+            url: Endpoint URL
             data: Request body
             timeout: Request timeout
             
         Returns:
             Response data
         """
-        # Try to use aiohttp if available
+        timeout = timeout or self.config.timeout
+        
         try:
-            import aiohttp
-            
-            url = f"{self.api_base}{endpoint}"
-            headers = self._build_headers()
-            timeout_val = timeout or self.config.timeout
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url,
-                    json=data,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=timeout_val)
-                ) as response:
-                    response_data = await response.json()
-                    
-                    if response.status != 200:
-                        error_msg = response_data.get("error", {}).get("message", "Unknown error")
-                        raise LLMError(
-                            f"OpenRouter API error: {error_msg}",
-                            details={"status": response.status, "url": url}
-                        )
-                    
-                    return response_data
-        
-        except ImportError:
-            # Fall back to running sync in executor
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                None,
-                lambda: self._make_request(endpoint, data, timeout)
+            response = await self._get_async_client().post(
+                url, content=self._encode(data), timeout=timeout
+            )
+        except httpx.HTTPError as e:
+            raise LLMError(
+                f"Failed to connect to OpenRouter: {e}",
+                details={"url": str(url)}
+            )
+        
+        # Check the status first so error bodies are only parsed once,
+        # by _api_error, and non-JSON error pages don't mask the status
+        if response.is_error:
+            raise self._api_error(response)
+        
+        try:
+            return json_loads(response.content)
+        except ValueError as e:
+            raise LLMError(
+                f"Failed to parse OpenRouter response: {e}",
+                details={"url": str(url)}
+            )
+    
+    def _request_fields(
+        self,
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Build the chat completion request fields other than messages.
+        
+        Starts from the per-instance template and only overrides the
+        fields given for this call.
+        """
+        fields = self._request_template.copy()
+        
+        if temperature is not None:
+            fields["temperature"] = temperature
+        if max_tokens is not None:
+            fields["max_tokens"] = max_tokens
+        if "top_p" in kwargs:
+            fields["top_p"] = kwargs["top_p"]
+        if "stop" in kwargs:
+            fields["stop"] = kwargs["stop"]
+        if stream:
+            fields["stream"] = True
+        
+        return fields
+    
+    def _single_prompt_body(
+        self,
+        prompt: str,
+        fields: Dict[str, Any]
+    ) -> bytes:
+        """Encode a one-message user request without building Message objects."""
+        return json_dumps({"messages": [{"role": "user", "content": prompt}], **fields})
+    
+    def _parse_chat_response(
+        self,
+        response_data: Dict[str, Any],
+        start_ns: int,
+        kwargs: Dict[str, Any]
+    ) -> LLMResponse:
+        """Build an LLMResponse from a decoded chat completion."""
+        # The OpenAI-compatible schema is fixed, so index directly
+        # instead of chaining .get() calls with throwaway defaults
+        try:
+            choice = response_data["choices"][0]
+            content = choice["message"]["content"] or ""
+        except (KeyError, IndexError, TypeError):
+            raise LLMError(
+                "Malformed OpenRouter response: no message choice",
+                details={"keys": list(response_data)}
+            )
+        finish_reason = choice.get("finish_reason") or "stop"
+        
+        # Parse usage
+        usage = response_data.get("usage") or {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        total_tokens = usage.get("total_tokens", prompt_tokens + completion_tokens)
+        
+        latency = self._elapsed_ms(start_ns)
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"OpenRouter generation complete",
+                extra={
+                    "model": self.config.model,
+                    "tokens": total_tokens,
+                    "latency_ms": latency
+                }
             )
+        
+        return LLMResponse(
+            content=content,
+            model=response_data.get("model", self.config.model),
+            provider=self.PROVIDER_NAME,
+            tokens_used=total_tokens,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_ms=latency,
+            finish_reason=finish_reason,
+            metadata=self._response_metadata(response_data, kwargs)
+        )
+    
+    def _log_request(self, message_count: int, fields: Dict[str, Any]) -> None:
+        """Log an outgoing chat request when debug logging is enabled."""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        logger.debug(
+            f"Sending chat request to OpenRouter",
+            extra={
+                "model": self.config.model,
+                "message_count": message_count,
+                "max_tokens": fields["max_tokens"]
+            }
+        )
+    
+    def _send_chat(self, body: bytes, start_ns: int, kwargs: Dict[str, Any]) -> LLMResponse:
+        """Send an encoded chat request and parse the completion."""
+        try:
+            response_data = self._make_request(self._chat_url, body)
+            return self._parse_chat_response(response_data, start_ns, kwargs)
+        except LLMError:
+            raise
+        except Exception as e:
+            raise LLMError(f"Failed to generate: {e}")
+    
+    async def _send_chat_async(
+        self,
+        body: bytes,
+        start_ns: int,
+        kwargs: Dict[str, Any]
+    ) -> LLMResponse:
+        """Send an encoded chat request asynchronously and parse the completion."""
+        try:
+            response_data = await self._make_request_async(self._chat_url, body)
+            return self._parse_chat_response(response_data, start_ns, kwargs)
+        except LLMError:
+            raise
+        except Exception as e:
+            raise LLMError(f"Failed to generate async: {e}")
+    
+    async def _send_chat_coalesced(
+        self,
+        body: bytes,
+        fields: Dict[str, Any],
+        start_ns: int,
+        kwargs: Dict[str, Any]
+    ) -> LLMResponse:
+        """
+        Send a chat request, sharing the call with identical ones in flight.
+        
+        Coalescing is opt-in via extra_params["deduplicate_inflight"] and
+        only applies to temperature 0 requests; sampled requests always
+        get their own call. Requests are only shared within one event
+        loop and when they ask for the same include_raw metadata. Each
+        caller gets its own copy of the response, and the shared task is
+        shielded so one caller's cancellation doesn't cancel it for the
+        others.
+        """
+        if not self._coalesce or fields["temperature"] != 0:
+            return await self._send_chat_async(body, start_ns, kwargs)
+        
+        key = (asyncio.get_running_loop(), body, kwargs.get("include_raw"))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._send_chat_async(body, start_ns, kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        response = await asyncio.shield(task)
+        return replace(response, metadata=dict(response.metadata))
     
     def generate(
         self,
@@ -265,6 +480,9 @@ class OpenRouterProvider(BaseLLMProvider):
         """
         Generate text from a prompt using OpenRouter.
         
+        The prompt is sent as a single user message, encoded directly
+        without building a Message object.
+        
         Args:
             prompt: Input prompt text
             temperature: Sampling temperature (0-2)
@@ -277,9 +495,10 @@ class OpenRouterProvider(BaseLLMProvider):
         Raises:
             LLMError: If generation fails
         """
-        # Convert prompt to chat format for better compatibility
-        messages = [Message(role="user", content=prompt)]
-        return self.chat(messages, temperature, max_tokens, **kwargs)
+        start_ns = time.perf_counter_ns()
+        fields = self._request_fields(temperature, max_tokens, kwargs)
+        self._log_request(1, fields)
+        return self._send_chat(self._single_prompt_body(prompt, fields), start_ns, kwargs)
     
     def chat(
         self,
@@ -303,77 +522,12 @@ class OpenRouterProvider(BaseLLMProvider):
         Raises:
             LLMError: If generation fails
         """
-        start_time = time.time()
-        
-        # Build request
-        params = self._get_generation_params(temperature, max_tokens, **kwargs)
-        
-        request_data = {
-            "model": self.config.model,
-            "messages": [m.to_dict() for m in messages],
-            "temperature": params["temperature"],
-            "max_tokens": params["max_tokens"],
-            "top_p": params.get("top_p", self.config.top_p),
-        }
-        
-        # Add optional parameters
-        if "stop" in kwargs:
-            request_data["stop"] = kwargs["stop"]
-        
-        logger.debug(
-            f"Sending chat request to OpenRouter",
-            extra={
-                "model": self.config.model,
-                "message_count": len(messages),
-                "max_tokens": request_data["max_tokens"]
-            }
-        )
-        
-        try:
-            response_data = self._make_request("/chat/completions", request_data)
-            
-            # Parse response
-            choices = response_data.get("choices", [])
-            if not choices:
-                raise LLMError("No choices in OpenRouter response")
-            
-            choice = choices[0]
-            content = choice.get("message", {}).get("content", "")
-            finish_reason = choice.get("finish_reason", "stop")
-            
-            # Parse usage
-            usage = response_data.get("usage", {})
-            prompt_tokens = usage.get("prompt_tokens", 0)
-            completion_tokens = usage.get("completion_tokens", 0)
-            total_tokens = usage.get("total_tokens", prompt_tokens + completion_tokens)
-            
-            latency = self._measure_latency(start_time)
-            
-            logger.info(
-                f"OpenRouter generation complete",
-                extra={
-                    "model": self.config.model,
-                    "tokens": total_tokens,
-                    "latency_ms": latency
-                }
-            )
-            
-            return LLMResponse(
-                content=content,
-                model=response_data.get("model", self.config.model),
-                provider=self.PROVIDER_NAME,
-                tokens_used=total_tokens,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                latency_ms=latency,
-                finish_reason=finish_reason,
-                metadata={"raw_response": response_data}
-            )
+        start_ns = time.perf_counter_ns()
+        fields = self._request_fields(temperature, max_tokens, kwargs)
+        self._log_request(len(messages), fields)
         
-        except LLMError:
-            raise
-        except Exception as e:
-            raise LLMError(f"Failed to generate: {e}")
+        # Message JSON is cached per Message and spliced into the body
+        return self._send_chat(encode_chat_body(messages, fields), start_ns, kwargs)
     
     async def generate_async(
         self,
@@ -394,8 +548,11 @@ class OpenRouterProvider(BaseLLMProvider):
         Returns:
             LLMResponse with generated text
         """
-        messages = [Message(role="user", content=prompt)]
-        return await self.chat_async(messages, temperature, max_tokens, **kwargs)
+        start_ns = time.perf_counter_ns()
+        fields = self._request_fields(temperature, max_tokens, kwargs)
+        self._log_request(1, fields)
+        body = self._single_prompt_body(prompt, fields)
+        return await self._send_chat_coalesced(body, fields, start_ns, kwargs)
     
     async def chat_async(
         self,
@@ -416,69 +573,152 @@ class OpenRouterProvider(BaseLLMProvider):
         Returns:
             LLMResponse with generated text
         """
-        start_time = time.time()
-        
-        params = self._get_generation_params(temperature, max_tokens, **kwargs)
+        start_ns = time.perf_counter_ns()
+        fields = self._request_fields(temperature, max_tokens, kwargs)
+        self._log_request(len(messages), fields)
+        body = encode_chat_body(messages, fields)
+        return await self._send_chat_coalesced(body, fields, start_ns, kwargs)
+    
+    @staticmethod
+    def _parse_stream_line(line: str) -> Optional[str]:
+        """
+        Extract the content delta from one server-sent event line.
         
-        request_data = {
-            "model": self.config.model,
-            "messages": [m.to_dict() for m in messages],
-            "temperature": params["temperature"],
-            "max_tokens": params["max_tokens"],
-            "top_p": params.get("top_p", self.config.top_p),
-        }
+        Returns:
+            Content text ("" for comments and events without content),
+            or None at the end-of-stream marker
+        """
+        if not line.startswith("data:"):
+            return ""
+        payload = line[5:].strip()
+        if payload == "[DONE]":
+            return None
         
         try:
-            response_data = await self._make_request_async("/chat/completions", request_data)
-            
-            choices = response_data.get("choices", [])
-            if not choices:
-                raise LLMError("No choices in OpenRouter response")
+            event = json_loads(payload)
+        except ValueError as e:
+            raise LLMError(f"Failed to parse OpenRouter stream event: {e}")
+        error = event.get("error")
+        if error:
+            # Mid-stream failures arrive as an event instead of a status code
+            error_msg = error.get("message", error) if isinstance(error, dict) else error
+            raise LLMError(f"OpenRouter API error: {error_msg}")
+        choices = event.get("choices") or ({},)
+        return choices[0].get("delta", {}).get("content") or ""
+    
+    def chat_stream(
+        self,
+        messages: List[Message],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Stream a response from conversation as it is generated.
+        
+        Args:
+            messages: List of conversation messages
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens
+            **kwargs: Additional parameters
             
-            choice = choices[0]
-            content = choice.get("message", {}).get("content", "")
-            finish_reason = choice.get("finish_reason", "stop")
+        Yields:
+            Content deltas in order
             
-            usage = response_data.get("usage", {})
-            prompt_tokens = usage.get("prompt_tokens", 0)
-            completion_tokens = usage.get("completion_tokens", 0)
-            total_tokens = usage.get("total_tokens", prompt_tokens + completion_tokens)
+        Raises:
+            LLMError: If the request fails
+        """
+        url = self._chat_url
+        fields = self._request_fields(temperature, max_tokens, kwargs, stream=True)
+        body = encode_chat_body(messages, fields)
+        
+        try:
+            with self._client.stream("POST", url, content=body) as response:
+                if response.is_error:
+                    response.read()
+                    raise self._api_error(response)
+                
+                for line in response.iter_lines():
+                    delta = self._parse_stream_line(line)
+                    if delta is None:
+                        break
+                    if delta:
+                        yield delta
+        except httpx.HTTPError as e:
+            raise LLMError(
+                f"Failed to connect to OpenRouter: {e}",
+                details={"url": str(url)}
+            )
+    
+    async def chat_stream_async(
+        self,
+        messages: List[Message],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Asynchronously stream a response from conversation.
+        
+        Args:
+            messages: List of conversation messages
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens
+            **kwargs: Additional parameters
             
-            latency = self._measure_latency(start_time)
+        Yields:
+            Content deltas in order
             
-            return LLMResponse(
-                content=content,
-                model=response_data.get("model", self.config.model),
-                provider=self.PROVIDER_NAME,
-                tokens_used=total_tokens,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                latency_ms=latency,
-                finish_reason=finish_reason,
-                metadata={"raw_response": response_data}
-            )
+        Raises:
+            LLMError: If the request fails
+        """
+        url = self._chat_url
+        fields = self._request_fields(temperature, max_tokens, kwargs, stream=True)
+        body = encode_chat_body(messages, fields)
         
-        except LLMError:
-            raise
-        except Exception as e:
-            raise LLMError(f"Failed to generate async: {e}")
+        try:
+            async with self._get_async_client().stream(
+                "POST", url, content=body
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                    raise self._api_error(response)
+                
+                async for line in response.aiter_lines():
+                    delta = self._parse_stream_line(line)
+                    if delta is None:
+                        break
+                    if delta:
+                        yield delta
+        except httpx.HTTPError as e:
+            raise LLMError(
+                f"Failed to connect to OpenRouter: {e}",
+                details={"url": str(url)}
+            )
+    
+    def close(self) -> None:
+        """Close the pooled HTTP client."""
+        self._client.close()
+    
+    async def aclose(self) -> None:
+        """Close both pooled HTTP clients."""
+        self._client.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_client_loop = None
     
     def is_available(self) -> bool:
         """
         Check if OpenRouter API is available.
         
-        Makes a simple request to verify connectivity and authentication.
+        Makes a bodiless GET to /models to verify connectivity.
         
         Returns:
             True if API is accessible and key is valid
         """
         try:
-            # Try a minimal request
-            response = self._make_request(
-                "/models",
-                {},
-                timeout=5
-            )
+            self._make_request(self._models_url, None, timeout=5, method="GET")
             return True
         except Exception as e:
             logger.warning(f"OpenRouter availability check failed: {e}")
@@ -488,25 +728,30 @@ class OpenRouterProvider(BaseLLMProvider):
         """
         Get list of available models from OpenRouter.
         
+        Successful lookups are cached for MODELS_TTL seconds; on failure
+        FALLBACK_MODELS is returned and not cached.
+        
         Returns:
             List of model identifiers
         """
-        try:
-            client = self._get_client()
-            url = f"{self.api_base}/models"
-            headers = self._build_headers()
-            req = client["request"].Request(url, headers=headers, method="GET")
+        cached = self._models_cache
+        if cached is not None and time.monotonic() - cached[0] < self.MODELS_TTL:
+            return list(cached[1])
+        
+        with self._models_lock:
+            # Another thread may have refreshed the cache while we waited
+            cached = self._models_cache
+            if cached is not None and time.monotonic() - cached[0] < self.MODELS_TTL:
+                return list(cached[1])
             
-            with client["request"].urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode("utf-8"))
-                models = data.get("data", [])
-                return [m.get("id") for m in models if m.get("id")]
-        except Exception as e:
-            logger.warning(f"Failed to get models from OpenRouter: {e}")
-            # Return common models as fallback
-            return [
-                "meta-llama/llama-3.3-70b-instruct:free",
-                "openai/gpt-4o-mini",
-                "anthropic/claude-3.5-sonnet",
-                "google/gemini-pro",
-            ]
+            try:
+                response = self._client.get(self._models_url, timeout=10)
+                response.raise_for_status()
+                data = json_loads(response.content)
+                models = [m.get("id") for m in data.get("data", []) if m.get("id")]
+            except Exception as e:
+                logger.warning(f"Failed to get models from OpenRouter: {e}")
+                return list(self.FALLBACK_MODELS)
+            
+            self._models_cache = (time.monotonic(), tuple(models))
+            return models
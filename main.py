@@ -19,28 +19,116 @@ Usage:
 import os
 import sys
 import argparse
-import asyncio
-import signal
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from core.config import load_config, create_default_config, Config
-from core.database import init_database
-from core.logging import setup_logging, get_logger
-from core.exceptions import SMSAgentError
-
-logger = get_logger("main")
+# Project modules are imported inside the functions that use them, so
+# --help and light modes don't pay for loading the whole core package
+if TYPE_CHECKING:
+    from core.config import Config
+
+# Third-party modules required by every mode, as (import name, pip package)
+CORE_DEPENDENCIES = (("yaml", "pyyaml"),)
+
+# Additional third-party modules required only by specific modes
+MODE_DEPENDENCIES = {
+    "web": (("fastapi", "fastapi"), ("uvicorn", "uvicorn"), ("jinja2", "jinja2")),
+    "tui": (("textual", "textual"),),
+}
+
+
+# Mode flags (mutually exclusive), as (flag, add_argument options)
+MODE_ARGUMENTS = (
+    ("--web", {"action": "store_true", "help": "Start web UI server"}),
+    ("--tui", {"action": "store_true", "help": "Start terminal UI"}),
+    ("--daemon", {
+        "action": "store_true",
+        "help": "Run as background daemon (SMS listener only)"
+    }),
+    ("--status", {"action": "store_true", "help": "Check system status"}),
+    ("--test", {
+        "nargs": "+",
+        "metavar": ("MESSAGE", "SENDER"),
+        "help": "Test message handling (usage: --test 'Hello' [SENDER_NUMBER])"
+    }),
+    ("--send-sms", {
+        "nargs": 2,
+        "metavar": ("NUMBER", "MESSAGE"),
+        "help": "Send an SMS message (usage: --send-sms +1234567890 'Hello')"
+    }),
+    ("--setup", {"action": "store_true", "help": "Run initial setup wizard"}),
+    ("--api-key", {"type": str, "metavar": "KEY", "help": "Set API key for LLM provider"}),
+    ("--diagnose", {
+        "action": "store_true",
+        "help": "Run diagnostic checks for SMS functionality"
+    }),
+)
+
+# Options shared by all modes, as (flag, add_argument options)
+COMMON_ARGUMENTS = (
+    ("--config", {"type": str, "metavar": "PATH", "help": "Path to configuration file"}),
+    ("--port", {"type": int, "default": 8080, "help": "Port for web UI (default: 8080)"}),
+    ("--host", {
+        "type": str,
+        "default": "127.0.0.1",
+        "help": "Host for web UI (default: 127.0.0.1)"
+    }),
+    ("--debug", {"action": "store_true", "help": "Enable debug mode"}),
+    ("--provider", {
+        "type": str,
+        "choices": ["openrouter", "ollama"],
+        "help": "LLM provider to use"
+    }),
+    ("--model", {"type": str, "help": "Model to use"}),
+)
+
+
+def _dest(flag: str) -> str:
+    """Get the Namespace attribute name argparse uses for a flag."""
+    return flag[2:].replace("-", "_")
+
+
+def _default(options: dict):
+    """Get the value argparse stores for an option that wasn't given."""
+    return False if options.get("action") == "store_true" else options.get("default")
+
+
+# Namespace values for an empty command line, derived from the tables
+# above so the fast path below can't drift from the parser
+_DEFAULTS = {
+    _dest(flag): _default(options)
+    for flag, options in MODE_ARGUMENTS + COMMON_ARGUMENTS
+}
+
+# Mode flags that need no parsing when given on their own
+_FAST_PATHS = frozenset(
+    flag for flag, options in MODE_ARGUMENTS if options.get("action") == "store_true"
+)
+
+
+def _selected_mode_arguments(argv: List[str]) -> tuple:
+    """
+    Pick the mode flags to register for this command line.
+    
+    Only the mode flag actually given is added to the parser. All of
+    them are added for help, abbreviated or unknown flags, and
+    conflicting modes, so argparse can still render help and report
+    errors as before.
+    """
+    known = {flag for flag, _ in MODE_ARGUMENTS + COMMON_ARGUMENTS}
+    flags = {arg.split("=", 1)[0] for arg in argv if arg.startswith("-")}
+    if not flags <= known:
+        return MODE_ARGUMENTS
+    
+    selected = tuple(mode for mode in MODE_ARGUMENTS if mode[0] in flags)
+    return selected if len(selected) <= 1 else MODE_ARGUMENTS
 
 
-def parse_args() -> argparse.Namespace:
-    """Parse command line arguments."""
-    parser = argparse.ArgumentParser(
-        description="SMS AI Agent - Termux-based SMS Auto-Responder",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+# Shown after --help output only
+EPILOG = """
 Examples:
   python main.py --web              Start web UI on default port
   python main.py --web --port 9000  Start web UI on port 9000
@@ -52,126 +140,119 @@ Examples:
 
 For more information, visit: https://github.com/sms-ai-agent
         """
+
+
+def _wants_help(argv: List[str]) -> bool:
+    """Check whether argparse will print help for this command line."""
+    # "--he" and longer prefixes are accepted abbreviations of --help;
+    # "--h" is ambiguous with --host and is an error instead
+    return any(arg == "-h" or (len(arg) > 3 and "--help".startswith(arg)) for arg in argv)
+
+
+# Parsers already built, keyed by the mode flags they register
+def _build_parser(
+    mode_arguments: tuple,
+    epilog: Optional[str] = None
+) -> argparse.ArgumentParser:
+    """Build the argument parser with the given mode flags and epilog."""
+    parser = argparse.ArgumentParser(
+        description="SMS AI Agent - Termux-based SMS Auto-Responder",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=epilog
     )
     
     # Mode selection (mutually exclusive)
     mode_group = parser.add_mutually_exclusive_group()
-    mode_group.add_argument(
-        "--web",
-        action="store_true",
-        help="Start web UI server"
-    )
-    mode_group.add_argument(
-        "--tui",
-        action="store_true",
-        help="Start terminal UI"
-    )
-    mode_group.add_argument(
-        "--daemon",
-        action="store_true",
-        help="Run as background daemon (SMS listener only)"
-    )
-    mode_group.add_argument(
-        "--status",
-        action="store_true",
-        help="Check system status"
-    )
-    mode_group.add_argument(
-        "--test",
-        nargs="+",
-        metavar=("MESSAGE", "SENDER"),
-        help="Test message handling (usage: --test 'Hello' [SENDER_NUMBER])"
-    )
-    mode_group.add_argument(
-        "--send-sms",
-        nargs=2,
-        metavar=("NUMBER", "MESSAGE"),
-        help="Send an SMS message (usage: --send-sms +1234567890 'Hello')"
-    )
-    mode_group.add_argument(
-        "--setup",
-        action="store_true",
-        help="Run initial setup wizard"
-    )
-    mode_group.add_argument(
-        "--api-key",
-        type=str,
-        metavar="KEY",
-        help="Set API key for LLM provider"
-    )
-    mode_group.add_argument(
-        "--diagnose",
-        action="store_true",
-        help="Run diagnostic checks for SMS functionality"
-    )
+    for flag, options in mode_arguments:
+        mode_group.add_argument(flag, **options)
+    
+    # Modes that weren't registered still need their attribute
+    parser.set_defaults(**{
+        _dest(flag): _default(options) for flag, options in MODE_ARGUMENTS
+    })
     
     # Optional arguments
-    parser.add_argument(
-        "--config",
-        type=str,
-        metavar="PATH",
-        help="Path to configuration file"
-    )
-    parser.add_argument(
-        "--port",
-        type=int,
-        default=8080,
-        help="Port for web UI (default: 8080)"
-    )
-    parser.add_argument(
-        "--host",
-        type=str,
-        default="127.0.0.1",
-        help="Host for web UI (default: 127.0.0.1)"
-    )
-    parser.add_argument(
-        "--debug",
-        action="store_true",
-        help="Enable debug mode"
-    )
-    parser.add_argument(
-        "--provider",
-        type=str,
-        choices=["openrouter", "ollama"],
-        help="LLM provider to use"
-    )
-    parser.add_argument(
-        "--model",
-        type=str,
-        help="Model to use"
-    )
+    for flag, options in COMMON_ARGUMENTS:
+        parser.add_argument(flag, **options)
     
-    return parser.parse_args()
+    return parser
 
 
-def check_dependencies() -> bool:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    argv = sys.argv[1:] if argv is None else argv
+    
+    # A lone mode switch (e.g. "--status") maps straight to a Namespace
+    if len(argv) == 1 and argv[0] in _FAST_PATHS:
+        values = dict(_DEFAULTS)
+        values[_dest(argv[0])] = True
+        return argparse.Namespace(**values)
+    
+    # The examples epilog is only attached when help will be rendered
+    epilog = EPILOG if _wants_help(argv) else None
+    parser = _build_parser(_selected_mode_arguments(argv), epilog)
+    
+    return parser.parse_args(argv)
+
+
+def _config_dir_candidates() -> List[str]:
     """
-    Check if all required dependencies are installed.
+    List possible config directories in priority order, without duplicates.
     
-    Returns:
-        True if all dependencies are available
+    User config comes first, then Termux-specific locations, then the
+    data directory.
+    """
+    home = str(Path.home())
+    termux_home = os.environ.get("TERMUX_HOME", "/data/data/com.termux/files/home")
+    data_home = os.environ.get("XDG_DATA_HOME", os.path.join(home, ".local", "share"))
+    
+    candidates = [
+        os.path.join(home, ".config", "sms-ai-agent"),
+        os.path.join(home, ".sms-ai-agent"),
+        os.path.join(termux_home, ".config", "sms-ai-agent"),
+        "/data/data/com.termux/files/home/.config/sms-ai-agent",
+        os.path.join(data_home, "sms-ai-agent"),
+    ]
+    # dict.fromkeys keeps order; the Termux entries coincide on Termux
+    # itself and when TERMUX_HOME is unset
+    return list(dict.fromkeys(candidates))
+
+
+def _find_config_dir() -> Optional[str]:
     """
-    missing = []
+    Find the highest-priority directory containing config.yaml.
     
-    try:
-        import yaml  # noqa: F401
-    except ImportError:
-        missing.append("pyyaml")
+    Probing stops at the first hit, and each distinct location is
+    stat()ed at most once.
     
-    try:
-        import fastapi  # noqa: F401
-    except ImportError:
-        missing.append("fastapi")
+    Returns:
+        Config directory path, or None if no config exists yet
+    """
+    for config_dir in _config_dir_candidates():
+        if os.path.isfile(os.path.join(config_dir, "config.yaml")):
+            return config_dir
+    return None
+
+
+def check_dependencies(mode: Optional[str] = None) -> bool:
+    """
+    Check if the dependencies needed for a mode are installed.
     
-    try:
-        import uvicorn  # noqa: F401
-    except ImportError:
-        missing.append("uvicorn")
+    Args:
+        mode: Selected mode ("web", "tui", ...), or None for core only
+        
+    Returns:
+        True if all dependencies are available
+    """
+    from importlib.util import find_spec
     
-    try:
-        import jinja2  # noqa: F401
-    except ImportError:
-        missing.append("jinja2")
+    # find_spec locates a module without running it, so heavy packages
+    # like fastapi aren't imported just to confirm they are installed
+    missing = [
+        package
+        for module, package in CORE_DEPENDENCIES + MODE_DEPENDENCIES.get(mode, ())
+        if find_spec(module) is None
+    ]
     
     if missing:
         print(f"Missing dependencies: {', '.join(missing)}")
@@ -183,6 +264,8 @@ def check_dependencies() -> bool:
 
 def run_setup_wizard() -> None:
     """Run interactive setup wizard."""
+    from core.config import create_default_config
+    
     print("\n" + "=" * 50)
     print("SMS AI Agent Setup Wizard")
     print("=" * 50 + "\n")
@@ -264,109 +347,105 @@ python main.py --daemon &
     print("  Help:      python main.py --help")
 
 
-def run_status_check(config: Config) -> None:
+def _write_lines(lines: List[str]) -> None:
+    """Write report lines to stdout in one call and clear the list."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+    lines.clear()
+
+
+def run_status_check(config: "Config") -> None:
     """Check and display system status."""
     from core.security import SecurityManager
-    from services.sms_handler import SMSHandler
-    from services.ai_responder import AIResponder
+    from core.services import get_database, get_sms_handler
     from llm.factory import create_llm_provider
     
-    print("\n" + "=" * 50)
-    print("SMS AI Agent - System Status")
-    print("=" * 50 + "\n")
+    lines: List[str] = []
+    lines.append("\n" + "=" * 50)
+    lines.append("SMS AI Agent - System Status")
+    lines.append("=" * 50 + "\n")
     
     # Initialize database
-    db_path = os.path.join(config.data_dir, "sms_agent.db")
-    database = init_database(db_path)
+    database = get_database(config.db_path)
     
     # Check SMS
-    print("SMS Handler")
-    print("-" * 30)
-    sms_handler = SMSHandler(
-        webhook_config={
-            "enabled": config.sms.webhook_enabled,
-            "url": config.sms.webhook_url,
-            "headers": config.sms.webhook_headers
-        }
-    )
+    lines.append("SMS Handler")
+    lines.append("-" * 30)
+    sms_handler = get_sms_handler(config)
     if sms_handler.is_available:
-        print("  Status: ✓ Available")
+        lines.append("  Status: ✓ Available")
         info = sms_handler.get_device_info()
         if info.get("phone_number"):
-            print(f"  Phone: {info['phone_number']}")
+            lines.append(f"  Phone: {info['phone_number']}")
     else:
-        print("  Status: ✗ Unavailable")
-        print("  Note: Install Termux:API and grant SMS permission")
+        lines.append("  Status: ✗ Unavailable")
+        lines.append("  Note: Install Termux:API and grant SMS permission")
     
     # Check Security
-    print("\nSecurity")
-    print("-" * 30)
+    lines.append("\nSecurity")
+    lines.append("-" * 30)
     security = SecurityManager(config.config_dir, config.data_dir)
     report = security.export_security_report()
     
     for provider, configured in report["api_keys_configured"].items():
         status = "✓ Configured" if configured else "✗ Not Set"
-        print(f"  {provider.title()}: {status}")
+        lines.append(f"  {provider.title()}: {status}")
     
     # Check LLM
-    print("\nLLM Provider")
-    print("-" * 30)
-    print(f"  Provider: {config.llm.provider}")
-    print(f"  Model: {config.llm.model}")
-    print(f"  Temperature: {config.llm.temperature}")
-    print(f"  Max Tokens: {config.llm.max_tokens}")
+    lines.append("\nLLM Provider")
+    lines.append("-" * 30)
+    lines.append(f"  Provider: {config.llm.provider}")
+    lines.append(f"  Model: {config.llm.model}")
+    lines.append(f"  Temperature: {config.llm.temperature}")
+    lines.append(f"  Max Tokens: {config.llm.max_tokens}")
     
     if config.llm.api_key:
-        print("  API Key: ✓ Set")
+        lines.append("  API Key: ✓ Set")
         
         # Test connection
-        print("\n  Testing connection...")
+        lines.append("\n  Testing connection...")
+        # Show the report so far while the request is in flight
+        _write_lines(lines)
         try:
             llm = create_llm_provider(config=config)
             if llm.is_available():
-                print("  Connection: ✓ Successful")
+                lines.append("  Connection: ✓ Successful")
             else:
-                print("  Connection: ✗ Failed")
+                lines.append("  Connection: ✗ Failed")
         except Exception as e:
-            print(f"  Connection: ✗ Error: {e}")
+            lines.append(f"  Connection: ✗ Error: {e}")
     else:
-        print("  API Key: ✗ Not Set")
+        lines.append("  API Key: ✗ Not Set")
     
     # Database stats
-    print("\nDatabase")
-    print("-" * 30)
+    lines.append("\nDatabase")
+    lines.append("-" * 30)
     stats = database.get_statistics()
-    print(f"  Messages: {sum(stats.get('messages', {}).values())}")
-    print(f"  Conversations: {stats.get('conversations', 0)}")
-    print(f"  LLM Requests: {sum(stats.get('llm_requests', {}).values())}")
-    print(f"  Guardrail Blocks: {stats.get('guardrail_violations', 0)}")
+    lines.append(f"  Messages: {sum(stats.get('messages', {}).values())}")
+    lines.append(f"  Conversations: {stats.get('conversations', 0)}")
+    lines.append(f"  LLM Requests: {sum(stats.get('llm_requests', {}).values())}")
+    lines.append(f"  Guardrail Blocks: {stats.get('guardrail_violations', 0)}")
     
     # Configuration
-    print("\nConfiguration")
-    print("-" * 30)
-    print(f"  Auto Reply: {'Enabled' if config.sms.auto_reply_enabled else 'Disabled'}")
-    print(f"  AI Mode: {'Enabled' if config.sms.ai_mode_enabled else 'Disabled'}")
-    print(f"  Rate Limit: {config.rate_limit.max_messages_per_minute}/min")
+    lines.append("\nConfiguration")
+    lines.append("-" * 30)
+    lines.append(f"  Auto Reply: {'Enabled' if config.sms.auto_reply_enabled else 'Disabled'}")
+    lines.append(f"  AI Mode: {'Enabled' if config.sms.ai_mode_enabled else 'Disabled'}")
+    lines.append(f"  Rate Limit: {config.rate_limit.max_messages_per_minute}/min")
     
-    print("\n" + "=" * 50 + "\n")
+    lines.append("\n" + "=" * 50 + "\n")
+    _write_lines(lines)
 
 
-def run_send_sms(config: Config, phone_number: str, message: str) -> None:
+def run_send_sms(config: "Config", phone_number: str, message: str) -> None:
     """Send an SMS message."""
-    from services.sms_handler import SMSHandler
+    from core.services import get_sms_handler
     
     print(f"\nSending SMS to {phone_number}...")
     print(f"Message: {message}")
     print("-" * 50)
     
-    sms_handler = SMSHandler(
-        timeout=config.sms.sms_timeout,
-        webhook_config={
-            "enabled": config.sms.webhook_enabled,
-            "url": config.sms.webhook_url,
-            "headers": config.sms.webhook_headers
-        }
-    )
+    sms_handler = get_sms_handler(config)
     
     if not sms_handler.is_available:
         print("✗ SMS handler not available!")
@@ -385,94 +464,79 @@ def run_diagnosis() -> None:
 
     from services.sms_handler import SMSHandler
     
-    print("\n" + "=" * 50)
-    print("SMS AI Agent - Diagnostic Mode")
-    print("=" * 50 + "\n")
+    lines: List[str] = []
+    lines.append("\n" + "=" * 50)
+    lines.append("SMS AI Agent - Diagnostic Mode")
+    lines.append("=" * 50 + "\n")
     
     handler = SMSHandler()
     results = handler.diagnose()
     
-    print("1. Termux API Installation")
-    print("-" * 30)
+    lines.append("1. Termux API Installation")
+    lines.append("-" * 30)
     if results["termux_api_installed"]:
-        print("   ✓ termux-sms-list is installed")
+        lines.append("   ✓ termux-sms-list is installed")
     else:
-        print("   ✗ termux-sms-list NOT found")
-        print("   → Run: pkg install termux-api")
+        lines.append("   ✗ termux-sms-list NOT found")
+        lines.append("   → Run: pkg install termux-api")
     
-    print("\n2. SMS List Capability")
-    print("-" * 30)
+    lines.append("\n2. SMS List Capability")
+    lines.append("-" * 30)
     if results["sms_list_works"]:
-        print("   ✓ Can read SMS messages")
+        lines.append("   ✓ Can read SMS messages")
         if results["sample_messages"]:
-            print(f"   Found {len(results['sample_messages'])} recent messages:")
+            lines.append(f"   Found {len(results['sample_messages'])} recent messages:")
             for m in results["sample_messages"]:
-                print(f"     - {m['number']}: '{m['preview']}...' (type={m['type']})")
+                lines.append(f"     - {m['number']}: '{m['preview']}...' (type={m['type']})")
     else:
-        print("   ✗ Cannot read SMS - permission issue likely")
-        print("   → Settings → Apps → Termux:API → Permissions")
-        print("   → Enable: SMS, Storage, Phone")
+        lines.append("   ✗ Cannot read SMS - permission issue likely")
+        lines.append("   → Settings → Apps → Termux:API → Permissions")
+        lines.append("   → Enable: SMS, Storage, Phone")
     
-    print("\n3. SMS Send Capability")
-    print("-" * 30)
+    lines.append("\n3. SMS Send Capability")
+    lines.append("-" * 30)
     if results["sms_send_available"]:
-        print("   ✓ termux-sms-send is available")
+        lines.append("   ✓ termux-sms-send is available")
     else:
-        print("   ✗ termux-sms-send NOT found")
+        lines.append("   ✗ termux-sms-send NOT found")
     
-    print("\n4. Device Info")
-    print("-" * 30)
+    lines.append("\n4. Device Info")
+    lines.append("-" * 30)
     if results["device_info"]:
-        print(f"   Phone: {results['device_info'].get('phone_number', 'Unknown')}")
-        print(f"   Network: {results['device_info'].get('network_operator_name', 'Unknown')}")
+        lines.append(f"   Phone: {results['device_info'].get('phone_number', 'Unknown')}")
+        lines.append(f"   Network: {results['device_info'].get('network_operator_name', 'Unknown')}")
     else:
-        print("   ⚠ Could not get device info")
+        lines.append("   ⚠ Could not get device info")
     
     if results["errors"]:
-        print("\n5. Errors Found")
-        print("-" * 30)
+        lines.append("\n5. Errors Found")
+        lines.append("-" * 30)
         for err in results["errors"]:
-            print(f"   • {err}")
+            lines.append(f"   • {err}")
     
-    print("\n" + "=" * 50)
+    lines.append("\n" + "=" * 50)
     
     if not results["sms_list_works"]:
-        print("\n⚠ SMS PERMISSION REQUIRED!")
-        print("1. Go to: Settings → Apps → Termux:API → Permissions")
-        print("2. Enable: SMS")
-        print("3. Also check: Settings → Apps → Termux → Permissions")
-        print("4. Run this diagnosis again to verify")
+        lines.append("\n⚠ SMS PERMISSION REQUIRED!")
+        lines.append("1. Go to: Settings → Apps → Termux:API → Permissions")
+        lines.append("2. Enable: SMS")
+        lines.append("3. Also check: Settings → Apps → Termux → Permissions")
+        lines.append("4. Run this diagnosis again to verify")
     
-    print()
+    lines.append("")
+    _write_lines(lines)
 
 
-def run_test_message(config: Config, message: str, phone_number: str = "+1234567890") -> None:
+def run_test_message(config: "Config", message: str, phone_number: str = "+1234567890") -> None:
     """Test message handling."""
-    from core.security import SecurityManager
-    from services.guardrails import GuardrailSystem
-    from services.ai_responder import AIResponder
-    from rules.engine import RulesEngine
+    from core.services import get_ai_responder
     
     print(f"\nTest Message: {message}")
     print(f"From: {phone_number}")
     print("-" * 50)
     
     # Initialize components
-    db_path = os.path.join(config.data_dir, "sms_agent.db")
-    database = init_database(db_path)
-    
-    security = SecurityManager(config.config_dir, config.data_dir)
-    guardrails = GuardrailSystem(max_length=config.guardrail.max_response_length)
-    rules_engine = RulesEngine(config_dir=config.config_dir)
-    
-    ai_responder = AIResponder(
-        config=config,
-        database=database,
-        guardrails=guardrails,
-        rules_engine=rules_engine,
-        personality_path=os.path.join(config.config_dir, "personality.md"),
-        agent_path=os.path.join(config.config_dir, "agent.md")
-    )
+    ai_responder = get_ai_responder(config)
     
     # Generate response
     print("\nGenerating response...")
@@ -495,22 +559,20 @@ def run_test_message(config: Config, message: str, phone_number: str = "+1234567
             print(f"    - {v['type']}: {v['action']}")
 
 
-def set_api_key(config: Config, api_key: str, provider: str = "openrouter") -> None:
+def set_api_key(config: "Config", api_key: str, provider: str = "openrouter") -> None:
     """Set API key for a provider."""
-    from core.security import SecurityManager
+    from core.security import SecurityManager, validate_api_key_format
     
-    security = SecurityManager(config.config_dir, config.data_dir)
-    
-    if not security.validate_api_key(provider, api_key):
+    if not validate_api_key_format(provider, api_key):
         print(f"Error: Invalid API key format for {provider}")
         sys.exit(1)
     
-    security.store_api_key(provider, api_key)
+    SecurityManager(config.config_dir, config.data_dir).store_api_key(provider, api_key)
     print(f"✓ API key stored for {provider}")
     print(f"  Stored in: {config.config_dir}/.env")
 
 
-def run_web_ui(config: Config, host: str, port: int, debug: bool) -> None:
+def run_web_ui(config: "Config", host: str, port: int, debug: bool) -> None:
     """Run the web UI server."""
     from ui.web.app import run_app
     
@@ -520,7 +582,7 @@ def run_web_ui(config: Config, host: str, port: int, debug: bool) -> None:
     run_app(host=host, port=port, debug=debug, config=config)
 
 
-def run_terminal_ui(config: Config) -> None:
+def run_terminal_ui(config: "Config") -> None:
     """Run the terminal UI."""
     from ui.terminal.app import run_tui
     
@@ -530,47 +592,29 @@ def run_terminal_ui(config: Config) -> None:
     run_tui(config=config)
 
 
-def run_daemon(config: Config) -> None:
+def run_daemon(config: "Config") -> None:
     """Run as background daemon."""
-    from core.security import SecurityManager
-    from services.sms_handler import SMSHandler
-    from services.guardrails import GuardrailSystem
-    from services.ai_responder import AIResponder
-    from rules.engine import RulesEngine
+    import signal
+    import threading
+    from core.logging import get_logger
+    from core.services import get_database, get_sms_handler, get_ai_responder
     from core.rate_limiter import RateLimiter
     
+    logger = get_logger("main")
+    
     print("\nStarting SMS AI Agent daemon...")
     print("Press Ctrl+C to stop\n")
     
     # Initialize components
-    db_path = os.path.join(config.data_dir, "sms_agent.db")
-    database = init_database(db_path)
-    
-    security = SecurityManager(config.config_dir, config.data_dir)
-    guardrails = GuardrailSystem(max_length=config.guardrail.max_response_length)
-    rules_engine = RulesEngine(config_dir=config.config_dir)
+    database = get_database(config.db_path)
     rate_limiter = RateLimiter(
         max_per_minute=config.rate_limit.max_messages_per_minute,
         max_per_recipient_per_hour=config.rate_limit.max_per_recipient_per_hour,
         max_per_recipient_per_day=config.rate_limit.max_per_recipient_per_day
     )
     
-    sms_handler = SMSHandler(
-        timeout=config.sms.sms_timeout,
-        webhook_config={
-            "enabled": config.sms.webhook_enabled,
-            "url": config.sms.webhook_url,
-            "headers": config.sms.webhook_headers
-        }
-    )
-    ai_responder = AIResponder(
-        config=config,
-        database=database,
-        guardrails=guardrails,
-        rules_engine=rules_engine,
-        personality_path=os.path.join(config.config_dir, "personality.md"),
-        agent_path=os.path.join(config.config_dir, "agent.md")
-    )
+    sms_handler = get_sms_handler(config)
+    ai_responder = get_ai_responder(config)
     
     # Verify permissions before starting
     print("\nVerifying SMS permissions...")
@@ -634,8 +678,9 @@ def run_daemon(config: Config) -> None:
         if not config.sms.auto_reply_enabled:
             return
         
-        # Store incoming message
-        database.add_message(
+        # Store incoming message in the background; reads on the
+        # database wait for it, so the AI context still includes it
+        database.enqueue_message(
             direction="incoming",
             phone_number=msg.phone_number,
             message=content
@@ -650,7 +695,7 @@ def run_daemon(config: Config) -> None:
             try:
                 logger.info(f"Daemon: Attempting to send SMS to {msg.phone_number}")
                 sms_handler.send_sms(msg.phone_number, response.response)
-                database.add_message(
+                database.enqueue_message(
                     direction="outgoing",
                     phone_number=msg.phone_number,
                     message=response.response,
@@ -665,62 +710,65 @@ def run_daemon(config: Config) -> None:
     # Register callback and start listener
     sms_handler.on_message_received(handle_message)
     
-    # Handle shutdown
-    def shutdown(signum, frame):
-        logger.info("Shutting down...")
-        sms_handler.stop_listener()
-        sys.exit(0)
+    # Handle shutdown. Handlers only record the request; the listener is
+    # stopped from the main thread below, not from inside a handler.
+    stopped = threading.Event()
     
-    signal.signal(signal.SIGINT, shutdown)
-    signal.signal(signal.SIGTERM, shutdown)
+    def request_shutdown(signum, frame):
+        stopped.set()
+    
+    wakeup_fds = None
+    if hasattr(signal, "pause"):
+        # POSIX: signals also write a byte to a pipe the main thread
+        # blocks on, so it sleeps until SIGINT/SIGTERM arrives
+        wakeup_fds = os.pipe()
+        os.set_blocking(wakeup_fds[1], False)
+        signal.set_wakeup_fd(wakeup_fds[1])
+    
+    signal.signal(signal.SIGINT, request_shutdown)
+    signal.signal(signal.SIGTERM, request_shutdown)
     
     # Start listener
     logger.info("SMS listener started")
     sms_handler.start_listener(poll_interval=3)
     
-    # Keep running
-    try:
-        import time
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        shutdown(None, None)
+    # Keep running. The listener polls on its own thread, so the main
+    # thread does no work until shutdown is requested.
+    if wakeup_fds is not None:
+        try:
+            os.read(wakeup_fds[0], 1)
+        finally:
+            signal.set_wakeup_fd(-1)
+            for fd in wakeup_fds:
+                os.close(fd)
+    else:
+        stopped.wait()
+    
+    logger.info("Shutting down...")
+    sms_handler.stop_listener()
+    database.flush_messages()
 
 
 def main() -> int:
     """Main entry point."""
     args = parse_args()
     
-    # Check dependencies
-    if not check_dependencies():
+    # Check dependencies for the selected mode only
+    mode = "web" if args.web else "tui" if args.tui else None
+    if not check_dependencies(mode):
         return 1
     
+    from core.config import load_config
+    from core.logging import setup_logging
+    from core.exceptions import SMSAgentError
+    
     # Auto-detect config directory if not set
     if "XDG_CONFIG_HOME" not in os.environ:
-        # Check common config locations (user config first, then project default)
-        # Also check Termux-specific locations
-        termux_home = os.environ.get("TERMUX_HOME", "/data/data/com.termux/files/home")
-        possible_config_dirs = [
-            Path.home() / ".config" / "sms-ai-agent",
-            Path.home() / ".sms-ai-agent",
-            Path(termux_home) / ".config" / "sms-ai-agent" if termux_home != str(Path.home()) else None,
-            Path("/data/data/com.termux/files/home") / ".config" / "sms-ai-agent",
-        ]
-        possible_config_dirs = [d for d in possible_config_dirs if d]
-        
-        # Also check if there's a config in the data directory
-        data_home = os.environ.get("XDG_DATA_HOME", str(Path.home() / ".local" / "share"))
-        possible_config_dirs.append(Path(data_home) / "sms-ai-agent")
-        
-        found_config = False
-        for config_dir in possible_config_dirs:
-            if (config_dir / "config.yaml").exists():
-                os.environ["XDG_CONFIG_HOME"] = str(config_dir.parent)
-                found_config = True
-                break
-        
-        # If no user config found, create default config directory
-        if not found_config:
+        config_dir = _find_config_dir()
+        if config_dir:
+            os.environ["XDG_CONFIG_HOME"] = os.path.dirname(config_dir)
+        else:
+            # If no user config found, create default config directory
             user_config = Path.home() / ".config" / "sms-ai-agent"
             user_config.mkdir(parents=True, exist_ok=True)
     
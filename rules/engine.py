@@ -6,16 +6,76 @@ This module implements the core rules engine that matches incoming
 messages against patterns and generates appropriate responses.
 """
 
+import os
 import re
+import sys
+import copy
 import yaml
 import json
 from pathlib import Path
 from datetime import datetime, time as dt_time
-from typing import Optional, List, Dict, Any, Callable
+from typing import Optional, List, Dict, Any, Callable, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 import random
 
+# Optional: pyahocorasick finds every rule keyword in one pass over a
+# message. Without it, rules are checked one by one.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# dataclass(slots=True) is only available from Python 3.10
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Parsed rules.yaml contents, keyed by file path and stored with the
+# file's modification time and size. Engines built for an unchanged
+# file skip the YAML parse; each engine still gets its own Rule objects,
+# since rules can be enabled, disabled and removed per engine.
+_parsed_rules: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+
+
+# Splits a response into literal text and {placeholder} tokens
+_PLACEHOLDER_RE = re.compile(r"(\{[^}]+\})")
+
+
+def _parse_response(response: str) -> Any:
+    """
+    Parse a response template for rendering.
+    
+    Returns:
+        The response itself if it has no placeholders, otherwise a
+        tuple of (is_literal, text) tokens, with placeholder names
+        stripped of their braces
+    """
+    parts = _PLACEHOLDER_RE.split(response)
+    if len(parts) == 1:
+        return response
+    
+    # re.split with a capturing group alternates literal, placeholder, ...
+    return tuple(
+        (True, part) if i % 2 == 0 else (False, part[1:-1])
+        for i, part in enumerate(parts)
+        if part
+    )
+
+
+@lru_cache(maxsize=512)
+def _compile_regex(pattern: str) -> Optional["re.Pattern"]:
+    """
+    Compile a rule's regex pattern, case-insensitively.
+    
+    Memoized so rules loaded repeatedly (e.g. from rules.yaml) share
+    compiled patterns. Invalid patterns give None and never match.
+    """
+    try:
+        return re.compile(pattern, re.IGNORECASE)
+    except re.error:
+        return None
+
 
 class RulePriority(Enum):
     """Priority levels for rules."""
@@ -37,7 +97,17 @@ class MatchType(Enum):
     ALL_KEYWORDS = "all_keywords"  # Contains all keywords
 
 
-@dataclass
+# Match types decided purely by which literals occur in the message
+_LITERAL_MATCH_TYPES = frozenset({
+    MatchType.CONTAINS,
+    MatchType.STARTSWITH,
+    MatchType.ENDSWITH,
+    MatchType.KEYWORDS,
+    MatchType.ALL_KEYWORDS,
+})
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class RuleMatch:
     """
     Result of a rule matching a message.
@@ -51,19 +121,22 @@ class RuleMatch:
         groups (dict): Captured groups from regex
         variables (dict): Extracted variables
         confidence (float): Match confidence (0-1)
+        now (datetime): Time the message was evaluated at, reused for
+            {date}/{time} in the response
     """
     rule: 'Rule'
     message: str
     groups: Dict[str, str] = field(default_factory=dict)
     variables: Dict[str, Any] = field(default_factory=dict)
     confidence: float = 1.0
+    now: Optional[datetime] = None
     
     def get_response(self) -> str:
         """Generate response from the matched rule."""
         return self.rule.generate_response(self)
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Rule:
     """
     A single rule for matching and responding to messages.
@@ -92,13 +165,141 @@ class Rule:
     # Optional callback for custom matching
     custom_matcher: Optional[Callable[[str], bool]] = None
     
-    def matches(self, message: str, context: Optional[Dict] = None) -> Optional[RuleMatch]:
+    # Compiled patterns for REGEX rules, built in __post_init__
+    _compiled_patterns: Optional[List[Optional["re.Pattern"]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    # Lowercased patterns (keyword tuples for keyword match types) for
+    # all other match types, built in __post_init__
+    _patterns_lower: Optional[List[Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    # For literal match types, the lowercased literals that must all
+    # occur for each way the rule can match, built in __post_init__
+    _literal_alternatives: Optional[Tuple[Tuple[str, ...], ...]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    # Copy of (patterns, match_type) the three fields above were built
+    # from; patterns is a public list, so edits are detected against it
+    _patterns_source: Optional[Tuple[List[str], MatchType]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    # Parsed responses (see _parse_response), built in __post_init__
+    _templates: List[Any] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    
+    # Copy of the responses list _templates was parsed from
+    _responses_source: List[str] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    
+    # Parsed conditions, built in __post_init__; None when not set
+    _time_start: Optional[dt_time] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _time_end: Optional[dt_time] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _allowed_days: Optional[frozenset] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _allowed_senders: Optional[frozenset] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    # Copy of the conditions the fields above were parsed from, to
+    # detect edits to the public conditions dict
+    _conditions_source: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self) -> None:
+        """Prepare patterns, conditions and responses once instead of on every message."""
+        self._prepare_responses()
+        self._prepare_conditions()
+        self._prepare_patterns()
+    
+    def _prepare_responses(self) -> None:
+        """Parse response templates."""
+        self._responses_source = list(self.responses)
+        self._templates = [_parse_response(r) for r in self.responses]
+    
+    def _prepare_conditions(self) -> None:
+        """Parse time, day and sender conditions."""
+        conditions = self.conditions
+        self._conditions_source = copy.deepcopy(conditions)
+        self._time_start = self._time_end = None
+        self._allowed_days = self._allowed_senders = None
+        
+        if "time_start" in conditions:
+            self._time_start = self._parse_time(conditions["time_start"])
+        if "time_end" in conditions:
+            self._time_end = self._parse_time(conditions["time_end"])
+        if "days" in conditions:
+            self._allowed_days = frozenset(d.lower() for d in conditions["days"])
+        if "allowed_senders" in conditions:
+            self._allowed_senders = frozenset(conditions["allowed_senders"])
+    
+    def _prepare_patterns(self) -> None:
+        """Build the compiled, lowercased and literal forms of the patterns."""
+        self._patterns_source = (list(self.patterns), self.match_type)
+        self._compiled_patterns = None
+        self._patterns_lower = None
+        self._literal_alternatives = None
+        
+        if self.match_type == MatchType.REGEX:
+            self._compiled_patterns = [_compile_regex(p) for p in self.patterns]
+            return
+        
+        # Interned, so the short literals many rules share ("hi", "ok",
+        # "help", ...) are stored once and compare by identity
+        if self.match_type in (MatchType.KEYWORDS, MatchType.ALL_KEYWORDS):
+            self._patterns_lower = [
+                tuple(sys.intern(k.lower()) for k in pattern.split())
+                for pattern in self.patterns
+            ]
+        else:
+            self._patterns_lower = [sys.intern(p.lower()) for p in self.patterns]
+        
+        if self.match_type == MatchType.KEYWORDS:
+            self._literal_alternatives = tuple(
+                (keyword,) for keywords in self._patterns_lower for keyword in keywords
+            )
+        elif self.match_type == MatchType.ALL_KEYWORDS:
+            self._literal_alternatives = tuple(self._patterns_lower)
+        elif self.match_type in _LITERAL_MATCH_TYPES:
+            self._literal_alternatives = tuple((p,) for p in self._patterns_lower)
+    
+    def _refresh_patterns(self) -> None:
+        """Rebuild the prepared patterns if patterns or match_type changed."""
+        patterns, match_type = self._patterns_source
+        if self.match_type is not match_type or self.patterns != patterns:
+            self._prepare_patterns()
+    
+    def matches(
+        self,
+        message: str,
+        context: Optional[Dict] = None,
+        literals: Optional[Set[str]] = None,
+        message_lower: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> Optional[RuleMatch]:
         """
         Check if this rule matches a message.
         
         Args:
             message: Message to check
             context: Optional context (time, sender, etc.)
+            literals: Lowercased literals found in the message, from the
+                engine's literal index; rule patterns are scanned
+                directly when not given
+            message_lower: Lowercased message, if already computed
+            now: Current time, taken when first needed if not given
             
         Returns:
             RuleMatch if matched, None otherwise
@@ -107,12 +308,38 @@ class Rule:
             return None
         
         # Check conditions
-        if not self._check_conditions(context):
+        if not self._check_conditions(context, now):
+            return None
+        
+        match = self._match_message(message, literals, message_lower)
+        if match is not None:
+            match.now = now
+        return match
+    
+    def _match_message(
+        self,
+        message: str,
+        literals: Optional[Set[str]],
+        message_lower: Optional[str]
+    ) -> Optional[RuleMatch]:
+        """Match the rule's patterns and custom matcher against a message."""
+        self._refresh_patterns()
+        
+        if message_lower is None:
+            message_lower = message.lower()
+        
+        # Use the engine's scan of the message for literal patterns
+        if literals is not None and self._literal_alternatives is not None:
+            if self._match_literals(literals, message_lower):
+                return RuleMatch(rule=self, message=message)
+            if self.custom_matcher and self.custom_matcher(message):
+                return RuleMatch(rule=self, message=message)
             return None
         
         # Try each pattern
-        for pattern in self.patterns:
-            match = self._match_pattern(pattern, message)
+        patterns = self._compiled_patterns if self._compiled_patterns is not None else self._patterns_lower
+        for pattern in patterns:
+            match = self._match_pattern(pattern, message, message_lower)
             if match:
                 return match
         
@@ -122,68 +349,95 @@ class Rule:
         
         return None
     
-    def _match_pattern(self, pattern: str, message: str) -> Optional[RuleMatch]:
+    def _match_pattern(
+        self,
+        pattern: Any,
+        message: str,
+        message_lower: str
+    ) -> Optional[RuleMatch]:
         """
-        Match a single pattern against a message.
+        Match a single prepared pattern against a message.
         
         Args:
-            pattern: Pattern to match
+            pattern: Pattern to match: compiled (None if invalid) for
+                REGEX rules, a lowercased keyword tuple for keyword
+                rules, else the lowercased pattern
             message: Message to check
+            message_lower: Lowercased message
             
         Returns:
             RuleMatch if matched, None otherwise
         """
-        message_lower = message.lower()
-        pattern_lower = pattern.lower()
+        if self.match_type == MatchType.REGEX:
+            match = pattern.search(message) if pattern is not None else None
+            if match:
+                return RuleMatch(
+                    rule=self,
+                    message=message,
+                    groups=match.groupdict()
+                )
+            return None
         
         if self.match_type == MatchType.EXACT:
-            if message_lower == pattern_lower:
+            if message_lower == pattern:
                 return RuleMatch(rule=self, message=message)
         
         elif self.match_type == MatchType.CONTAINS:
-            if pattern_lower in message_lower:
+            if pattern in message_lower:
                 return RuleMatch(rule=self, message=message)
         
         elif self.match_type == MatchType.STARTSWITH:
-            if message_lower.startswith(pattern_lower):
+            if message_lower.startswith(pattern):
                 return RuleMatch(rule=self, message=message)
         
         elif self.match_type == MatchType.ENDSWITH:
-            if message_lower.endswith(pattern_lower):
+            if message_lower.endswith(pattern):
                 return RuleMatch(rule=self, message=message)
         
-        elif self.match_type == MatchType.REGEX:
-            try:
-                regex = re.compile(pattern, re.IGNORECASE)
-                match = regex.search(message)
-                if match:
-                    groups = match.groupdict() if match.groupdict() else {}
-                    return RuleMatch(
-                        rule=self,
-                        message=message,
-                        groups=groups
-                    )
-            except re.error:
-                pass
-        
         elif self.match_type == MatchType.KEYWORDS:
-            keywords = [k.lower() for k in pattern.split()]
-            if any(kw in message_lower for kw in keywords):
+            if any(kw in message_lower for kw in pattern):
                 return RuleMatch(rule=self, message=message)
         
         elif self.match_type == MatchType.ALL_KEYWORDS:
-            keywords = [k.lower() for k in pattern.split()]
-            if all(kw in message_lower for kw in keywords):
+            if all(kw in message_lower for kw in pattern):
                 return RuleMatch(rule=self, message=message)
         
         return None
     
-    def _check_conditions(self, context: Optional[Dict]) -> bool:
+    def _match_literals(self, literals: Set[str], message_lower: str) -> bool:
+        """
+        Check the rule's literal patterns against literals found in a message.
+        
+        Args:
+            literals: Lowercased literals present in the message
+            message_lower: Lowercased message
+            
+        Returns:
+            True if any pattern matches
+        """
+        for alternative in self._literal_alternatives:
+            if not all(literal in literals for literal in alternative):
+                continue
+            if self.match_type == MatchType.STARTSWITH:
+                if not message_lower.startswith(alternative[0]):
+                    continue
+            elif self.match_type == MatchType.ENDSWITH:
+                if not message_lower.endswith(alternative[0]):
+                    continue
+            return True
+        return False
+    
+    def _check_conditions(
+        self,
+        context: Optional[Dict],
+        now: Optional[datetime] = None
+    ) -> bool:
         """
         Check rule conditions.
         
         Args:
             context: Context dictionary with time, sender, etc.
+            now: Current time, taken here if needed and not given
             
         Returns:
             True if all conditions are satisfied
@@ -191,31 +445,31 @@ class Rule:
         if not self.conditions:
             return True
         
-        # Time-based conditions
-        if "time_start" in self.conditions or "time_end" in self.conditions:
-            now = datetime.now().time()
+        # Re-parse if the conditions were edited after construction
+        if self.conditions != self._conditions_source:
+            self._prepare_conditions()
+        
+        if (
+            self._time_start is not None
+            or self._time_end is not None
+            or self._allowed_days is not None
+        ):
+            now = now or datetime.now()
             
-            if "time_start" in self.conditions:
-                start = self._parse_time(self.conditions["time_start"])
-                if start and now < start:
-                    return False
+            # Time-based conditions
+            if self._time_start is not None and now.time() < self._time_start:
+                return False
+            if self._time_end is not None and now.time() > self._time_end:
+                return False
             
-            if "time_end" in self.conditions:
-                end = self._parse_time(self.conditions["time_end"])
-                if end and now > end:
+            # Day of week conditions
+            if self._allowed_days is not None:
+                if now.strftime("%A").lower() not in self._allowed_days:
                     return False
         
-        # Day of week conditions
-        if "days" in self.conditions:
-            today = datetime.now().strftime("%A").lower()
-            allowed_days = [d.lower() for d in self.conditions["days"]]
-            if today not in allowed_days:
-                return False
-        
         # Sender conditions
-        if context and "allowed_senders" in self.conditions:
-            sender = context.get("sender", "")
-            if sender not in self.conditions["allowed_senders"]:
+        if context and self._allowed_senders is not None:
+            if context.get("sender", "") not in self._allowed_senders:
                 return False
         
         return True
@@ -225,52 +479,77 @@ class Rule:
         try:
             parts = time_str.split(":")
             return dt_time(int(parts[0]), int(parts[1]))
-        except (ValueError, IndexError):
+        except (ValueError, IndexError, AttributeError):
+            # AttributeError: non-string values, e.g. an unquoted 09:00
+            # that YAML read as a number
             return None
     
-    def generate_response(self, match: RuleMatch) -> str:
+    def generate_response(self, match: RuleMatch, now: Optional[datetime] = None) -> str:
         """
         Generate a response for a match.
         
         Args:
             match: The rule match
+            now: Current time; defaults to the time the match was made
             
         Returns:
             Generated response string
         """
-        if not self.responses:
+        # Re-parse if the responses were edited after construction
+        if self.responses != self._responses_source:
+            self._prepare_responses()
+        
+        if not self._templates:
             return ""
         
         # Select random response
-        response = random.choice(self.responses)
+        template = random.choice(self._templates)
         
-        # Substitute variables
-        response = self._substitute_variables(response, match)
+        # Responses without placeholders are used as-is
+        if isinstance(template, str):
+            return template
         
-        return response
+        # Substitute variables
+        return self._substitute_variables(template, match, now or match.now)
     
-    def _substitute_variables(self, template: str, match: RuleMatch) -> str:
+    def _substitute_variables(
+        self,
+        template: tuple,
+        match: RuleMatch,
+        now: Optional[datetime] = None
+    ) -> str:
         """
-        Substitute variables in template.
+        Substitute variables in a parsed template, in one pass.
         
         Supports:
         - {captured_group} - Regex captured groups
         - {date} - Current date
         - {time} - Current time
         - {message} - Original message
-        """
-        result = template
-        
-        # Substitute captured groups
-        for name, value in match.groups.items():
-            result = result.replace(f"{{{name}}}", value)
         
-        # Substitute built-in variables
-        result = result.replace("{date}", datetime.now().strftime("%Y-%m-%d"))
-        result = result.replace("{time}", datetime.now().strftime("%H:%M"))
-        result = result.replace("{message}", match.message)
+        Other placeholders, and groups that didn't participate in the
+        match, are left as written. The current time is taken at most
+        once, and only if used, when now isn't given.
+        """
+        parts = []
         
-        return result
+        for is_literal, text in template:
+            if is_literal:
+                parts.append(text)
+                continue
+            
+            value = match.groups.get(text)
+            if value is None:
+                if text == "date" or text == "time":
+                    now = now or datetime.now()
+                    value = now.strftime("%Y-%m-%d" if text == "date" else "%H:%M")
+                elif text == "message":
+                    value = match.message
+                else:
+                    value = "{" + text + "}"
+            parts.append(value)
+        
+        return "".join(parts)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert rule to dictionary."""
@@ -289,12 +568,12 @@ class Rule:
         """Create rule from dictionary."""
         return cls(
             name=data["name"],
-            patterns=data.get("patterns", []),
+            patterns=list(data.get("patterns", [])),
             match_type=MatchType(data.get("match_type", "contains")),
-            responses=data.get("responses", []),
+            responses=list(data.get("responses", [])),
             priority=data.get("priority", RulePriority.NORMAL.value),
             enabled=data.get("enabled", True),
-            conditions=data.get("conditions", {}),
+            conditions=copy.deepcopy(data.get("conditions", {})),
         )
 
 
@@ -332,6 +611,12 @@ class RulesEngine:
         self.rules: List[Rule] = []
         self.config_dir = Path(config_dir) if config_dir else None
         
+        # Aho-Corasick automaton over all rule literals, built on first
+        # match and dropped whenever the rules change, plus each rule's
+        # literals it was built from
+        self._automaton = None
+        self._automaton_sources: List[Any] = []
+        
         # Load rules from config
         if self.config_dir:
             self._load_rules()
@@ -347,6 +632,7 @@ class RulesEngine:
         """
         self.rules.append(rule)
         self.rules.sort(key=lambda r: r.priority, reverse=True)
+        self._automaton = None
     
     def remove_rule(self, name: str) -> bool:
         """
@@ -361,6 +647,7 @@ class RulesEngine:
         for i, rule in enumerate(self.rules):
             if rule.name == name:
                 del self.rules[i]
+                self._automaton = None
                 return True
         return False
     
@@ -382,7 +669,8 @@ class RulesEngine:
     def match(
         self,
         message: str,
-        context: Optional[Dict] = None
+        context: Optional[Dict] = None,
+        now: Optional[datetime] = None
     ) -> Optional[RuleMatch]:
         """
         Find the best matching rule for a message.
@@ -393,12 +681,18 @@ class RulesEngine:
         Args:
             message: Message to match
             context: Optional context for condition checking
+            now: Time to evaluate conditions and responses at
+                (default: now, taken once for all rules)
             
         Returns:
             RuleMatch if found, None otherwise
         """
+        now = now or datetime.now()
+        message_lower = message.lower()
+        literals = self._find_literals(message_lower)
+        
         for rule in self.rules:
-            match = rule.matches(message, context)
+            match = rule.matches(message, context, literals, message_lower, now)
             if match:
                 return match
         return None
@@ -406,7 +700,8 @@ class RulesEngine:
     def match_all(
         self,
         message: str,
-        context: Optional[Dict] = None
+        context: Optional[Dict] = None,
+        now: Optional[datetime] = None
     ) -> List[RuleMatch]:
         """
         Find all matching rules for a message.
@@ -414,17 +709,72 @@ class RulesEngine:
         Args:
             message: Message to match
             context: Optional context
+            now: Time to evaluate conditions and responses at
+                (default: now, taken once for all rules)
             
         Returns:
             List of all matches
         """
+        now = now or datetime.now()
+        message_lower = message.lower()
+        literals = self._find_literals(message_lower)
+        
         matches = []
         for rule in self.rules:
-            match = rule.matches(message, context)
+            match = rule.matches(message, context, literals, message_lower, now)
             if match:
                 matches.append(match)
         return matches
     
+    def _find_literals(self, message_lower: str) -> Optional[Set[str]]:
+        """
+        Find every rule literal in a message in one pass.
+        
+        Requires pyahocorasick; without it rules scan the message
+        themselves.
+        
+        Args:
+            message_lower: Lowercased message
+            
+        Returns:
+            Set of literals present in the message (the empty literal is
+            always present), or None if pyahocorasick isn't installed
+        """
+        if ahocorasick is None:
+            return None
+        
+        # Rebuild if rules were added, removed or edited in place since
+        for rule in self.rules:
+            rule._refresh_patterns()
+        sources = [rule._literal_alternatives for rule in self.rules]
+        if len(sources) != len(self._automaton_sources) or any(
+            new is not old for new, old in zip(sources, self._automaton_sources)
+        ):
+            self._automaton = None
+        
+        if self._automaton is None:
+            # Each distinct literal is added once, however many rules use it
+            unique_literals = {
+                literal
+                for rule in self.rules
+                for alternative in rule._literal_alternatives or ()
+                for literal in alternative
+                if literal
+            }
+            automaton = ahocorasick.Automaton()
+            for literal in unique_literals:
+                automaton.add_word(literal, literal)
+            # An automaton without words can't be searched
+            if len(automaton):
+                automaton.make_automaton()
+            self._automaton = automaton
+            self._automaton_sources = sources
+        
+        literals = {""}
+        if len(self._automaton):
+            literals.update(literal for _, literal in self._automaton.iter(message_lower))
+        return literals
+    
     def _load_rules(self) -> None:
         """Load rules from configuration directory."""
         rules_file = self.config_dir / "rules.yaml"
@@ -434,12 +784,22 @@ class RulesEngine:
             return
         
         try:
-            with open(rules_file, "r") as f:
-                data = yaml.safe_load(f) or {}
+            key = str(rules_file)
+            stat = os.stat(key)
+            version = (stat.st_mtime_ns, stat.st_size)
+            cached = _parsed_rules.get(key)
+            if cached is not None and cached[0] == version:
+                rules_data = cached[1]
+            else:
+                with open(rules_file, "r") as f:
+                    data = yaml.safe_load(f) or {}
+                rules_data = data.get("rules", [])
+                _parsed_rules[key] = (version, rules_data)
             
-            for rule_data in data.get("rules", []):
-                rule = Rule.from_dict(rule_data)
-                self.add_rule(rule)
+            # Sort once rather than on every add_rule()
+            self.rules.extend(Rule.from_dict(rule_data) for rule_data in rules_data)
+            self.rules.sort(key=lambda r: r.priority, reverse=True)
+            self._automaton = None
         
         except Exception as e:
             print(f"Warning: Failed to load rules: {e}")
@@ -572,6 +932,7 @@ class RulesEngine:
     def clear_rules(self) -> None:
         """Remove all rules."""
         self.rules.clear()
+        self._automaton = None
     
     def enable_rule(self, name: str) -> bool:
         """Enable a rule by name."""
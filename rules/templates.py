@@ -8,11 +8,169 @@ variable substitution, conditional blocks, and formatting.
 
 import re
 from datetime import datetime
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Callable
+from dataclasses import dataclass, field
 import random
 
 
+# Every placeholder form: {name} or {name:argument}. Control words
+# ({if:...}, {else}, {endif}) and {random:...} are told apart when the
+# template is parsed.
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)(?::([^}]+))?\}")
+
+# Built-in variables, formatted from the render time
+_BUILTINS: Dict[str, Callable[[datetime], str]] = {
+    "date": lambda now: now.strftime("%Y-%m-%d"),
+    "time": lambda now: now.strftime("%H:%M"),
+    "datetime": lambda now: now.strftime("%Y-%m-%d %H:%M"),
+    "year": lambda now: str(now.year),
+    "month": lambda now: str(now.month),
+    "day": lambda now: str(now.day),
+    "weekday": lambda now: now.strftime("%A"),
+    "hour": lambda now: str(now.hour),
+    "minute": lambda now: str(now.minute),
+}
+
+
+def _parse_template(content: str) -> List[tuple]:
+    """
+    Parse template content into a list of nodes.
+    
+    Nodes are tuples tagged by their first item:
+    - ("text", text)
+    - ("var", name)
+    - ("default", name, default)
+    - ("date", name, format, placeholder)
+    - ("random", options)
+    - ("if", name, then_nodes, else_nodes)
+    
+    Conditional blocks nest. An {if:...} without a matching {endif}
+    is kept as literal text, as are stray {else}/{endif} markers.
+    """
+    root: List[tuple] = []
+    # Open {if:...} blocks: [name, placeholder, then_nodes, else_nodes]
+    blocks: List[list] = []
+    
+    def emit(node: tuple) -> None:
+        if not blocks:
+            root.append(node)
+        elif blocks[-1][3] is None:
+            blocks[-1][2].append(node)
+        else:
+            blocks[-1][3].append(node)
+    
+    position = 0
+    for match in _PLACEHOLDER_RE.finditer(content):
+        if match.start() > position:
+            emit(("text", content[position:match.start()]))
+        position = match.end()
+        
+        name, argument = match.group(1), match.group(2)
+        
+        if argument is None and blocks and name == "else" and blocks[-1][3] is None:
+            blocks[-1][3] = []
+        elif argument is None and blocks and name == "endif":
+            block_name, _, then_nodes, else_nodes = blocks.pop()
+            emit(("if", block_name, then_nodes, else_nodes or []))
+        elif argument is None:
+            emit(("var", name))
+        elif name == "if":
+            blocks.append([argument, match.group(0), [], None])
+        elif name == "random":
+            emit(("random", tuple(argument.split("|"))))
+        elif argument.startswith("%"):
+            emit(("date", name, argument, match.group(0)))
+        else:
+            emit(("default", name, argument))
+    
+    if position < len(content):
+        emit(("text", content[position:]))
+    
+    # Unclosed blocks fall back to their literal text
+    while blocks:
+        _, placeholder, then_nodes, else_nodes = blocks.pop()
+        emit(("text", placeholder))
+        for node in then_nodes:
+            emit(node)
+        if else_nodes is not None:
+            emit(("text", "{else}"))
+            for node in else_nodes:
+                emit(node)
+    
+    return root
+
+
+def _clock_variables(nodes: List[tuple]) -> frozenset:
+    """Collect the built-in and date/time variables used by parsed nodes."""
+    names = set()
+    for node in nodes:
+        if node[0] == "var" and node[1] in _BUILTINS:
+            names.add(node[1])
+        elif node[0] == "date" and node[1] in ("date", "time"):
+            names.add(node[1])
+        elif node[0] == "if":
+            names |= _clock_variables(node[2])
+            names |= _clock_variables(node[3])
+    return frozenset(names)
+
+
+def _format_date(name: str, fmt: str, placeholder: str, context: Dict, now: datetime) -> str:
+    """Render a {name:%format} placeholder."""
+    if name in context:
+        value = context[name]
+        if isinstance(value, datetime):
+            return value.strftime(fmt)
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value).strftime(fmt)
+            except ValueError:
+                return placeholder
+        return str(value)
+    
+    if name == "date" or name == "time":
+        return now.strftime(fmt)
+    
+    return placeholder
+
+
+def _render_nodes(
+    nodes: List[tuple],
+    context: Dict,
+    now: Optional[datetime],
+    out: List[str]
+) -> None:
+    """Render parsed template nodes, appending the output to out."""
+    for node in nodes:
+        kind = node[0]
+        
+        if kind == "text":
+            out.append(node[1])
+        
+        elif kind == "var":
+            name = node[1]
+            if name in context:
+                out.append(str(context[name]))
+            elif name in _BUILTINS:
+                out.append(_BUILTINS[name](now))
+            else:
+                out.append("{" + name + "}")  # Keep placeholder if not found
+        
+        elif kind == "default":
+            name = node[1]
+            out.append(str(context[name]) if name in context else node[2])
+        
+        elif kind == "date":
+            out.append(_format_date(node[1], node[2], node[3], context, now))
+        
+        elif kind == "random":
+            out.append(random.choice(node[1]))
+        
+        elif kind == "if":
+            name = node[1]
+            branch = node[2] if name in context and context[name] else node[3]
+            _render_nodes(branch, context, now, out)
+
+
 @dataclass
 class Template:
     """
@@ -23,6 +181,7 @@ class Template:
     - Default: {variable:default}
     - Format: {variable:%Y-%m-%d} for dates
     - Random: {random:option1|option2|option3}
+    - Conditional: {if:variable}yes{else}no{endif}
     
     Attributes:
         content (str): Template content with placeholders
@@ -31,147 +190,47 @@ class Template:
     content: str
     name: str = ""
     
-    def render(self, context: Optional[Dict[str, Any]] = None) -> str:
+    # Parsed content, the content it was parsed from (reparsed if content
+    # is reassigned) and the built-ins it uses
+    _nodes: List[tuple] = field(default_factory=list, init=False, repr=False, compare=False)
+    _parsed: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _used_builtins: frozenset = field(default=frozenset(), init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        """Parse the template content once."""
+        self._nodes = _parse_template(self.content)
+        self._parsed = self.content
+        self._used_builtins = _clock_variables(self._nodes)
+    
+    def render(
+        self,
+        context: Optional[Dict[str, Any]] = None,
+        now: Optional[datetime] = None
+    ) -> str:
         """
         Render the template with context variables.
         
+        Context variables take precedence over built-ins such as
+        {date} and {weekday}; unknown simple placeholders are kept.
+        Only the built-ins the template uses are formatted, and the
+        clock isn't read at all for templates without any.
+        
         Args:
             context: Dictionary of variable values
+            now: Time for date/time placeholders (default: now)
             
         Returns:
             Rendered string
         """
-        context = context or {}
-        result = self.content
-        
-        # Process simple substitutions
-        result = self._process_simple_vars(result, context)
-        
-        # Process default values
-        result = self._process_defaults(result, context)
-        
-        # Process date formatting
-        result = self._process_dates(result, context)
-        
-        # Process random selections
-        result = self._process_random(result)
-        
-        # Process conditionals
-        result = self._process_conditionals(result, context)
-        
-        # Process built-in variables
-        result = self._process_builtins(result)
-        
-        return result
-    
-    def _process_simple_vars(self, text: str, context: Dict) -> str:
-        """Process simple {variable} substitutions."""
-        def replace(match):
-            var_name = match.group(1)
-            if var_name in context:
-                return str(context[var_name])
-            return match.group(0)  # Keep placeholder if not found
-        
-        return re.sub(r'\{(\w+)\}', replace, text)
-    
-    def _process_defaults(self, text: str, context: Dict) -> str:
-        """Process {variable:default} substitutions."""
-        def replace(match):
-            var_name = match.group(1)
-            default = match.group(2)
-            if var_name in context:
-                return str(context[var_name])
-            return default
-        
-        return re.sub(r'\{(\w+):([^}]+)\}', replace, text)
-    
-    def _process_dates(self, text: str, context: Dict) -> str:
-        """Process date formatting {date:%Y-%m-%d}."""
-        def replace(match):
-            var_name = match.group(1)
-            fmt = match.group(2)
-            
-            if var_name == "date":
-                return datetime.now().strftime(fmt)
-            elif var_name == "time":
-                return datetime.now().strftime(fmt)
-            elif var_name in context:
-                value = context[var_name]
-                if isinstance(value, datetime):
-                    return value.strftime(fmt)
-                elif isinstance(value, str):
-                    try:
-                        dt = datetime.fromisoformat(value)
-                        return dt.strftime(fmt)
-                    except ValueError:
-                        pass
-            
-            return match.group(0)
-        
-        return re.sub(r'\{(date|time|\w+):(%[^}]+)\}', replace, text)
-    
-    def _process_random(self, text: str) -> str:
-        """Process {random:opt1|opt2|opt3} selections."""
-        def replace(match):
-            options = match.group(1).split("|")
-            return random.choice(options)
-        
-        return re.sub(r'\{random:([^}]+)\}', replace, text)
-    
-    def _process_conditionals(self, text: str, context: Dict) -> str:
-        """
-        Process conditional blocks.
-        
-        Syntax: {if:variable}content{endif}
-        Syntax: {if:variable}yes{else}no{endif}
-        """
-        # Process if-else blocks
-        pattern = r'\{if:(\w+)\}([^{]*)\{else\}([^{]*)\{endif\}'
-        
-        def replace_if_else(match):
-            var_name = match.group(1)
-            yes_content = match.group(2)
-            no_content = match.group(3)
-            
-            if var_name in context and context[var_name]:
-                return yes_content
-            return no_content
-        
-        text = re.sub(pattern, replace_if_else, text)
-        
-        # Process if-only blocks
-        pattern = r'\{if:(\w+)\}([^{]*)\{endif\}'
-        
-        def replace_if(match):
-            var_name = match.group(1)
-            content = match.group(2)
-            
-            if var_name in context and context[var_name]:
-                return content
-            return ""
-        
-        return re.sub(pattern, replace_if, text)
-    
-    def _process_builtins(self, text: str) -> str:
-        """Process built-in variables."""
-        now = datetime.now()
-        
-        builtins = {
-            "date": now.strftime("%Y-%m-%d"),
-            "time": now.strftime("%H:%M"),
-            "datetime": now.strftime("%Y-%m-%d %H:%M"),
-            "year": str(now.year),
-            "month": str(now.month),
-            "day": str(now.day),
-            "weekday": now.strftime("%A"),
-            "hour": str(now.hour),
-            "minute": str(now.minute),
-        }
+        if self._parsed is not self.content:
+            self.__post_init__()
         
-        for name, value in builtins.items():
-            text = text.replace(f"{{{name}}}", value)
+        if now is None and self._used_builtins:
+            now = datetime.now()
         
-        return text
+        out: List[str] = []
+        _render_nodes(self._nodes, context or {}, now, out)
+        return "".join(out)
     
     def extract_variables(self) -> List[str]:
         """
@@ -241,20 +300,26 @@ class TemplateManager:
         """
         return self.templates.get(name)
     
-    def render(self, name: str, context: Optional[Dict] = None) -> Optional[str]:
+    def render(
+        self,
+        name: str,
+        context: Optional[Dict] = None,
+        now: Optional[datetime] = None
+    ) -> Optional[str]:
         """
         Render a template by name.
         
         Args:
             name: Template name
             context: Variable context
+            now: Time for date/time placeholders (default: now)
             
         Returns:
             Rendered string or None if template not found
         """
         template = self.get_template(name)
         if template:
-            return template.render(context)
+            return template.render(context, now)
         return None
     
     def has_template(self, name: str) -> bool:
@@ -11,7 +11,7 @@ from datetime import datetime
 from dataclasses import dataclass
 import json
 
-from llm.base import Message, LLMResponse
+from llm.base import Message, LLMResponse, Role
 from llm.factory import create_llm_provider
 from rules.engine import RulesEngine, RuleMatch
 from core.config import Config
@@ -374,7 +374,7 @@ class AIResponder:
         system_content += f"\n- Date & Time: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
         system_content += f"\n- Current Year: {datetime.now().year}"
         
-        messages.append(Message(role="system", content=system_content))
+        messages.append(Message(role=Role.SYSTEM, content=system_content))
         
         # Add conversation history
         history = self.database.get_conversation_context(
@@ -384,14 +384,14 @@ class AIResponder:
         
         if history:
             # Tell the LLM this is history
-            messages.append(Message(role="system", content="--- PREVIOUS MESSAGES IN THIS CONVERSATION ---"))
+            messages.append(Message(role=Role.SYSTEM, content="--- PREVIOUS MESSAGES IN THIS CONVERSATION ---"))
             for msg in history:
-                role = "user" if msg["direction"] == "incoming" else "assistant"
+                role = Role.USER if msg["direction"] == "incoming" else Role.ASSISTANT
                 messages.append(Message(role=role, content=msg["message"]))
-            messages.append(Message(role="system", content="--- END OF HISTORY. RESPOND TO THE LATEST MESSAGE BELOW ---"))
+            messages.append(Message(role=Role.SYSTEM, content="--- END OF HISTORY. RESPOND TO THE LATEST MESSAGE BELOW ---"))
         
         # Add current message
-        messages.append(Message(role="user", content=incoming_message))
+        messages.append(Message(role=Role.USER, content=incoming_message))
         
         return messages
     
@@ -11,6 +11,7 @@ responses including:
 """
 
 import re
+import random
 from typing import Optional, List, Dict, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
@@ -22,6 +23,9 @@ from core.security import SecurityManager
 
 logger = get_logger("services.guardrails")
 
+# Private PRNG for fallback selection (not security-sensitive)
+_FALLBACK_RNG = random.Random()
+
 
 class ViolationType(Enum):
     """Types of guardrail violations."""
@@ -126,12 +130,12 @@ class GuardrailSystem:
     ]
     
     # Default fallback responses
-    FALLBACK_RESPONSES = [
+    FALLBACK_RESPONSES = (
         "I received your message but cannot provide a specific response right now.",
         "Thanks for reaching out! I'll get back to you soon.",
         "Message received. I'll respond when available.",
         "Thanks for your message! I'm currently unavailable.",
-    ]
+    )
     
     def __init__(
         self,
@@ -402,8 +406,7 @@ class GuardrailSystem:
         Returns:
             Safe response to use when validation fails
         """
-        import random
-        return random.choice(self.FALLBACK_RESPONSES)
+        return _FALLBACK_RNG.choice(self.FALLBACK_RESPONSES)
     
     def add_custom_pattern(self, pattern: str) -> bool:
         """
@@ -0,0 +1,832 @@
+"""
+Test LLM Module
+==============
+
+Unit tests for the LLM provider abstraction.
+"""
+
+import asyncio
+import json
+import pytest
+from pathlib import Path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+from core.exceptions import LLMError
+from llm.base import LLMConfig, Message, Role
+from llm.groq import GroqProvider
+from llm.ollama import OllamaProvider
+from llm.openrouter import OpenRouterProvider
+
+
+class TestMessage:
+    """Tests for Message class."""
+
+    def test_role_name_is_coerced(self):
+        """Test role names are converted to Role members."""
+        msg = Message(role="assistant", content="Hi")
+        assert msg.role is Role.ASSISTANT
+        assert msg == Message(role=Role.ASSISTANT, content="Hi")
+
+    def test_unknown_role(self):
+        """Test unknown roles are rejected."""
+        with pytest.raises(ValueError):
+            Message(role="tool", content="Hi")
+
+    def test_to_dict(self):
+        """Test API dictionary serialization."""
+        msg = Message(role=Role.USER, content="Hello")
+        assert msg.to_dict() == {"role": "user", "content": "Hello"}
+        assert msg.to_dict() is msg.to_dict()
+
+    def test_to_dict_with_name(self):
+        """Test the optional name is included when set."""
+        msg = Message(role=Role.USER, content="Hello", name="john")
+        assert dict(msg) == {"role": "user", "content": "Hello", "name": "john"}
+
+    def test_encode_chat_body(self):
+        """Test the spliced request body matches a plain JSON encoding."""
+        from llm.base import encode_chat_body
+
+        messages = [
+            Message(role=Role.SYSTEM, content="Be brief"),
+            Message(role=Role.USER, content='Say "hi" \u2713'),
+        ]
+        body = encode_chat_body(messages, {"model": "m", "temperature": 0.5})
+
+        assert json.loads(body) == {
+            "messages": [m.to_dict() for m in messages],
+            "model": "m",
+            "temperature": 0.5,
+        }
+        assert messages[0].to_json() is messages[0].to_json()
+        assert json.loads(encode_chat_body(messages, {}))["messages"][1]["content"] == 'Say "hi" \u2713'
+
+
+def _groq_with_transport(handler, **config_kwargs):
+    """Create a GroqProvider whose HTTP client uses a mock transport."""
+    config = LLMConfig(model="test-model", api_key="gsk_test", api_base="", **config_kwargs)
+    provider = GroqProvider(config)
+    provider._client.close()
+    provider._client = httpx.Client(
+        base_url=provider.api_base,
+        headers=provider._build_headers(),
+        transport=httpx.MockTransport(handler),
+    )
+    provider._get_async_client = lambda: httpx.AsyncClient(
+        base_url=provider.api_base,
+        headers=provider._build_headers(),
+        transport=httpx.MockTransport(handler),
+    )
+    return provider
+
+
+def _completion(content="Hi there", **extra):
+    """Build a chat completion response body."""
+    body = {
+        "model": "test-model",
+        "choices": [{"message": {"content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5},
+    }
+    body.update(extra)
+    return body
+
+
+class TestLLMConfig:
+    """Tests for the provider LLMConfig."""
+
+    def test_frozen(self):
+        """Test configurations cannot be modified after creation."""
+        import dataclasses
+
+        config = LLMConfig(model="m")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.model = "other"
+
+
+class TestGroqProvider:
+    """Tests for GroqProvider."""
+
+    def test_chat(self):
+        """Test a chat request is sent and parsed."""
+        seen = {}
+
+        def handler(request):
+            seen["path"] = request.url.path
+            seen["auth"] = request.headers["Authorization"]
+            seen["body"] = json.loads(request.content)
+            return httpx.Response(200, json=_completion())
+
+        provider = _groq_with_transport(handler)
+        response = provider.chat([Message(role="user", content="Hello")])
+
+        assert response.content == "Hi there"
+        assert response.tokens_used == 5
+        assert seen["path"] == "/openai/v1/chat/completions"
+        assert seen["auth"] == "Bearer gsk_test"
+        assert seen["body"]["messages"] == [{"role": "user", "content": "Hello"}]
+        assert seen["body"]["max_tokens"] == 150
+        assert seen["body"]["top_p"] == 0.9
+        assert response.metadata == {}
+
+    def test_include_raw(self):
+        """Test the raw response body is only kept on request."""
+        def handler(request):
+            return httpx.Response(200, json=_completion(id="cmpl-1"))
+
+        provider = _groq_with_transport(handler)
+        response = provider.generate("Hello", include_raw=True)
+
+        assert response.metadata["raw_response"]["id"] == "cmpl-1"
+
+    def test_generate(self):
+        """Test generate sends a single user message with overrides."""
+        seen = {}
+
+        def handler(request):
+            seen["body"] = json.loads(request.content)
+            return httpx.Response(200, json=_completion())
+
+        provider = _groq_with_transport(handler)
+        provider.generate("Hello", temperature=0.2, stop=["\n"])
+
+        assert seen["body"]["messages"] == [{"role": "user", "content": "Hello"}]
+        assert seen["body"]["temperature"] == 0.2
+        assert seen["body"]["stop"] == ["\n"]
+
+    def test_api_error(self):
+        """Test API errors are raised as LLMError with the status code."""
+        def handler(request):
+            return httpx.Response(401, json={"error": {"message": "bad key"}})
+
+        provider = _groq_with_transport(handler)
+        with pytest.raises(LLMError) as exc:
+            provider.generate("Hello")
+
+        assert "bad key" in str(exc.value)
+        assert exc.value.details["status"] == 401
+
+    def test_retries_rate_limit(self, monkeypatch):
+        """Test 429 responses are retried after the Retry-After delay."""
+        import llm.groq
+
+        sleeps = []
+        monkeypatch.setattr(llm.groq.time, "sleep", sleeps.append)
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "2"}, json={"error": {"message": "slow down"}})
+            return httpx.Response(200, json=_completion())
+
+        provider = _groq_with_transport(handler)
+        response = provider.generate("Hello")
+
+        assert response.content == "Hi there"
+        assert len(calls) == 2
+        assert sleeps == [2.0]
+
+    def test_retries_exhausted(self, monkeypatch):
+        """Test persistent server errors fail after max_retries."""
+        import llm.groq
+
+        monkeypatch.setattr(llm.groq.time, "sleep", lambda delay: None)
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503, json={"error": {"message": "unavailable"}})
+
+        provider = _groq_with_transport(handler, extra_params={"max_retries": 2})
+        with pytest.raises(LLMError) as exc:
+            provider.generate("Hello")
+
+        assert exc.value.details["status"] == 503
+        assert len(calls) == 3
+
+    def test_api_key_rotation(self):
+        """Test requests rotate through extra_params api_keys."""
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers["Authorization"])
+            return httpx.Response(200, json=_completion())
+
+        provider = _groq_with_transport(handler, extra_params={"api_keys": ["gsk_a", "gsk_b"]})
+        for _ in range(3):
+            provider.generate("Hello")
+
+        assert seen == ["Bearer gsk_a", "Bearer gsk_b", "Bearer gsk_a"]
+
+    def test_stream_chat(self):
+        """Test server-sent events are yielded as content deltas."""
+        events = [
+            {"choices": [{"delta": {"role": "assistant"}}]},
+            {"choices": [{"delta": {"content": "Hel"}}]},
+            {"choices": [{"delta": {"content": "lo"}}]},
+        ]
+        stream_body = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+
+        def handler(request):
+            assert json.loads(request.content)["stream"] is True
+            return httpx.Response(200, content=stream_body.encode())
+
+        provider = _groq_with_transport(handler)
+        messages = [Message(role="user", content="Hi")]
+
+        assert list(provider.stream_chat(messages)) == ["Hel", "lo"]
+
+        async def collect():
+            return [delta async for delta in provider.stream_chat_async(messages)]
+
+        assert asyncio.run(collect()) == ["Hel", "lo"]
+
+    def test_is_available_cached(self):
+        """Test availability is probed with GET and cached."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            return httpx.Response(200, json={"data": []})
+
+        provider = _groq_with_transport(handler)
+
+        assert provider.is_available() is True
+        assert provider.is_available() is True
+        assert calls == ["GET"]
+
+    def test_get_models_cached(self):
+        """Test the model list is fetched once and then served from cache."""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(200, json={"data": [{"id": "model-a"}, {"id": "model-b"}]})
+
+        provider = _groq_with_transport(handler)
+
+        assert provider.get_models() == ["model-a", "model-b"]
+        assert provider.get_models() == ["model-a", "model-b"]
+        assert len(calls) == 1
+
+    def test_chat_async(self):
+        """Test the async path uses the async client directly."""
+        def handler(request):
+            return httpx.Response(200, json=_completion("Async hi"))
+
+        provider = _groq_with_transport(handler)
+
+        response = asyncio.run(provider.generate_async("Hello"))
+        assert response.content == "Async hi"
+
+    def test_chat_many_sync(self):
+        """Test batched requests keep order and capture failures."""
+        def handler(request):
+            prompt = json.loads(request.content)["messages"][0]["content"]
+            if prompt == "fail":
+                return httpx.Response(500, json={"error": {"message": "boom"}})
+            return httpx.Response(200, json=_completion(prompt.upper()))
+
+        provider = _groq_with_transport(handler, extra_params={"max_retries": 0})
+        results = provider.chat_many_sync(
+            [[Message(role="user", content=text)] for text in ("a", "fail", "b")],
+            concurrency=2
+        )
+
+        assert results[0].content == "A"
+        assert isinstance(results[1], LLMError)
+        assert results[2].content == "B"
+
+
+def _ollama_with_transport(handler, **config_kwargs):
+    """Create an OllamaProvider whose HTTP client uses a mock transport."""
+    config = LLMConfig(model="llama3", api_base="http://ollama.test", **config_kwargs)
+    provider = OllamaProvider(config)
+    provider._client.close()
+    provider._client = httpx.Client(
+        base_url=provider.host,
+        transport=httpx.MockTransport(handler),
+    )
+    provider._get_async_client = lambda: httpx.AsyncClient(
+        base_url=provider.host,
+        transport=httpx.MockTransport(handler),
+    )
+    return provider
+
+
+class TestOllamaProvider:
+    """Tests for OllamaProvider."""
+
+    def test_chat(self):
+        """Test a chat request is sent over the pooled client and parsed."""
+        seen = {}
+
+        def handler(request):
+            seen["path"] = request.url.path
+            seen["body"] = json.loads(request.content)
+            return httpx.Response(200, json={
+                "message": {"role": "assistant", "content": "Hi there"},
+                "done": True,
+                "prompt_eval_count": 3,
+                "eval_count": 2,
+            })
+
+        provider = _ollama_with_transport(handler)
+        response = provider.chat([Message(role="user", content="Hello")])
+
+        assert response.content == "Hi there"
+        assert response.tokens_used == 5
+        assert seen["path"] == "/api/chat"
+        assert seen["body"]["messages"] == [{"role": "user", "content": "Hello"}]
+
+    def test_options(self):
+        """Test default options are shared and overrides get a copy."""
+        provider = OllamaProvider(LLMConfig(model="llama3", api_base="http://ollama.test"))
+
+        assert provider._options(None, None, {}) is provider._base_options
+        options = provider._options(0.1, None, {"seed": 7})
+        assert options == {"temperature": 0.1, "num_predict": 150, "top_p": 0.9, "seed": 7}
+        assert provider._base_options["temperature"] == 0.7
+        provider.close()
+
+    def test_deterministic_responses_cached(self):
+        """Test temperature 0 responses are served from the cache."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"response": "Same", "done": True})
+
+        provider = _ollama_with_transport(handler)
+        first = provider.generate("Hello", temperature=0)
+        second = provider.generate("Hello", temperature=0)
+        provider.generate("Hello")
+
+        assert len(calls) == 2
+        assert second.content == first.content
+        assert second.metadata["cached"] is True
+        assert "cached" not in first.metadata
+
+    def test_stream_returns_last_frame(self):
+        """Test streamed NDJSON responses return the final frame."""
+        frames = [{"response": "Hel", "done": False}, {"response": "lo", "done": True}]
+
+        def handler(request):
+            return httpx.Response(200, content="".join(json.dumps(f) + "\n" for f in frames).encode())
+
+        provider = _ollama_with_transport(handler)
+        result = provider._make_request("/api/generate", {"stream": True}, stream=True)
+
+        assert result == frames[-1]
+
+    def test_chat_stream(self):
+        """Test chat_stream yields message fragments until done."""
+        frames = [
+            {"message": {"content": "Hel"}, "done": False},
+            {"message": {"content": "lo"}, "done": False},
+            {"message": {"content": ""}, "done": True, "eval_count": 2},
+        ]
+
+        def handler(request):
+            assert json.loads(request.content)["stream"] is True
+            return httpx.Response(200, content="".join(json.dumps(f) + "\n" for f in frames).encode())
+
+        provider = _ollama_with_transport(handler)
+
+        async def collect():
+            return [t async for t in provider.chat_stream([Message(role="user", content="Hi")])]
+
+        assert asyncio.run(collect()) == ["Hel", "lo"]
+
+    def test_generate_async(self):
+        """Test the async path uses the shared async client."""
+        def handler(request):
+            assert request.url.path == "/api/generate"
+            return httpx.Response(200, json={"response": "Async hi", "done": True})
+
+        provider = _ollama_with_transport(handler)
+        response = asyncio.run(provider.generate_async("Hello"))
+
+        assert response.content == "Async hi"
+
+    def test_generate_many(self):
+        """Test batched prompts keep their input order."""
+        def handler(request):
+            prompt = json.loads(request.content)["prompt"]
+            return httpx.Response(200, json={"response": prompt[::-1], "done": True})
+
+        provider = _ollama_with_transport(handler)
+        results = asyncio.run(provider.generate_many(["abc", "xyz"], concurrency=1))
+
+        assert [r.content for r in results] == ["cba", "zyx"]
+
+    def test_api_error(self):
+        """Test API errors are raised as LLMError with the status code."""
+        def handler(request):
+            return httpx.Response(404, json={"error": "model not found"})
+
+        provider = _ollama_with_transport(handler)
+        with pytest.raises(LLMError) as exc:
+            provider.generate("Hello")
+
+        assert "model not found" in str(exc.value)
+        assert exc.value.details["status"] == 404
+
+    def test_async_api_error_details(self):
+        """Test async errors carry rate limit headers in their details."""
+        def handler(request):
+            return httpx.Response(
+                429,
+                headers={"Retry-After": "3", "X-RateLimit-Remaining": "0"},
+                text="too many requests",
+            )
+
+        provider = _ollama_with_transport(handler, extra_params={"max_retries": 0})
+        with pytest.raises(LLMError) as exc:
+            asyncio.run(provider.generate_async("Hello"))
+
+        assert "too many requests" in str(exc.value)
+        assert exc.value.details["retry_after"] == 3.0
+        assert exc.value.details["rate_limit_remaining"] == "0"
+
+    def test_connection_error(self):
+        """Test connection failures are reported as LLMError."""
+        def handler(request):
+            raise httpx.ConnectError("connection refused", request=request)
+
+        provider = _ollama_with_transport(handler, extra_params={"max_retries": 0})
+        with pytest.raises(LLMError) as exc:
+            provider.generate("Hello")
+
+        assert "Is Ollama running?" in str(exc.value)
+        assert provider.is_available() is False
+
+    def test_retries_transient_errors(self, monkeypatch):
+        """Test overloaded responses and dropped connections are retried."""
+        import llm.ollama
+
+        sleeps = []
+        monkeypatch.setattr(llm.ollama.time, "sleep", sleeps.append)
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("connection reset", request=request)
+            if len(calls) == 2:
+                return httpx.Response(503, headers={"Retry-After": "1"}, text="busy")
+            return httpx.Response(200, json={"response": "Hi", "done": True})
+
+        provider = _ollama_with_transport(handler)
+
+        assert provider.generate("Hello").content == "Hi"
+        assert len(calls) == 3
+        assert sleeps[1] == 1.0
+
+    def test_pull_model_reports_progress(self):
+        """Test pull_model streams progress frames to the callback."""
+        def handler(request):
+            assert json.loads(request.content) == {"name": "llama3.2", "stream": True}
+            body = "\n".join([
+                '{"status": "pulling manifest"}',
+                '{"status": "downloading", "completed": 5, "total": 10}',
+                '{"status": "success"}',
+            ])
+            return httpx.Response(200, text=body)
+
+        provider = _ollama_with_transport(handler)
+        frames = []
+
+        assert provider.pull_model("llama3.2", on_progress=frames.append) is True
+        assert [f["status"] for f in frames] == ["pulling manifest", "downloading", "success"]
+
+    def test_pull_model_error_frame(self):
+        """Test pull_model stops on an error frame."""
+        def handler(request):
+            return httpx.Response(200, text='{"error": "model not found"}\n{"status": "success"}')
+
+        provider = _ollama_with_transport(handler)
+        assert provider.pull_model("missing") is False
+
+    def test_circuit_breaker(self):
+        """Test repeated connection failures open the circuit."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.ConnectError("connection refused", request=request)
+
+        provider = _ollama_with_transport(handler, extra_params={"max_retries": 0})
+        for _ in range(provider.BREAKER_THRESHOLD):
+            with pytest.raises(LLMError):
+                provider.generate("Hello")
+
+        assert provider.breaker_state()["state"] == "open"
+        with pytest.raises(LLMError) as exc:
+            provider.generate("Hello")
+        assert "circuit open" in str(exc.value)
+        assert len(calls) == provider.BREAKER_THRESHOLD
+
+    def test_is_available_cached_until_connection_error(self):
+        """Test availability is cached and reset by connection failures."""
+        state = {"up": True, "probes": 0}
+
+        def handler(request):
+            if request.url.path == "/api/version":
+                state["probes"] += 1
+            if not state["up"]:
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(200, json={"version": "0.1"})
+
+        provider = _ollama_with_transport(handler, extra_params={"max_retries": 0})
+        assert provider.is_available() is True
+        assert provider.is_available() is True
+        assert state["probes"] == 1
+
+        state["up"] = False
+        with pytest.raises(LLMError):
+            provider.generate("Hello")
+        assert provider.is_available() is False
+        assert state["probes"] == 2
+
+
+def _openrouter_with_transport(handler, **config_kwargs):
+    """Create an OpenRouterProvider whose HTTP client uses a mock transport."""
+    config = LLMConfig(model="test-model", api_key="sk-or-test", **config_kwargs)
+    provider = OpenRouterProvider(config)
+    provider._client.close()
+    provider._client = httpx.Client(
+        base_url=provider.api_base,
+        headers=provider._headers,
+        transport=httpx.MockTransport(handler),
+    )
+    provider._get_async_client = lambda: httpx.AsyncClient(
+        base_url=provider.api_base,
+        headers=provider._headers,
+        transport=httpx.MockTransport(handler),
+    )
+    return provider
+
+
+class TestOpenRouterProvider:
+    """Tests for OpenRouterProvider."""
+
+    def test_chat(self):
+        """Test chat goes through the pooled client."""
+        def handler(request):
+            assert request.url == "https://openrouter.ai/api/v1/chat/completions"
+            assert request.headers["Authorization"] == "Bearer sk-or-test"
+            assert json.loads(request.content)["messages"] == [{"role": "user", "content": "Hello"}]
+            return httpx.Response(200, json=_completion())
+
+        provider = _openrouter_with_transport(handler)
+        response = provider.chat([Message(role=Role.USER, content="Hello")])
+
+        assert response.content == "Hi there"
+        assert response.tokens_used == 5
+
+    def test_generate(self):
+        """Test generate sends a single user message with overrides."""
+        def handler(request):
+            body = json.loads(request.content)
+            assert body["messages"] == [{"role": "user", "content": "Hello"}]
+            assert body["temperature"] == 0.2
+            assert body["stop"] == ["\n"]
+            return httpx.Response(200, json=_completion())
+
+        provider = _openrouter_with_transport(handler)
+        assert provider.generate("Hello", temperature=0.2, stop=["\n"]).content == "Hi there"
+
+    def test_chat_async(self):
+        """Test chat_async goes through the shared async client."""
+        def handler(request):
+            assert request.url == "https://openrouter.ai/api/v1/chat/completions"
+            return httpx.Response(200, json=_completion("Async hi"))
+
+        provider = _openrouter_with_transport(handler)
+        response = asyncio.run(provider.generate_async("Hello"))
+
+        assert response.content == "Async hi"
+
+    def test_chat_stream(self):
+        """Test streamed deltas are yielded in order."""
+        def handler(request):
+            assert json.loads(request.content)["stream"] is True
+            body = (
+                ": OPENROUTER PROCESSING\n\n"
+                'data: {"choices": [{"delta": {"content": "Hel"}}]}\n\n'
+                'data: {"choices": [{"delta": {"content": "lo"}}]}\n\n'
+                "data: [DONE]\n\n"
+            )
+            return httpx.Response(200, text=body)
+
+        provider = _openrouter_with_transport(handler)
+        messages = [Message(role=Role.USER, content="Hi")]
+
+        assert list(provider.chat_stream(messages)) == ["Hel", "lo"]
+
+        async def collect():
+            return [delta async for delta in provider.chat_stream_async(messages)]
+
+        assert asyncio.run(collect()) == ["Hel", "lo"]
+
+    def test_gzip_response(self):
+        """Test compressed responses are requested and decoded."""
+        import gzip
+
+        def handler(request):
+            assert "gzip" in request.headers["Accept-Encoding"]
+            body = gzip.compress(json.dumps({"data": [{"id": "a/model"}]}).encode())
+            return httpx.Response(200, content=body, headers={"Content-Encoding": "gzip"})
+
+        assert _openrouter_with_transport(handler).get_models() == ["a/model"]
+
+    def test_is_available_uses_get(self):
+        """Test the availability probe is a bodiless GET /models."""
+        def handler(request):
+            assert request.method == "GET"
+            assert request.url.path == "/api/v1/models"
+            assert request.content == b""
+            return httpx.Response(200, json={"data": []})
+
+        assert _openrouter_with_transport(handler).is_available() is True
+
+    def test_get_models_cached(self):
+        """Test model listings are cached and failures fall back."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"data": [{"id": "a/model"}, {"name": "no-id"}]})
+
+        provider = _openrouter_with_transport(handler)
+
+        assert provider.get_models() == ["a/model"]
+        assert provider.get_models() == ["a/model"]
+        assert len(calls) == 1
+
+        failing = _openrouter_with_transport(lambda request: httpx.Response(500))
+        assert failing.get_models() == list(OpenRouterProvider.FALLBACK_MODELS)
+        assert failing._models_cache is None
+
+    def test_malformed_response(self):
+        """Test responses without a message choice raise LLMError."""
+        provider = _openrouter_with_transport(
+            lambda request: httpx.Response(200, json={"choices": []})
+        )
+        with pytest.raises(LLMError) as exc:
+            provider.generate("Hello")
+
+        assert "Malformed" in str(exc.value)
+
+    def test_async_api_error(self):
+        """Test async errors keep the status even for non-JSON bodies."""
+        def handler(request):
+            return httpx.Response(502, text="<html>Bad Gateway</html>")
+
+        provider = _openrouter_with_transport(handler)
+        with pytest.raises(LLMError) as exc:
+            asyncio.run(provider.generate_async("Hello"))
+
+        assert exc.value.details["status"] == 502
+        assert "Bad Gateway" in str(exc.value)
+
+    def test_api_error_body_truncated(self):
+        """Test long non-JSON error bodies are capped."""
+        provider = _openrouter_with_transport(
+            lambda request: httpx.Response(500, content=b"x" * 5000)
+        )
+        with pytest.raises(LLMError) as exc:
+            provider.generate("Hello")
+
+        assert str(exc.value).count("x") == OpenRouterProvider.ERROR_BODY_LIMIT
+
+    def test_metadata_keeps_only_id(self):
+        """Test the raw response is dropped unless requested."""
+        def handler(request):
+            return httpx.Response(200, json=_completion(id="gen-1"))
+
+        provider = _openrouter_with_transport(handler)
+
+        assert provider.generate("Hello").metadata == {"id": "gen-1"}
+        raw = provider.generate("Hello", include_raw=True).metadata["raw_response"]
+        assert raw["id"] == "gen-1"
+
+    def test_coalesces_identical_async_requests(self):
+        """Test opted-in concurrent deterministic requests share one call."""
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json=_completion())
+
+        provider = _openrouter_with_transport(
+            handler, extra_params={"deduplicate_inflight": True}
+        )
+
+        async def run():
+            return await asyncio.gather(
+                provider.generate_async("Hello", temperature=0),
+                provider.generate_async("Hello", temperature=0),
+                provider.generate_async("Hello", temperature=0, include_raw=True),
+                provider.generate_async("Hello", temperature=0.7),
+                provider.generate_async("Hello", temperature=0.7),
+            )
+
+        responses = asyncio.run(run())
+
+        assert [r.content for r in responses] == ["Hi there"] * 5
+        assert len(calls) == 4
+        assert responses[0] is not responses[1]
+        assert responses[0].metadata is not responses[1].metadata
+        assert "raw_response" not in responses[0].metadata
+        assert "raw_response" in responses[2].metadata
+        assert provider._inflight == {}
+
+    def test_does_not_coalesce_by_default(self):
+        """Test concurrent requests are not shared without opting in."""
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json=_completion())
+
+        provider = _openrouter_with_transport(handler)
+
+        async def run():
+            return await asyncio.gather(
+                provider.generate_async("Hello", temperature=0),
+                provider.generate_async("Hello", temperature=0),
+            )
+
+        asyncio.run(run())
+
+        assert len(calls) == 2
+
+    def test_api_error(self):
+        """Test API errors surface the message and status."""
+        def handler(request):
+            return httpx.Response(401, json={"error": {"message": "Invalid key"}})
+
+        provider = _openrouter_with_transport(handler)
+        with pytest.raises(LLMError) as exc:
+            provider.generate("Hello")
+
+        assert "Invalid key" in str(exc.value)
+        assert exc.value.details["status"] == 401
+
+
+class TestLLMFactory:
+    """Tests for LLMFactory."""
+
+    def test_create_resolves_lazy_provider(self):
+        """Test built-in providers are imported on first use."""
+        from llm.factory import LLMFactory, PROVIDERS
+
+        provider = LLMFactory.create("GROQ", LLMConfig(api_key="gsk_test", api_base=""))
+        assert isinstance(provider, GroqProvider)
+        assert PROVIDERS["groq"] is GroqProvider
+        LLMFactory.clear_cache()
+
+    def test_unknown_provider(self):
+        """Test unknown providers raise ConfigError."""
+        from core.exceptions import ConfigError
+        from llm.factory import LLMFactory
+
+        with pytest.raises(ConfigError):
+            LLMFactory.create("nope", LLMConfig())
+
+    def test_instances_are_cached(self):
+        """Test equal configurations share one provider instance."""
+        from llm.factory import LLMFactory
+
+        try:
+            first = LLMFactory.create("groq", LLMConfig(api_key="gsk_test", api_base=""))
+            second = LLMFactory.create("groq", LLMConfig(api_key="gsk_test", api_base=""))
+            other = LLMFactory.create("groq", LLMConfig(api_key="gsk_other", api_base=""))
+            assert first is second
+            assert other is not first
+        finally:
+            LLMFactory.clear_cache()
+
+    def test_register_keeps_first_provider(self):
+        """Test registering an existing name keeps the first provider."""
+        from llm.factory import LLMFactory, PROVIDERS
+
+        class CustomProvider(GroqProvider):
+            pass
+
+        class OtherProvider(GroqProvider):
+            pass
+
+        try:
+            LLMFactory.register("Custom", CustomProvider)
+            LLMFactory.register("custom", OtherProvider)
+            assert PROVIDERS["custom"] is CustomProvider
+        finally:
+            PROVIDERS.pop("custom", None)
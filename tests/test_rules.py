@@ -6,11 +6,13 @@ Unit tests for the rules engine and pattern matching.
 """
 
 import pytest
+from datetime import datetime
 from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from rules.engine import RulesEngine, Rule, RuleMatch, MatchType, RulePriority
+from rules.templates import Template
 
 
 class TestRule:
@@ -59,6 +61,19 @@ class TestRule:
         match = rule.matches("Call 555-1234 now")
         assert match is not None
     
+    def test_regex_groups_and_invalid_pattern(self):
+        """Test named groups are captured and invalid regexes are skipped."""
+        rule = Rule(
+            name="test",
+            patterns=["(unclosed", r"order (?P<order_id>\d+)"],
+            match_type=MatchType.REGEX,
+            responses=["Order {order_id} noted"]
+        )
+        
+        match = rule.matches("ORDER 42 please")
+        assert match.groups == {"order_id": "42"}
+        assert match.get_response() == "Order 42 noted"
+    
     def test_keywords_match(self):
         """Test keywords matching."""
         rule = Rule(
@@ -87,6 +102,46 @@ class TestRule:
         match = rule.matches("hello")
         assert match is None
     
+    def test_response_variables(self):
+        """Test placeholders are filled and unknown ones kept."""
+        rule = Rule(
+            name="test",
+            patterns=["hello"],
+            responses=["You said '{message}' {unknown}"]
+        )
+        
+        assert rule.matches("hello").get_response() == "You said 'hello' {unknown}"
+        
+        # Edits after construction take effect
+        rule.responses[:] = ["Bye {message}"]
+        assert rule.matches("hello").get_response() == "Bye hello"
+    
+    def test_conditions(self):
+        """Test day, start time and sender conditions."""
+        every_day = ["Monday", "Tuesday", "Wednesday", "Thursday",
+                     "Friday", "Saturday", "Sunday"]
+        rule = Rule(
+            name="test",
+            patterns=["hello"],
+            conditions={
+                "days": every_day,
+                "time_start": "00:00",
+                "allowed_senders": ["+15550001"],
+            }
+        )
+        
+        assert rule.matches("hello", {"sender": "+15550001"}) is not None
+        assert rule.matches("hello", {"sender": "+15550002"}) is None
+        
+        rule = Rule(name="test", patterns=["hello"], conditions={"days": []})
+        assert rule.matches("hello") is None
+        
+        # Edits after construction take effect
+        rule.conditions["days"].extend(every_day)
+        assert rule.matches("hello") is not None
+        rule.conditions["days"] = []
+        assert rule.matches("hello") is None
+    
     def test_priority(self):
         """Test rule priority."""
         rule1 = Rule(name="low", patterns=["test"], priority=10, responses=["Low"])
@@ -139,6 +194,114 @@ class TestRulesEngine:
         matches = engine.match_all("test")
         
         assert len(matches) == 2
+    
+    def test_match_uses_given_time(self):
+        """Test one timestamp is used for conditions and the response."""
+        engine = RulesEngine()
+        engine.add_rule(Rule(
+            name="late",
+            patterns=["time"],
+            responses=["It is {time} on {date}"],
+            conditions={"time_start": "22:00"}
+        ))
+        
+        assert engine.match("time?", now=datetime(2024, 1, 5, 21, 0)) is None
+        
+        match = engine.match("time?", now=datetime(2024, 1, 5, 23, 15))
+        assert match.get_response() == "It is 23:15 on 2024-01-05"
+    
+    def test_load_rules_reuses_parse(self, tmp_path):
+        """Test engines for an unchanged rules file don't share rules."""
+        RulesEngine(config_dir=str(tmp_path))  # Writes default rules
+        first = RulesEngine(config_dir=str(tmp_path))
+        first.disable_rule("greeting")
+        first.get_rule("help").patterns.append("sos")
+        
+        second = RulesEngine(config_dir=str(tmp_path))
+        
+        assert first.match("sos").rule.name == "help"
+        assert [r.name for r in second.rules] == [r.name for r in first.rules]
+        assert second.get_rule("greeting").enabled
+        assert "sos" not in second.get_rule("help").patterns
+        assert second.match("sos") is None
+    
+    def test_load_rules_copies_nested_conditions(self, tmp_path):
+        """Test engines for an unchanged rules file don't share conditions."""
+        (tmp_path / "rules.yaml").write_text(
+            "rules:\n"
+            "- name: vip\n"
+            "  patterns: [hello]\n"
+            "  responses: [Hi VIP!]\n"
+            "  conditions:\n"
+            "    allowed_senders: ['+15550001']\n"
+        )
+        first = RulesEngine(config_dir=str(tmp_path))
+        first.get_rule("vip").conditions["allowed_senders"].append("+15550002")
+    
+        second = RulesEngine(config_dir=str(tmp_path))
+    
+        assert second.get_rule("vip").conditions["allowed_senders"] == ["+15550001"]
+        assert second.match("hello", {"sender": "+15550002"}) is None
+    
+    def test_pattern_edits_apply(self):
+        """Test patterns edited after construction are matched."""
+        engine = RulesEngine()
+        rule = Rule(name="test", patterns=["hello"], responses=["Hi!"])
+        engine.add_rule(rule)
+        assert engine.match("sos") is None
+        
+        rule.patterns.append("sos")
+        assert rule.matches("sos") is not None
+        assert engine.match("sos").rule is rule
+        
+        rule.match_type = MatchType.EXACT
+        assert engine.match("sos please") is None
+    
+    def test_literal_index_matches_rule_scan(self, monkeypatch):
+        """Test the Aho-Corasick index finds the same rules as scanning."""
+        pytest.importorskip("ahocorasick")
+        import rules.engine as engine_module
+        
+        engine = RulesEngine()
+        engine.add_rule(Rule(name="start", patterns=["ok then"],
+                             match_type=MatchType.STARTSWITH, priority=60))
+        engine.add_rule(Rule(name="end", patterns=["pls"],
+                             match_type=MatchType.ENDSWITH, priority=50))
+        engine.add_rule(Rule(name="any", patterns=["foo bar"],
+                             match_type=MatchType.KEYWORDS, priority=40))
+        engine.add_rule(Rule(name="all", patterns=["alpha beta"],
+                             match_type=MatchType.ALL_KEYWORDS, priority=30))
+        engine.add_rule(Rule(name="regex", patterns=[r"\?$"],
+                             match_type=MatchType.REGEX, priority=20))
+        
+        messages = ["OK then pls", "then ok", "bar?", "beta alpha", "alpha", "pls ok then"]
+        indexed = [[m.rule.name for m in engine.match_all(msg)] for msg in messages]
+        monkeypatch.setattr(engine_module, "ahocorasick", None)
+        scanned = [[m.rule.name for m in engine.match_all(msg)] for msg in messages]
+        
+        assert indexed == scanned
+        assert indexed[0] == ["start", "end"]
+
+
+class TestTemplate:
+    """Tests for Template rendering."""
+    
+    def test_placeholders(self):
+        """Test variables, defaults, date formats and built-ins."""
+        template = Template("Hi {name}, {greeting:welcome}! {date:%d/%m} {weekday} {unknown}")
+        
+        rendered = template.render({"name": "Alice"}, now=datetime(2024, 3, 4, 9, 5))
+        
+        assert rendered == "Hi Alice, welcome! 04/03 Monday {unknown}"
+    
+    def test_conditionals(self):
+        """Test if/else blocks, including nested ones."""
+        template = Template("{if:vip}VIP{if:new} new{endif}{else}Guest{endif}")
+        
+        assert template.render({"vip": True, "new": True}) == "VIP new"
+        assert template.render({"vip": True}) == "VIP"
+        assert template.render({}) == "Guest"
+        assert Template("{if:vip}unclosed").render({}) == "{if:vip}unclosed"
 
 
 # Run tests if executed directly
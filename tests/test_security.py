@@ -0,0 +1,184 @@
+"""
+Test Security Module
+===================
+
+Unit tests for content validation and sanitization.
+"""
+
+import pytest
+from pathlib import Path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.security import SecurityManager, validate_api_key_format
+
+
+@pytest.fixture
+def security(tmp_path):
+    """Create a security manager backed by a temporary directory."""
+    return SecurityManager(
+        config_dir=str(tmp_path / "config"),
+        data_dir=str(tmp_path / "data")
+    )
+
+
+class TestValidateResponse:
+    """Tests for SecurityManager.validate_response."""
+
+    def test_clean_response(self, security):
+        """Test that a clean response passes."""
+        valid, violations = security.validate_response("Thanks, talk soon!")
+        assert valid
+        assert violations == []
+
+    def test_all_violations_reported(self, security):
+        """Test URL, phone and email are all reported in order."""
+        valid, violations = security.validate_response(
+            "Call 555-123-4567, mail a@b.com or see http://x.com",
+            block_links=True
+        )
+        assert not valid
+        assert violations == [
+            "Response contains URL",
+            "Response contains phone number",
+            "Response contains email address",
+        ]
+
+    def test_links_allowed_by_default(self, security):
+        """Test URLs only violate when block_links is set."""
+        valid, _ = security.validate_response("See www.example.org")
+        assert valid
+
+    def test_phone_inside_allowed_link(self, security):
+        """Test a phone number inside an allowed URL is still reported."""
+        valid, violations = security.validate_response("http://x.com/5551234567")
+        assert not valid
+        assert violations == ["Response contains phone number"]
+
+    def test_phone_inside_blocked_link(self, security):
+        """Test a blocked URL doesn't hide the phone number inside it."""
+        valid, violations = security.validate_response(
+            "see http://x.com/call-555-123-4567", block_links=True
+        )
+        assert not valid
+        assert violations == [
+            "Response contains URL",
+            "Response contains phone number",
+        ]
+
+    def test_disabled_checks(self, security):
+        """Test disabled checks are skipped."""
+        valid, _ = security.validate_response(
+            "Call 555-123-4567 or mail a@b.com",
+            block_phone_numbers=False,
+            block_emails=False
+        )
+        assert valid
+
+
+class TestSanitizeContent:
+    """Tests for SecurityManager.sanitize_content."""
+
+    def test_masks_phone_number(self, security):
+        """Test phone numbers keep only their last 4 digits."""
+        assert security.sanitize_content("555-123-4567") == "***-***-4567"
+
+    def test_masks_email(self, security):
+        """Test emails keep the first character and domain."""
+        assert security.sanitize_content("Mail john@example.com") == "Mail j***@example.com"
+
+
+class TestSecurityReport:
+    """Tests for SecurityManager.export_security_report."""
+
+    def test_report_without_env_file(self, security):
+        """Test report when no .env file has been written."""
+        report = security.export_security_report()
+        assert report["env_file_exists"] is False
+        assert report["env_file_permissions"] is None
+        assert len(report["config_dir_permissions"]) == 3
+
+    def test_report_with_env_file(self, security, monkeypatch):
+        """Test report picks up the stored .env file."""
+        monkeypatch.delenv("GROQ_API_KEY", raising=False)
+        security.store_api_key("groq", "gsk_" + "a" * 30)
+        report = security.export_security_report()
+        assert report["env_file_exists"] is True
+        assert report["env_file_permissions"] == "600"
+
+
+class TestStoreApiKey:
+    """Tests for SecurityManager.store_api_key."""
+
+    def test_preserves_existing_keys(self, security, monkeypatch):
+        """Test storing a key keeps other entries and leaves no temp files."""
+        monkeypatch.delenv("GROQ_API_KEY", raising=False)
+        monkeypatch.delenv("OPENROUTER_API_KEY", raising=False)
+        security.store_api_key("groq", "gsk_" + "a" * 30)
+        security.store_api_key("openrouter", "sk-or-" + "b" * 30)
+
+        content = security.env_file.read_text()
+        assert "GROQ_API_KEY=gsk_" in content
+        assert "OPENROUTER_API_KEY=sk-or-" in content
+        assert [p.name for p in security.config_dir.iterdir()] == [".env"]
+
+
+class TestValidateApiKey:
+    """Tests for SecurityManager.validate_api_key."""
+
+    def test_provider_formats(self, security):
+        """Test provider-specific key formats."""
+        assert security.validate_api_key("groq", "gsk_" + "a" * 30)
+        assert not security.validate_api_key("groq", "sk-or-" + "a" * 30)
+        assert security.validate_api_key("openrouter", "sk-or-" + "a" * 30)
+        assert security.validate_api_key("ollama", "anything")
+        assert not security.validate_api_key("openrouter", "")
+        assert not security.validate_api_key("other", "short")
+    
+    def test_format_check_without_manager(self):
+        """Test keys can be checked before a SecurityManager exists."""
+        assert validate_api_key_format("openrouter", "sk-" + "a" * 17)
+        assert not validate_api_key_format("openrouter", "sk-" + "a" * 16)
+        assert not validate_api_key_format("groq", "gsk_short")
+
+
+class TestRedactPii:
+    """Tests for PII detection and redaction."""
+
+    def test_redacts_all_types(self, security):
+        """Test every PII type is redacted in one pass."""
+        redacted = security.redact_pii(
+            "Mail a@b.com from 10.0.0.1, card 4111 1111 1111 1111"
+        )
+        assert redacted == "Mail [REDACTED] from [REDACTED], card [REDACTED]"
+
+    def test_card_not_partially_masked_as_phone(self, security):
+        """Test card numbers are masked whole rather than as phone numbers."""
+        assert security.sanitize_content("4111-1111-1111-1111") == "****-****-****-****"
+
+    def test_detect_pii_types(self, security):
+        """Test detected PII is reported by type."""
+        types = {p["type"] for p in security.detect_pii("a@b.com 10.0.0.1")}
+        assert {"email", "ip_address"} <= types
+
+
+class TestValidateResponseLinks:
+    """Tests for link detection in validate_response."""
+
+    def test_uppercase_url(self, security):
+        """Test URL detection is case-insensitive."""
+        valid, violations = security.validate_response(
+            "Visit WWW.EXAMPLE.COM", block_links=True
+        )
+        assert not valid
+        assert violations == ["Response contains URL"]
+
+    def test_links_only(self, security):
+        """Test link-only validation ignores phone numbers."""
+        valid, violations = security.validate_response(
+            "HTTPS://x.com or 555-123-4567",
+            block_links=True,
+            block_phone_numbers=False,
+            block_emails=False
+        )
+        assert violations == ["Response contains URL"]
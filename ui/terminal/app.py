@@ -636,8 +636,7 @@ class SMSAgentApp(App):
                     os.environ["XDG_CONFIG_HOME"] = str(d.parent)
                     break
         
-        db_path = os.path.join(self.config.data_dir, "sms_agent.db")
-        self.database = database or init_database(db_path)
+        self.database = database or init_database(self.config.db_path)
         
         from core.security import SecurityManager
         from services.guardrails import GuardrailSystem
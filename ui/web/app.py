@@ -6,7 +6,6 @@ This module creates and configures the FastAPI application
 with all necessary routes, middleware, and templates.
 """
 
-import os
 from pathlib import Path
 from typing import Optional
 
@@ -59,8 +58,7 @@ def create_app(
     
     # Initialize database if not provided
     if database is None:
-        db_path = os.path.join(config.data_dir, "sms_agent.db")
-        database = init_database(db_path)
+        database = init_database(config.db_path)
     
     # Create FastAPI app
     app = FastAPI(
@@ -120,8 +118,8 @@ def create_app(
         database=database,
         guardrails=guardrails,
         rules_engine=rules_engine,
-        personality_path=os.path.join(config.config_dir, "personality.md"),
-        agent_path=os.path.join(config.config_dir, "agent.md")
+        personality_path=config.personality_path,
+        agent_path=config.agent_path
     )
 
     # Start SMS listener with callback
@@ -7,7 +7,6 @@ This module defines all web routes for the SMS AI Agent interface.
 
 from datetime import datetime
 from typing import Optional, List
-from pathlib import Path
 
 from fastapi import APIRouter, Request, Form, HTTPException, Query
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
@@ -505,13 +504,10 @@ async def update_personality(request: Request):
         ai_responder.update_agent_rules(agent_rules)
         
         # Save to files
-        personality_path = Path(config.config_dir) / "personality.md"
-        agent_path = Path(config.config_dir) / "agent.md"
-        
-        with open(personality_path, "w") as f:
+        with open(config.personality_path, "w") as f:
             f.write(personality)
         
-        with open(agent_path, "w") as f:
+        with open(config.agent_path, "w") as f:
             f.write(agent_rules)
         
         return {"success": True, "message": "Instructions updated"}